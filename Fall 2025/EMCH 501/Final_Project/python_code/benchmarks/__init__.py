@@ -0,0 +1,5 @@
+# benchmarks/__init__.py
+"""
+Performance benchmarks for the photometric stereo pipeline.
+Each module is a standalone script: python -m benchmarks.<module>
+"""
@@ -0,0 +1,96 @@
+# benchmarks/bench_analytic_gradients.py
+"""
+Analytic vs finite-difference ground-truth normals.
+
+For every shape, compares generating Z plus normals_from_height (the
+finite-difference path) against return_gradients=True plus
+normals_from_gradients: wall time, angular disagreement of the two normal
+fields, and the DCT reconstruction RMSE obtained from each.
+
+Usage:
+    python -m benchmarks.bench_analytic_gradients --sizes 256 1024
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_surfaces import SHAPES
+from solvers import solve_poisson_dct_neumann
+from photometric import (
+    make_rotating_lights,
+    render_photometric_images,
+    photometric_stereo,
+    gradients_from_normals,
+    normals_from_gradients,
+    normals_from_height,
+    compute_divergence,
+)
+
+
+def best_time(fn, repeats: int) -> float:
+    """Best wall time of `repeats` calls, in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return min(times)
+
+
+def reconstruction_rmse(Z_true, N_true, dx, dy, lights) -> float:
+    """RMSE of the noise-free stereo → DCT pipeline from given normals."""
+    images = render_photometric_images(N_true, lights)
+    p, q = gradients_from_normals(photometric_stereo(images, lights))
+    Z_est = solve_poisson_dct_neumann(compute_divergence(p, q, dx, dy), dx, dy)
+    return float(np.sqrt(np.mean(((Z_true - Z_true.mean()) - (Z_est - Z_est.mean()))**2)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[256, 1024])
+    parser.add_argument('--lights', type=int, default=16)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    lights = make_rotating_lights(args.lights)
+
+    for size in args.sizes:
+        print(f"\n{size}x{size}")
+        print("=" * 92)
+        print(f"{'Shape':<10} | {'FD ms':>8} {'analytic ms':>11} {'speedup':>8} | "
+              f"{'mean °':>8} {'max °':>8} | {'RMSE FD':>10} {'RMSE analytic':>13}")
+        print("-" * 92)
+
+        for name, create_fn in SHAPES.items():
+            def fd_path():
+                X, Y, Z, dx, dy = create_fn(size, size)
+                return Z, dx, dy, normals_from_height(Z, dx, dy)
+
+            def analytic_path():
+                X, Y, Z, dx, dy, p, q = create_fn(size, size, return_gradients=True)
+                return normals_from_gradients(p, q)
+
+            t_fd = best_time(fd_path, args.repeats)
+            t_an = best_time(analytic_path, args.repeats)
+
+            Z, dx, dy, N_fd = fd_path()
+            N_an = analytic_path()
+            angle = np.degrees(np.arccos(np.clip(np.sum(N_fd * N_an, axis=2), -1, 1)))
+
+            rmse_fd = reconstruction_rmse(Z, N_fd, dx, dy, lights)
+            rmse_an = reconstruction_rmse(Z, N_an, dx, dy, lights)
+
+            print(f"{name:<10} | {t_fd:8.1f} {t_an:11.1f} {t_fd / t_an:7.2f}x | "
+                  f"{angle.mean():8.4f} {angle.max():8.3f} | {rmse_fd:10.6f} {rmse_an:13.6f}")
+
+        print("=" * 92)
+
+
+if __name__ == "__main__":
+    main()
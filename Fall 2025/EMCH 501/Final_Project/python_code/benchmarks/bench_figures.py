@@ -0,0 +1,145 @@
+# benchmarks/bench_figures.py
+"""
+Per-figure cost of the matplotlib, template and raster writers.
+
+Times every save_* writer against its template counterpart
+(visualization.templates) and, for the image-like figures and the 3D
+surface, its raster counterpart (visualization.raster and the shaded
+relief of visualization.hillshade) on one reconstruction at each --sizes
+grid size, plus the whole generate_figures call in every figure mode.
+Each point is the median of --repeats calls after one warm-up call (which
+also builds the templates, colormap LUTs and matplotlib's font cache), so
+the template column is the steady-state cost of a reused figure.
+
+Usage:
+    python -m benchmarks.bench_figures --sizes 128 256 512
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from experiments.exp_solver_compare import SHAPES, EXTRA_SHAPES, FIGURE_MODES, generate_figures
+from photometric import normals_from_height
+from visualization import (
+    save_heatmap,
+    save_error_map,
+    save_normal_rgb,
+    save_3d_surface,
+    save_profile_plot,
+    save_error_histogram,
+    save_heatmap_fast,
+    save_error_map_fast,
+    save_normal_rgb_fast,
+    save_heatmap_reuse,
+    save_error_map_reuse,
+    save_normal_rgb_reuse,
+    save_3d_surface_reuse,
+    save_profile_plot_reuse,
+    save_error_histogram_reuse,
+    save_hillshade,
+)
+
+
+def median_ms(fn, repeats: int) -> float:
+    """Median wall time of `repeats` calls after one untimed call, in milliseconds."""
+    fn()
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return float(np.median(times))
+
+
+def bench_size(shape: str, size: int, repeats: int, out_dir: str) -> dict:
+    """Per-writer and per-mode timings at one grid size."""
+    X, Y, Z_true, dx, dy = {**SHAPES, **EXTRA_SHAPES}[shape](size, size)
+    N = normals_from_height(Z_true, dx, dy)
+    # A plausible reconstruction: the truth plus a smooth bias and noise
+    rng = np.random.default_rng(0)
+    Z_est = Z_true + 0.05 * X * Y + 1e-3 * rng.standard_normal(Z_true.shape)
+    path = os.path.join(out_dir, "fig.png")
+
+    # name → (matplotlib, template, raster or None); the 3D raster is the shaded relief
+    writers = {
+        "heatmap": (lambda: save_heatmap(Z_true, path, title="Depth"),
+                    lambda: save_heatmap_reuse(Z_true, path, title="Depth"),
+                    lambda: save_heatmap_fast(Z_true, path, title="Depth")),
+        "error_map": (lambda: save_error_map(Z_true, Z_est, path),
+                      lambda: save_error_map_reuse(Z_true, Z_est, path),
+                      lambda: save_error_map_fast(Z_true, Z_est, path)),
+        "normal_rgb": (lambda: save_normal_rgb(N, path),
+                       lambda: save_normal_rgb_reuse(N, path),
+                       lambda: save_normal_rgb_fast(N, path)),
+        "surface_3d": (lambda: save_3d_surface(Z_true, path, title="Surface"),
+                       lambda: save_3d_surface_reuse(Z_true, path, title="Surface"),
+                       lambda: save_hillshade(Z_true, path, dx=dx, dy=dy)),
+        "profile": (lambda: save_profile_plot(Z_true, Z_est, path),
+                    lambda: save_profile_plot_reuse(Z_true, Z_est, path),
+                    None),
+        "histogram": (lambda: save_error_histogram(Z_true, Z_est, path),
+                      lambda: save_error_histogram_reuse(Z_true, Z_est, path),
+                      None),
+    }
+    result = {"writers": {}, "modes": {}}
+    for name, (slow, reuse, fast) in writers.items():
+        mpl_ms, reuse_ms = median_ms(slow, repeats), median_ms(reuse, repeats)
+        raster_ms = median_ms(fast, repeats) if fast is not None else None
+        result["writers"][name] = {"matplotlib_ms": mpl_ms, "reuse_ms": reuse_ms,
+                                   "raster_ms": raster_ms}
+
+    for mode in FIGURE_MODES:
+        result["modes"][mode] = median_ms(
+            lambda: generate_figures(shape, "bench", Z_true, Z_est, N, N, mode, (dx, dy), out_dir),
+            repeats)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[128, 256, 512])
+    parser.add_argument('--shape', default="gaussian", choices=sorted({**SHAPES, **EXTRA_SHAPES}))
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--json', help="write the timings to this file")
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp(prefix="bench_figures_")
+    try:
+        results = {size: bench_size(args.shape, size, args.repeats, out_dir) for size in args.sizes}
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    print(f"{args.shape}, median of {args.repeats} (ms)")
+    print("=" * 72)
+    print(f"{'Size':>6} | {'Writer':<12} | {'matplotlib':>10} {'reuse':>14} {'raster':>16}")
+    print("-" * 72)
+    for size, r in results.items():
+        for name, w in r["writers"].items():
+            mpl_ms = w['matplotlib_ms']
+            raster = (f"{w['raster_ms']:7.2f} ({mpl_ms / w['raster_ms']:5.1f}x)"
+                      if w['raster_ms'] is not None else "-")
+            print(f"{size:>6} | {name:<12} | {mpl_ms:10.1f} "
+                  f"{w['reuse_ms']:6.1f} ({mpl_ms / w['reuse_ms']:4.1f}x) {raster:>16}")
+    print("=" * 72)
+    print(f"{'Size':>6} | " + " ".join(f"{mode:>9}" for mode in FIGURE_MODES) + "  (generate_figures)")
+    print("-" * 72)
+    for size, r in results.items():
+        print(f"{size:>6} | " + " ".join(f"{r['modes'][mode]:9.1f}" for mode in FIGURE_MODES))
+    print("=" * 72)
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump({"shape": args.shape, "repeats": args.repeats, "sizes": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_memory.py
+"""
+Per-stage peak and net memory of the reconstruction pipeline.
+
+Runs render → stereo → divergence → each solver once at --size with
+memory profiling on and reports, per stage, the traced peak and net
+allocation, the RSS peak, and the peak expressed in full-size float64
+grids (Ny·Nx·8 bytes), which makes redundant copies easy to spot. With
+--budget stage=MB the script exits with status 1 if any stage's traced
+peak exceeds its budget, for use as a CI gate.
+
+Usage:
+    python -m benchmarks.bench_memory --size 1024 --budget stereo=200 solve_fft=120
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from experiments.exp_solver_compare import SHAPES, EXTRA_SHAPES, SOLVERS
+from solvers import solve_poisson_tikhonov
+from photometric import (
+    make_rotating_lights,
+    render_photometric_images,
+    photometric_stereo,
+    gradients_from_normals,
+    normals_from_height,
+    compute_divergence,
+)
+from profiling import enable_memory_profiling, measure_memory, check_memory_budget
+
+
+def parse_budgets(items: list) -> dict:
+    """['stage=MB', ...] → {stage: MB}."""
+    budgets = {}
+    for item in items:
+        stage, _, mb = item.partition("=")
+        budgets[stage] = float(mb)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=1024)
+    parser.add_argument('--lights', type=int, default=16)
+    parser.add_argument('--shape', default="gaussian", choices=sorted({**SHAPES, **EXTRA_SHAPES}))
+    parser.add_argument('--budget', nargs='*', default=[], metavar="STAGE=MB")
+    parser.add_argument('--json', help="write the measurements to this file")
+    args = parser.parse_args()
+
+    X, Y, Z, dx, dy = {**SHAPES, **EXTRA_SHAPES}[args.shape](args.size, args.size)
+    N_true = normals_from_height(Z, dx, dy)
+    lights = make_rotating_lights(args.lights)
+
+    enable_memory_profiling()
+    measured = {}
+
+    with measure_memory() as mem:
+        images = render_photometric_images(N_true, lights)
+    measured["render"] = mem.as_dict()
+
+    with measure_memory() as mem:
+        N_est = photometric_stereo(images, lights)
+    measured["stereo"] = mem.as_dict()
+    del images
+
+    with measure_memory() as mem:
+        p, q = gradients_from_normals(N_est)
+        f = compute_divergence(p, q, dx, dy)
+    measured["divergence"] = mem.as_dict()
+    del p, q, N_est
+
+    solvers = dict(SOLVERS, tikhonov=lambda f, dx, dy: solve_poisson_tikhonov(f, dx, dy, lam=1e-3))
+    for name, solver_fn in solvers.items():
+        with measure_memory() as mem:
+            Z_est = solver_fn(f, dx, dy)
+        measured[f"solve_{name}"] = mem.as_dict()
+        del Z_est
+
+    grid_mb = args.size * args.size * np.dtype(np.float64).itemsize / 2**20
+
+    print(f"{args.shape} {args.size}x{args.size}, {args.lights} lights "
+          f"(one float64 grid = {grid_mb:.1f} MB)")
+    print("=" * 70)
+    print(f"{'Stage':<20} | {'peak MB':>9} {'net MB':>9} {'RSS peak MB':>12} | {'peak grids':>10}")
+    print("-" * 70)
+    for stage, m in measured.items():
+        print(f"{stage:<20} | {m['peak_mb']:9.1f} {m['net_mb']:9.1f} "
+              f"{m.get('rss_peak_mb', float('nan')):12.1f} | {m['peak_mb'] / grid_mb:10.1f}")
+    print("=" * 70)
+
+    if args.json:
+        with open(args.json, 'w') as fh:
+            json.dump({"shape": args.shape, "size": args.size, "lights": args.lights,
+                       "grid_mb": grid_mb, "stages": measured}, fh, indent=2)
+
+    violations = check_memory_budget(measured, parse_budgets(args.budget))
+    for message in violations:
+        print(f"BUDGET EXCEEDED  {message}")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_parallel_stereo.py
+"""
+Core-scaling benchmark for photometric_stereo_parallel.
+
+Compares the single-process stereo → gradients → divergence chain against
+the shared-memory tiled executor at increasing worker counts.
+
+Usage:
+    python -m benchmarks.bench_parallel_stereo --sizes 4096 8192 --lights 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parallel import SharedArray
+from photometric import (
+    make_rotating_lights,
+    photometric_stereo,
+    gradients_from_normals,
+    compute_divergence,
+    iter_row_tiles,
+    photometric_stereo_parallel,
+)
+
+
+def fill_gaussian_stack(stack: np.ndarray, lights: np.ndarray, sigma: float = 0.4) -> float:
+    """
+    Render a Gaussian bump into `stack` row tile by row tile.
+
+    Normals are evaluated analytically per tile so that 8k² stacks can be
+    built without full-size normal arrays. Returns the grid spacing.
+    """
+    _, Ny, Nx = stack.shape
+    x = np.linspace(-1, 1, Nx)
+    y = np.linspace(-1, 1, Ny)
+
+    for r0, r1 in iter_row_tiles(Ny, 256):
+        Z = np.exp(-(x[None, :]**2 + y[r0:r1, None]**2) / (2 * sigma**2))
+        n = np.stack([x[None, :] / sigma**2 * Z,
+                      y[r0:r1, None] / sigma**2 * Z,
+                      np.ones_like(Z)], axis=-1)
+        n /= np.linalg.norm(n, axis=-1, keepdims=True)
+        stack[:, r0:r1] = np.maximum(0, np.moveaxis(n @ lights.T, -1, 0))
+
+    return x[1] - x[0]
+
+
+def best_time(fn, repeats: int) -> float:
+    """Best wall time of `repeats` calls, in seconds."""
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def serial_chain(images: np.ndarray, lights: np.ndarray, d: float) -> None:
+    """Single-process reference pipeline."""
+    N = photometric_stereo(images, lights)
+    p, q = gradients_from_normals(N)
+    compute_divergence(p, q, d, d)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4096, 8192])
+    parser.add_argument('--lights', type=int, default=8)
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help="Worker counts to test (default: powers of two up to cpu_count)")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    n_cpu = os.cpu_count() or 1
+    worker_counts = args.workers
+    if worker_counts is None:
+        worker_counts = sorted({2**k for k in range(n_cpu.bit_length()) if 2**k <= n_cpu} | {n_cpu})
+
+    lights = make_rotating_lights(args.lights)
+
+    for size in args.sizes:
+        print(f"\n{size}x{size}, {args.lights} lights")
+        print("-" * 50)
+
+        with SharedArray.create((args.lights, size, size), np.float32) as stack:
+            d = fill_gaussian_stack(stack.array, lights)
+
+            t_serial = best_time(lambda: serial_chain(stack.array, lights, d), args.repeats)
+            print(f"{'serial':<10} {t_serial:8.3f} s")
+
+            for w in worker_counts:
+                t = best_time(
+                    lambda: photometric_stereo_parallel(stack, lights, d, d, workers=w),
+                    args.repeats)
+                speedup = t_serial / t
+                print(f"{w:>3} workers {t:8.3f} s   speedup {speedup:5.2f}x   "
+                      f"efficiency {speedup / w * 100:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# benchmarks/bench_scaling.py
+"""
+Resolution-scaling benchmark of every pipeline stage.
+
+Times surface generation, ground-truth normals, rendering, photometric
+stereo, gradients + divergence and each Poisson solver over a sweep of grid
+sizes (config.RESOLUTION_RANGE by default, extendable with --extend). Each
+point is the median of --repeats perf_counter timings after --warmup
+untimed calls. A power law t ∝ n^k in the pixel count n = N² is fitted per
+stage on the log-log data (k ≈ 1 is linear, FFT-based stages sit slightly
+above 1). Writes scaling.json and scaling.png.
+
+Usage:
+    python -m benchmarks.bench_scaling --extend 512 1024 2048
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OUTPUT_DIR, RESOLUTION_RANGE, DEFAULT_NUM_LIGHTS
+from experiments.exp_solver_compare import SHAPES, EXTRA_SHAPES, SOLVERS
+from solvers import solve_poisson_tikhonov
+from photometric import (
+    make_rotating_lights,
+    render_photometric_images,
+    photometric_stereo,
+    gradients_from_normals,
+    normals_from_height,
+    compute_divergence,
+)
+
+
+def time_call(fn, repeats: int, warmup: int) -> list:
+    """Wall times of `repeats` calls after `warmup` untimed calls, in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return times
+
+
+def fit_exponent(sizes: list, times_ms: list) -> dict:
+    """Least-squares fit of log t = k log n + c over pixel counts n = size²."""
+    if len(sizes) < 2:
+        return {"exponent": None, "coefficient_ms": None}
+    n = np.asarray(sizes, dtype=float)**2
+    k, c = np.polyfit(np.log(n), np.log(times_ms), 1)
+    return {"exponent": float(k), "coefficient_ms": float(np.exp(c))}
+
+
+def stage_functions(create_fn, size: int, lights: np.ndarray) -> dict:
+    """{stage: zero-argument callable} at one grid size, inputs precomputed."""
+    X, Y, Z, dx, dy = create_fn(size, size)
+    N_true = normals_from_height(Z, dx, dy)
+    images = render_photometric_images(N_true, lights)
+    N_est = photometric_stereo(images, lights)
+    p, q = gradients_from_normals(N_est)
+    f = compute_divergence(p, q, dx, dy)
+
+    def divergence():
+        p, q = gradients_from_normals(N_est)
+        return compute_divergence(p, q, dx, dy)
+
+    stages = {
+        "surface": lambda: create_fn(size, size),
+        "normals": lambda: normals_from_height(Z, dx, dy),
+        "render": lambda: render_photometric_images(N_true, lights),
+        "stereo": lambda: photometric_stereo(images, lights),
+        "divergence": divergence,
+    }
+    solvers = dict(SOLVERS, tikhonov=lambda f, dx, dy: solve_poisson_tikhonov(f, dx, dy, lam=1e-3))
+    for name, solver_fn in solvers.items():
+        stages[f"solve_{name}"] = lambda solver_fn=solver_fn: solver_fn(f, dx, dy)
+    return stages
+
+
+def save_scaling_plot(report: dict, filepath: str) -> None:
+    """Log-log time vs pixel count, one line per stage."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    for stage, data in report["stages"].items():
+        n = np.asarray(data["sizes"], dtype=float)**2
+        if len(n) == 0:
+            continue
+        k = data["fit"]["exponent"]
+        label = f"{stage} (k={k:.2f})" if k is not None else stage
+        ax.loglog(n, data["median_ms"], 'o-', label=label, markersize=4)
+    ax.set_xlabel('Pixels n = N²')
+    ax.set_ylabel('Median time (ms)')
+    ax.set_title(f"Stage scaling ({report['shape']}, {report['lights']} lights)")
+    ax.legend(fontsize=8)
+    ax.grid(True, which='both', alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(filepath, dpi=150)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=RESOLUTION_RANGE)
+    parser.add_argument('--extend', type=int, nargs='*', default=[],
+                        help="extra sizes beyond --sizes, e.g. 512 1024 2048")
+    parser.add_argument('--shape', default="gaussian", choices=sorted({**SHAPES, **EXTRA_SHAPES}))
+    parser.add_argument('--lights', type=int, default=DEFAULT_NUM_LIGHTS)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--max-seconds', type=float, default=30.0,
+                        help="stop growing a stage once one call exceeds this")
+    parser.add_argument('--output-dir', default=os.path.join(OUTPUT_DIR, "benchmarks"))
+    args = parser.parse_args()
+
+    sizes = sorted(set(args.sizes) | set(args.extend))
+    create_fn = {**SHAPES, **EXTRA_SHAPES}[args.shape]
+    lights = make_rotating_lights(args.lights)
+
+    report = {
+        "shape": args.shape,
+        "lights": args.lights,
+        "repeats": args.repeats,
+        "warmup": args.warmup,
+        "machine": {"platform": platform.platform(), "python": platform.python_version(),
+                    "numpy": np.__version__, "cpus": os.cpu_count()},
+        "stages": {},
+    }
+    stopped = set()
+
+    for size in sizes:
+        print(f"  {size}x{size}...")
+        for stage, fn in stage_functions(create_fn, size, lights).items():
+            data = report["stages"].setdefault(stage, {"sizes": [], "median_ms": [], "min_ms": [], "times_ms": []})
+            if stage in stopped:
+                continue
+            times = time_call(fn, args.repeats, args.warmup)
+            data["sizes"].append(size)
+            data["median_ms"].append(float(np.median(times)))
+            data["min_ms"].append(float(np.min(times)))
+            data["times_ms"].append(times)
+            if np.median(times) > args.max_seconds * 1000:
+                stopped.add(stage)
+
+    # Fit over sizes ≥ 64, where fixed per-call overhead no longer dominates
+    for data in report["stages"].values():
+        keep = [i for i, s in enumerate(data["sizes"]) if s >= 64] or list(range(len(data["sizes"])))
+        data["fit"] = fit_exponent([data["sizes"][i] for i in keep], [data["median_ms"][i] for i in keep])
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    json_path = os.path.join(args.output_dir, "scaling.json")
+    with open(json_path, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    save_scaling_plot(report, os.path.join(args.output_dir, "scaling.png"))
+
+    print(f"\nScaling fit t ∝ n^k (n = pixels), {args.shape}, {args.lights} lights")
+    print("=" * 60)
+    print(f"{'Stage':<20} | {'k':>6} | {'largest N':>9} {'median ms':>10}")
+    print("-" * 60)
+    for stage, data in report["stages"].items():
+        k = data["fit"]["exponent"]
+        k_str = f"{k:6.2f}" if k is not None else f"{'-':>6}"
+        print(f"{stage:<20} | {k_str} | {data['sizes'][-1]:9d} {data['median_ms'][-1]:10.2f}")
+    print("=" * 60)
+    print(f"Report: {json_path}")
+
+
+if __name__ == "__main__":
+    main()
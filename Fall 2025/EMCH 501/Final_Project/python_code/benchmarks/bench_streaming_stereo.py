@@ -0,0 +1,62 @@
+# benchmarks/bench_streaming_stereo.py
+"""
+Per-frame latency of StreamingPhotometricStereo.
+
+Streams rendered frames one light at a time and reports the update latency
+with and without emitting normals, plus the final height-map RMSE.
+
+Usage:
+    python -m benchmarks.bench_streaming_stereo --size 1024 --lights 24
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from surfaces import create_gaussian_surface
+from photometric import (
+    make_rotating_lights,
+    render_photometric_images,
+    normals_from_height,
+    StreamingPhotometricStereo,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=1024)
+    parser.add_argument('--lights', type=int, default=24)
+    args = parser.parse_args()
+
+    X, Y, Z_true, dx, dy = create_gaussian_surface(args.size, args.size)
+    N_true = normals_from_height(Z_true, dx, dy)
+    lights = make_rotating_lights(args.lights)
+    images = render_photometric_images(N_true, lights)
+
+    print(f"{args.size}x{args.size}, {args.lights} frames")
+    print("-" * 50)
+
+    for emit in (False, True):
+        stream = StreamingPhotometricStereo(args.size, args.size)
+        for image, light in zip(images, lights):
+            stream.add_frame(image, light, emit=emit)
+        s = stream.latency_summary()
+        label = "update + normals" if emit else "update only"
+        print(f"{label:<18} mean {s['mean_ms']:7.2f} ms   p95 {s['p95_ms']:7.2f} ms   "
+              f"max {s['max_ms']:7.2f} ms")
+
+    t0 = time.perf_counter()
+    Z_est = stream.height(dx, dy)
+    t_height = (time.perf_counter() - t0) * 1000
+
+    rmse = np.sqrt(np.mean(((Z_true - Z_true.mean()) - (Z_est - Z_est.mean()))**2))
+    print(f"{'FFT height map':<18} {t_height:7.2f} ms   RMSE {rmse:.6f}")
+
+
+if __name__ == "__main__":
+    main()
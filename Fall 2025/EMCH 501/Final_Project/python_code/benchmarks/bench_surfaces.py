@@ -0,0 +1,86 @@
+# benchmarks/bench_surfaces.py
+"""
+Surface-generation benchmark: open grids vs dense meshgrid coordinates.
+
+For every shape, reports the best wall time and the tracemalloc peak of
+generating a surface with zero-copy X/Y views (default) and with full
+meshgrid arrays (dense_grid=True, the old return contract).
+
+Usage:
+    python -m benchmarks.bench_surfaces --size 4096
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from surfaces import (
+    create_gaussian_surface,
+    create_sphere_surface,
+    create_cube_surface,
+    create_ellipsoid_surface,
+    create_cone_surface,
+    create_saddle_surface,
+    create_peaks_surface,
+    create_sinusoid_surface,
+)
+
+SHAPES = {
+    "gaussian": create_gaussian_surface,
+    "sphere": create_sphere_surface,
+    "cube": create_cube_surface,
+    "ellipsoid": create_ellipsoid_surface,
+    "cone": create_cone_surface,
+    "saddle": create_saddle_surface,
+    "peaks": create_peaks_surface,
+    "sinusoid": create_sinusoid_surface,
+}
+
+
+def measure(create_fn, size: int, dense_grid: bool, repeats: int) -> tuple:
+    """Best time (ms) and peak traced allocation (MB) of one generator call."""
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        t0 = time.perf_counter()
+        create_fn(size, size, dense_grid=dense_grid)
+        times.append((time.perf_counter() - t0) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    surface = create_fn(size, size, dense_grid=dense_grid)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del surface
+
+    return min(times), peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=4096)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Surface generation at {args.size}x{args.size}")
+    print("=" * 78)
+    print(f"{'Shape':<10} | {'dense ms':>9} {'open ms':>9} {'speedup':>8} | "
+          f"{'dense MB':>9} {'open MB':>9} {'saved':>7}")
+    print("-" * 78)
+
+    for name, create_fn in SHAPES.items():
+        t_dense, m_dense = measure(create_fn, args.size, True, args.repeats)
+        t_open, m_open = measure(create_fn, args.size, False, args.repeats)
+        print(f"{name:<10} | {t_dense:9.1f} {t_open:9.1f} {t_dense / t_open:7.2f}x | "
+              f"{m_dense:9.1f} {m_open:9.1f} {(1 - m_open / m_dense) * 100:6.1f}%")
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+# benchmarks/regression.py
+"""
+Performance regression suite for the solvers and photometric kernels.
+
+`run` times every Poisson solver and photometric primitive at each --sizes
+grid size and writes the samples, with machine and library metadata, to a
+JSON file. A sample is the mean time of a batch of calls, the batch being
+sized (like timeit's autorange) so one sample lasts at least --min-sample-ms.
+Samples are taken in --rounds short rounds over the whole suite, each with
+--warmup untimed batches before its --repeats timed ones, so that drift in
+machine state (clock, cache, background load) shows up as spread between
+round medians. Samples outside Tukey's fences (1.5 IQR beyond the
+quartiles) are dropped as outliers, typically scheduler or page-fault
+hiccups. `run` then times the suite --reruns more times and sets each
+kernel's threshold above the largest change a rerun of unchanged code
+showed, so that comparing the baseline with itself reports nothing.
+
+`compare` times the same kernels again with the baseline's calls per
+sample and rounds (or loads a second report) and flags a kernel as slower
+when a one-sided Mann-Whitney U test finds its round medians
+stochastically larger than the baseline's at --alpha AND its median grew
+by more than its threshold; the test alone flags tiny but consistent
+shifts, the threshold alone flags noise. Exits with status 1 if anything
+regressed, so it can gate a commit. Baselines from another machine or
+library version are compared with a warning, as their timings are not
+comparable.
+
+Usage:
+    python -m benchmarks.regression run --sizes 64 128 256 --output baseline.json
+    python -m benchmarks.regression compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+import scipy
+from scipy.stats import mannwhitneyu
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import OUTPUT_DIR, DEFAULT_NUM_LIGHTS
+from experiments.exp_solver_compare import SHAPES, EXTRA_SHAPES, SOLVERS
+from solvers import solve_poisson_tikhonov
+from solvers.cg_iterative import solve_poisson_cg
+from photometric import (
+    make_rotating_lights,
+    make_near_field_lights,
+    render_photometric_images,
+    render_near_field_images,
+    cast_shadow_masks,
+    photometric_stereo,
+    photometric_stereo_near_field,
+    gradients_from_normals,
+    compute_gradients,
+    normals_from_gradients,
+    normals_from_height,
+    compute_divergence,
+)
+
+
+BASELINE_PATH = os.path.join(OUTPUT_DIR, "benchmarks", "regression_baseline.json")
+
+# Kernels too slow to time at large grids, with their largest size
+MAX_SIZE = {
+    "solve_cg": 128,
+    "cast_shadow_masks": 256,
+    "stereo_near_field": 256,
+}
+
+
+def machine_info() -> dict:
+    """Platform, CPU and library versions the timings were taken with."""
+    cpu = platform.processor() or platform.machine()
+    try:
+        with open("/proc/cpuinfo") as fh:
+            cpu = next(line.split(":", 1)[1].strip() for line in fh if line.startswith("model name"))
+    except (OSError, StopIteration):
+        pass
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "cpu": cpu,
+        "cpus": os.cpu_count(),
+        "threads": {var: os.environ.get(var) for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")},
+        "commit": commit or None,
+    }
+
+
+def kernel_functions(create_fn, size: int, lights: np.ndarray) -> dict:
+    """{kernel: zero-argument callable} at one grid size, inputs precomputed."""
+    X, Y, Z, dx, dy = create_fn(size, size)
+    N_true = normals_from_height(Z, dx, dy)
+    images = render_photometric_images(N_true, lights)
+    N_est = photometric_stereo(images, lights)
+    p, q = gradients_from_normals(N_est)
+    f = compute_divergence(p, q, dx, dy)
+    positions = make_near_field_lights(len(lights))
+    near_images = render_near_field_images(N_true, X, Y, Z, positions)
+
+    kernels = {
+        "lights": lambda: make_rotating_lights(len(lights)),
+        "normals_from_height": lambda: normals_from_height(Z, dx, dy),
+        "compute_gradients": lambda: compute_gradients(Z, dx, dy),
+        "normals_from_gradients": lambda: normals_from_gradients(p, q),
+        "render": lambda: render_photometric_images(N_true, lights),
+        "render_near_field": lambda: render_near_field_images(N_true, X, Y, Z, positions),
+        "cast_shadow_masks": lambda: cast_shadow_masks(Z, lights, dx, dy),
+        "stereo": lambda: photometric_stereo(images, lights),
+        "stereo_near_field": lambda: photometric_stereo_near_field(near_images, positions, X, Y, Z),
+        "gradients_from_normals": lambda: gradients_from_normals(N_est),
+        "divergence": lambda: compute_divergence(p, q, dx, dy),
+    }
+    solvers = dict(SOLVERS, tikhonov=lambda f, dx, dy: solve_poisson_tikhonov(f, dx, dy, lam=1e-3),
+                   cg=solve_poisson_cg)
+    for name, solver_fn in solvers.items():
+        kernels[f"solve_{name}"] = lambda solver_fn=solver_fn: solver_fn(f, dx, dy)
+    return {name: fn for name, fn in kernels.items() if size <= MAX_SIZE.get(name, size)}
+
+
+def calibrate(fn, min_sample_ms: float) -> int:
+    """Calls per sample so that one sample lasts at least min_sample_ms."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = (time.perf_counter() - t0) * 1000
+        if elapsed >= min_sample_ms:
+            return number
+        # Aim a little past the target so one more doubling is rarely needed
+        number = max(number * 2, int(number * 1.2 * min_sample_ms / max(elapsed, 1e-3)))
+
+
+def reject_outliers(samples: list) -> list:
+    """Samples inside Tukey's fences [Q1 - 1.5 IQR, Q3 + 1.5 IQR]."""
+    q1, q3 = np.percentile(samples, [25, 75])
+    low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    return [s for s in samples if low <= s <= high]
+
+
+def measure(fn, repeats: int, warmup: int, number: int) -> list:
+    """Per-call mean times (ms) of `repeats` timed batches of `number` calls after `warmup` untimed ones."""
+    samples = []
+    for i in range(warmup + repeats):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if i >= warmup:
+            samples.append((time.perf_counter() - t0) * 1000 / number)
+    return samples
+
+
+def summarize(number: int, rounds: list) -> dict:
+    """
+    Statistics of one kernel's samples, given per round.
+
+    Returns
+    -------
+    result : dict
+        number (calls per sample), samples_ms (all rounds after outlier
+        rejection), round_medians_ms, median_ms (median of the round
+        medians, which are robust to outliers themselves) and rejected
+        (samples dropped)
+    """
+    samples = [s for r in rounds for s in r]
+    kept = reject_outliers(samples)
+    round_medians = [float(np.median(r)) for r in rounds]
+    return {"number": number, "samples_ms": kept, "round_medians_ms": round_medians,
+            "median_ms": float(np.median(round_medians)), "rejected": len(samples) - len(kept)}
+
+
+def run_suite(
+    sizes: list,
+    shape: str = "gaussian",
+    m_lights: int = DEFAULT_NUM_LIGHTS,
+    repeats: int = 5,
+    warmup: int = 1,
+    min_sample_ms: float = 20.0,
+    kernels: list = None,
+    rounds: int = 5,
+    numbers: dict = None,
+) -> dict:
+    """
+    Time every kernel (or only `kernels`) at every size.
+
+    Each round times every kernel once, so a kernel's samples are spread
+    over the whole run. `numbers` ({kernel: {size: calls per sample}},
+    e.g. from a baseline) fixes the batch sizes instead of calibrating
+    them, so both reports time the same batches.
+
+    Returns
+    -------
+    report : dict
+        settings, machine (see machine_info) and results {kernel: {size: summarize()}}
+    """
+    create_fn = {**SHAPES, **EXTRA_SHAPES}[shape]
+    lights = make_rotating_lights(m_lights)
+    numbers = numbers or {}
+    report = {
+        "settings": {"sizes": sizes, "shape": shape, "lights": m_lights, "repeats": repeats,
+                     "warmup": warmup, "min_sample_ms": min_sample_ms, "kernels": kernels,
+                     "rounds": rounds},
+        "machine": machine_info(),
+        "created": time.time(),
+        "results": {},
+    }
+    suite = {size: {name: fn for name, fn in kernel_functions(create_fn, size, lights).items()
+                    if not kernels or name in kernels}
+             for size in sizes}
+    batch = {(name, size): numbers.get(name, {}).get(str(size)) or calibrate(fn, min_sample_ms)
+             for size, fns in suite.items() for name, fn in fns.items()}
+    samples = {key: [] for key in batch}
+    for _ in range(rounds):
+        for size, fns in suite.items():
+            for name, fn in fns.items():
+                samples[name, size].append(measure(fn, repeats, warmup, batch[name, size]))
+
+    for (name, size), by_round in samples.items():
+        result = summarize(batch[name, size], by_round)
+        report["results"].setdefault(name, {})[str(size)] = result
+        print(f"  {name:<24} {size:>5}  {result['median_ms']:10.3f} ms  "
+              f"({result['number']} calls/sample, {result['rejected']} rejected)")
+    return report
+
+
+def calibrate_thresholds(report: dict, reruns: int = 1, floor: float = 0.10, margin: float = 1.5) -> None:
+    """
+    Time the report's suite `reruns` more times and store each kernel's
+    threshold in it: `margin` times the largest relative change of the
+    median a rerun showed, and at least `floor`.
+    """
+    s = report["settings"]
+    numbers = {name: {size: r["number"] for size, r in by_size.items()}
+               for name, by_size in report["results"].items()}
+    worst = {}
+    for i in range(reruns):
+        print(f"\nCalibration rerun {i + 1}/{reruns}:")
+        rerun = run_suite(s["sizes"], s["shape"], s["lights"], s["repeats"], s["warmup"],
+                          s["min_sample_ms"], s["kernels"], s["rounds"], numbers)
+        for row in compare_reports(report, rerun):
+            change = max(row["ratio"], 1 / row["ratio"]) - 1
+            key = (row["kernel"], str(row["size"]))
+            worst[key] = max(worst.get(key, 0.0), change)
+    for (name, size), change in worst.items():
+        report["results"][name][size]["threshold"] = max(floor, round(margin * change, 3))
+    s.update(reruns=reruns, threshold_floor=floor)
+
+
+def compare_reports(baseline: dict, current: dict, alpha: float = 0.01, threshold: float = None) -> list:
+    """
+    Per-kernel, per-size comparison of two reports.
+
+    The U tests compare round medians (samples_ms for reports without
+    rounds), so that drift between rounds counts as noise. `threshold`
+    overrides the baseline's calibrated per-kernel thresholds (default:
+    those, or 10% where there are none). With the default 5 rounds the
+    smallest attainable p is 1/252; fewer rounds cannot reach alpha=0.01.
+
+    Returns
+    -------
+    rows : list of dict
+        kernel, size, baseline_ms, current_ms, ratio (current / baseline
+        median), threshold, p_slower (one-sided Mann-Whitney U), p_faster,
+        and status: "slower", "faster" or "same"
+    """
+    rows = []
+    for kernel, by_size in baseline["results"].items():
+        for size, base in by_size.items():
+            cur = current["results"].get(kernel, {}).get(size)
+            if cur is None:
+                continue
+            limit = threshold if threshold is not None else base.get("threshold", 0.10)
+            field = "round_medians_ms" if "round_medians_ms" in base and "round_medians_ms" in cur else "samples_ms"
+            ratio = cur["median_ms"] / base["median_ms"]
+            p_slower = mannwhitneyu(cur[field], base[field], alternative="greater").pvalue
+            p_faster = mannwhitneyu(cur[field], base[field], alternative="less").pvalue
+            if p_slower < alpha and ratio > 1 + limit:
+                status = "slower"
+            elif p_faster < alpha and ratio < 1 / (1 + limit):
+                status = "faster"
+            else:
+                status = "same"
+            rows.append({"kernel": kernel, "size": int(size), "baseline_ms": base["median_ms"],
+                         "current_ms": cur["median_ms"], "ratio": ratio, "threshold": limit,
+                         "p_slower": float(p_slower), "p_faster": float(p_faster), "status": status})
+    return rows
+
+
+def machine_mismatch(baseline: dict, current: dict) -> list:
+    """Names of the machine fields that differ between two reports."""
+    keys = ("platform", "python", "numpy", "scipy", "cpu", "cpus", "threads")
+    return [k for k in keys if baseline["machine"].get(k) != current["machine"].get(k)]
+
+
+def print_comparison(rows: list) -> None:
+    print("=" * 78)
+    print(f"{'Kernel':<24} {'Size':>5} | {'baseline':>10} {'current':>10} {'ratio':>6} {'limit':>6} {'p':>8}  status")
+    print("-" * 78)
+    for r in rows:
+        p = r["p_faster"] if r["status"] == "faster" else r["p_slower"]
+        mark = {"slower": "SLOWER", "faster": "faster"}.get(r["status"], "")
+        print(f"{r['kernel']:<24} {r['size']:>5} | {r['baseline_ms']:10.3f} {r['current_ms']:10.3f} "
+              f"{r['ratio']:6.2f} {1 + r['threshold']:6.2f} {p:8.1e}  {mark}")
+    print("=" * 78)
+
+
+def save_report(report: dict, filepath: str) -> None:
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    with open(filepath, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    print(f"Report: {filepath}")
+
+
+def _option(value, default):
+    """A command-line value, or default if it was not given (0 is a value)."""
+    return default if value is None else value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    timing = argparse.ArgumentParser(add_help=False)
+    timing.add_argument('--repeats', type=int, help="timed samples per kernel, size and round (default 5)")
+    timing.add_argument('--warmup', type=int, help="untimed samples before each round's (default 1)")
+    timing.add_argument('--kernels', nargs='+', help="only these kernels (default: all)")
+
+    run = sub.add_parser('run', parents=[timing], help="time every kernel and save a report")
+    run.add_argument('--sizes', type=int, nargs='+', default=[64, 128, 256])
+    run.add_argument('--shape', default="gaussian", choices=sorted({**SHAPES, **EXTRA_SHAPES}))
+    run.add_argument('--lights', type=int, default=DEFAULT_NUM_LIGHTS)
+    run.add_argument('--min-sample-ms', type=float, default=20.0,
+                     help="shortest sample; short kernels are batched")
+    run.add_argument('--rounds', type=int, default=5,
+                     help="rounds over the suite; the U test needs at least 5 for alpha=0.01")
+    run.add_argument('--reruns', type=int, default=1,
+                     help="extra timings of the suite that calibrate each kernel's threshold")
+    run.add_argument('--threshold', type=float, default=0.10, help="smallest calibrated threshold")
+    run.add_argument('--output', default=BASELINE_PATH)
+
+    compare = sub.add_parser('compare', parents=[timing], help="flag slowdowns against a baseline")
+    compare.add_argument('baseline', nargs='?', default=BASELINE_PATH)
+    compare.add_argument('current', nargs='?',
+                         help="report to compare (default: time now with the baseline's settings)")
+    compare.add_argument('--alpha', type=float, default=0.01, help="significance level of the U test")
+    compare.add_argument('--threshold', type=float,
+                         help="smallest relative change of the median that counts "
+                              "(default: each kernel's threshold calibrated by run)")
+    compare.add_argument('--save', help="also write the new report here")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        report = run_suite(args.sizes, args.shape, args.lights, _option(args.repeats, 5),
+                           _option(args.warmup, 1), args.min_sample_ms, args.kernels, args.rounds)
+        if args.reruns > 0:
+            calibrate_thresholds(report, args.reruns, args.threshold)
+        save_report(report, args.output)
+        return
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    if args.current:
+        with open(args.current) as fh:
+            current = json.load(fh)
+    else:
+        # Same batches and rounds as the baseline, so only the code differs
+        s = baseline["settings"]
+        numbers = {name: {size: r["number"] for size, r in by_size.items()}
+                   for name, by_size in baseline["results"].items()}
+        current = run_suite(s["sizes"], s["shape"], s["lights"], _option(args.repeats, s["repeats"]),
+                            _option(args.warmup, s["warmup"]), s["min_sample_ms"],
+                            _option(args.kernels, s["kernels"]), s.get("rounds", 1), numbers)
+        if args.save:
+            save_report(current, args.save)
+
+    mismatch = machine_mismatch(baseline, current)
+    if mismatch:
+        print(f"WARNING: baseline was taken with a different {', '.join(mismatch)}; "
+              f"timings may not be comparable")
+    rows = compare_reports(baseline, current, args.alpha, args.threshold)
+    print_comparison(rows)
+    slower = [r for r in rows if r["status"] == "slower"]
+    limit = f"+{args.threshold:.0%}" if args.threshold is not None else "its threshold"
+    print(f"{len(slower)} of {len(rows)} kernel/size pairs slower (p < {args.alpha}, median > {limit})")
+    sys.exit(1 if slower else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ Configuration constants shared across all experiment modules.
 Maps to project_restructured.tex experimental parameters.
 """
 
+import os
+
 import numpy as np
 
 # Grid resolution
@@ -49,6 +51,7 @@ PEAKS_Y_RANGE = (-3, 3)
 # Ablation study parameters (Section 5.7)
 LIGHT_SWEEP_RANGE = list(range(3, 21))  # m = 3 to 20
 NOISE_LEVELS = [0.0, 0.01, 0.02, 0.05, 0.08]
+MONTE_CARLO_TRIALS = 100  # noise realizations per σ
 RESOLUTION_RANGE = [16, 24, 32, 48, 64, 96, 128, 192, 256, 384]
 
 # Tikhonov regularization sweep (Section 5.8)
@@ -56,3 +59,28 @@ TIKHONOV_LAMBDAS = np.logspace(-5, 0, 9)  # 10^-5 to 1
 
 # Output directory
 OUTPUT_DIR = "output"
+
+# Figure export: "full" (all matplotlib), "reuse" (matplotlib drawn into
+# persistent figure templates), "fast" (raster PNG writer for the
+# image-like figures, shaded reliefs for the 3D surfaces, matplotlib for
+# plots), "raster" (image-like figures and reliefs only) or "none"
+FIGURE_MODE = "full"
+
+# Artifact cache for deterministic pipeline stages (experiments/cache.py)
+CACHE_DIR = os.path.join(OUTPUT_DIR, "cache")
+CACHE_MAX_BYTES = 2 * 2**30
+# Part of every cache key; bump to invalidate all entries after a change the
+# source fingerprints cannot see (e.g. a constant in this file)
+CACHE_VERSION = 2
+
+# Raw per-run arrays for deferred figure rendering (experiments/raw_store.py)
+RAW_DIR = os.path.join(OUTPUT_DIR, "raw")
+
+# Append-only SQLite results log (experiments/results_store.py)
+RESULTS_DB = os.path.join(OUTPUT_DIR, "results.db")
+
+# Accuracy-vs-time solver profile (experiments/exp_pareto.py), read by the
+# auto solver (solvers/auto.py) to pick the fastest solver meeting an RMSE target
+SOLVER_PROFILE = os.path.join(OUTPUT_DIR, "solver_profile.json")
+PARETO_RESOLUTIONS = [64, 128, 256]
+PARETO_TIKHONOV_LAMBDAS = [1e-4, 1e-3, 1e-2]
@@ -5,8 +5,26 @@ Maps to Chapter 5 Experimental Validation in project_restructured.tex.
 """
 
 from .exp_solver_compare import run_shape_all_solvers, run_all_shapes_all_solvers
+from .exp_pareto import run_pareto_exploration
+from .executor import run_matrix_parallel
+from .cache import ArtifactCache, get_cache, configure_cache
+from .figure_queue import FigureQueue
+from .raw_store import RawStore, get_raw_store, configure_raw_store
+from .results_store import ResultsStore, get_results_store, configure_results_store
 
 __all__ = [
     'run_shape_all_solvers',
     'run_all_shapes_all_solvers',
+    'run_pareto_exploration',
+    'run_matrix_parallel',
+    'ArtifactCache',
+    'get_cache',
+    'configure_cache',
+    'FigureQueue',
+    'RawStore',
+    'get_raw_store',
+    'configure_raw_store',
+    'ResultsStore',
+    'get_results_store',
+    'configure_results_store',
 ]
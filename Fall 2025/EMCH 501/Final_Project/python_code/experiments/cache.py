@@ -0,0 +1,349 @@
+# experiments/cache.py
+"""
+Content-addressed on-disk cache for deterministic pipeline stages.
+
+Each artifact is a directory named by the SHA-256 of its stage name and
+parameters, holding one .npy file per array plus a meta.json. Callables
+in the parameters (surface generators, solvers) are fingerprinted by
+their source code and defaults, and by the source of every function and
+method currently bound in their top-level package (surfaces, photometric,
+...). Editing a surface formula or a helper the stage calls indirectly
+therefore invalidates its entries; config.CACHE_VERSION covers anything
+else. index.json at the cache root lists the entries for inspection;
+eviction works from the entry directories themselves, so several worker
+processes can share one cache.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CACHE_DIR, CACHE_MAX_BYTES, CACHE_VERSION
+from photometric import (
+    render_photometric_images,
+    photometric_stereo,
+    gradients_from_normals,
+    normals_from_gradients,
+    normals_from_height,
+    compute_divergence,
+)
+from profiling import traced
+
+
+# Only this project's packages are fingerprinted (not numpy, scipy, ...)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SHA-256 of a function's source, keyed by its code object
+_source_digests: Dict[Any, str] = {}
+
+
+def _source_digest(fn: Callable) -> str:
+    """SHA-256 of a (possibly decorated) function's source."""
+    fn = inspect.unwrap(fn)
+    code = getattr(fn, "__code__", None)
+    if code in _source_digests:
+        return _source_digests[code]
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = ""
+    digest = hashlib.sha256(source.encode()).hexdigest()
+    if code is not None:
+        _source_digests[code] = digest
+    return digest
+
+
+def _package_fingerprint(module_name: str) -> str:
+    """
+    SHA-256 over the live functions and methods of a loaded package.
+
+    Covers every module of the top-level package of module_name, and the
+    functions and methods bound at call time, so a replaced method
+    (e.g. a surface's _evaluate) changes it too. Empty for modules outside
+    this project.
+    """
+    package = (module_name or "").split(".")[0]
+    path = getattr(sys.modules.get(package), "__file__", None) or ""
+    if not os.path.abspath(path).startswith(_PROJECT_ROOT + os.sep):
+        return ""
+    h = hashlib.sha256(package.encode())
+    names = sorted(name for name in list(sys.modules) if name == package or name.startswith(package + "."))
+    for name in names:
+        for attr, value in sorted(vars(sys.modules[name]).items()):
+            if inspect.isclass(value) and value.__module__ == name:
+                members = [(f"{attr}.{k}", getattr(v, "__func__", getattr(v, "fget", v)))
+                           for k, v in sorted(vars(value).items())]
+            elif inspect.isfunction(value) and value.__module__ == name:
+                members = [(attr, value)]
+            else:
+                continue
+            for qualname, member in members:
+                if inspect.isfunction(member):
+                    h.update(f"{name}.{qualname}:{_source_digest(member)}".encode())
+    return h.hexdigest()
+
+
+def _fingerprint(value: Any) -> Any:
+    """JSON-safe, content-based representation of a key parameter."""
+    if isinstance(value, np.ndarray):
+        digest = hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()
+        return {"array": digest, "shape": value.shape, "dtype": value.dtype.str}
+    if isinstance(value, functools.partial):
+        return {"partial": _fingerprint(value.func),
+                "args": _fingerprint(value.args),
+                "keywords": _fingerprint(value.keywords)}
+    if callable(value):
+        try:
+            source = inspect.getsource(value)
+        except (OSError, TypeError):
+            source = ""
+        closure = [cell.cell_contents for cell in (getattr(value, "__closure__", None) or ())]
+        return {"callable": f"{value.__module__}.{value.__qualname__}",
+                "source": hashlib.sha256(source.encode()).hexdigest(),
+                "package": _package_fingerprint(getattr(value, "__module__", None)),
+                "defaults": _fingerprint(getattr(value, "__defaults__", None)),
+                "kwdefaults": _fingerprint(getattr(value, "__kwdefaults__", None)),
+                "closure": _fingerprint(closure)}
+    if isinstance(value, dict):
+        return {str(k): _fingerprint(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint(v) for v in value]
+    if isinstance(value, (np.integer, np.floating, np.bool_)):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+class ArtifactCache:
+    """
+    Persistent store of named array bundles with LRU size-based eviction.
+
+    Parameters
+    ----------
+    root : str
+        Cache directory
+    max_bytes : int
+        Total size above which least recently used entries are evicted
+    enabled : bool
+        If False, every lookup misses and nothing is written
+    """
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES, enabled: bool = True):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, stage: str, **params) -> str:
+        """SHA-256 key of a stage and its parameters."""
+        payload = json.dumps({"version": CACHE_VERSION, "stage": stage, "params": _fingerprint(params)},
+                             sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def load(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Arrays stored under key, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        entry = self._entry_dir(key)
+        meta_path = os.path.join(entry, "meta.json")
+        try:
+            with open(meta_path) as fh:
+                meta = json.load(fh)
+            arrays = {name: np.load(os.path.join(entry, f"{name}.npy")) for name in meta["arrays"]}
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        # Modification time of meta.json is the LRU clock
+        os.utime(meta_path)
+        self.hits += 1
+        return arrays
+
+    def store(self, key: str, arrays: Dict[str, np.ndarray], stage: str = "") -> None:
+        """Write arrays under key, then evict down to max_bytes."""
+        if not self.enabled:
+            return
+
+        os.makedirs(self.root, exist_ok=True)
+        entry = self._entry_dir(key)
+        tmp = f"{entry}.tmp-{os.getpid()}"
+        os.makedirs(tmp, exist_ok=True)
+
+        nbytes = 0
+        for name, arr in arrays.items():
+            path = os.path.join(tmp, f"{name}.npy")
+            np.save(path, np.asarray(arr))
+            nbytes += os.path.getsize(path)
+
+        with open(os.path.join(tmp, "meta.json"), "w") as fh:
+            json.dump({"stage": stage, "arrays": list(arrays), "bytes": nbytes,
+                       "created": time.time()}, fh)
+
+        # Atomic publish; another process may have written the same key first
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+        self.evict()
+
+    def cached(self, stage: str, compute: Callable[[], Dict[str, np.ndarray]], **params) -> Dict[str, np.ndarray]:
+        """
+        Load a stage's arrays, computing and storing them on a miss.
+
+        Parameters
+        ----------
+        stage : str
+            Stage name (part of the key)
+        compute : callable
+            Zero-argument function returning {name: array}
+        **params
+            Everything the result depends on
+
+        Returns
+        -------
+        arrays : dict
+            {name: ndarray}
+        """
+        key = self.key(stage, **params)
+        arrays = self.load(key)
+        if arrays is None:
+            arrays = compute()
+            self.store(key, arrays, stage)
+        return arrays
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """{key: meta} of all complete entries, with last_used times."""
+        if not os.path.isdir(self.root):
+            return {}
+
+        entries = {}
+        for key in os.listdir(self.root):
+            meta_path = os.path.join(self.root, key, "meta.json")
+            if ".tmp-" in key or not os.path.isfile(meta_path):
+                continue
+            try:
+                with open(meta_path) as fh:
+                    meta = json.load(fh)
+                meta["last_used"] = os.path.getmtime(meta_path)
+            except (OSError, ValueError):
+                continue
+            entries[key] = meta
+        return entries
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under max_bytes; refresh index.json."""
+        entries = self.entries()
+        total = sum(meta["bytes"] for meta in entries.values())
+
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= entries.pop(key)["bytes"]
+
+        index_tmp = os.path.join(self.root, f"index.json.tmp-{os.getpid()}")
+        with open(index_tmp, "w") as fh:
+            json.dump({"total_bytes": total, "max_bytes": self.max_bytes, "entries": entries}, fh, indent=2)
+        os.replace(index_tmp, os.path.join(self.root, "index.json"))
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+# Process-wide cache used by the experiment modules
+_cache = ArtifactCache()
+
+
+def get_cache() -> ArtifactCache:
+    """The process-wide artifact cache."""
+    return _cache
+
+
+def configure_cache(enabled: bool = True, root: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES) -> ArtifactCache:
+    """Replace the process-wide cache (e.g. enabled=False for --no-cache)."""
+    global _cache
+    _cache = ArtifactCache(root, max_bytes, enabled)
+    return _cache
+
+
+# ============================================================================
+# Cached pipeline stages
+# ============================================================================
+
+@traced
+def surface_stage(create_fn: Callable, analytic_normals: bool = False, cache: ArtifactCache = None) -> tuple:
+    """
+    Ground truth surface and normals, cached.
+
+    Returns
+    -------
+    Z_true : ndarray
+        Height map
+    dx, dy : float
+        Grid spacing
+    N_true : ndarray, shape (Ny, Nx, 3)
+        Ground truth normals (finite differences, or analytic gradients)
+    """
+    def compute():
+        if analytic_normals:
+            X, Y, Z, dx, dy, p, q = create_fn(return_gradients=True)
+            N = normals_from_gradients(p, q)
+        else:
+            X, Y, Z, dx, dy = create_fn()
+            N = normals_from_height(Z, dx, dy)
+        return {"Z": Z, "N": N, "dx": np.float64(dx), "dy": np.float64(dy)}
+
+    arrays = (cache or _cache).cached(
+        "surface", compute,
+        create_fn=create_fn,
+        analytic_normals=analytic_normals,
+        code=(normals_from_gradients if analytic_normals else normals_from_height),
+    )
+    return arrays["Z"], float(arrays["dx"]), float(arrays["dy"]), arrays["N"]
+
+
+@traced
+def stereo_stage(N_true: np.ndarray, lights: np.ndarray, dx: float, dy: float, cache: ArtifactCache = None) -> tuple:
+    """
+    Noise-free render → photometric stereo → divergence, cached.
+
+    Noisy runs draw from np.random and must not be cached; call the
+    pipeline directly for noise_std > 0.
+
+    Returns
+    -------
+    N_est : ndarray, shape (Ny, Nx, 3)
+        Estimated normals
+    f : ndarray
+        Divergence field
+    """
+    def compute():
+        images = render_photometric_images(N_true, lights, albedo=1.0)
+        N_est = photometric_stereo(images, lights)
+        p, q = gradients_from_normals(N_est)
+        return {"N_est": N_est, "f": compute_divergence(p, q, dx, dy)}
+
+    arrays = (cache or _cache).cached(
+        "stereo", compute,
+        N_true=N_true, lights=lights, dx=dx, dy=dy,
+        code=(render_photometric_images, photometric_stereo, gradients_from_normals, compute_divergence),
+    )
+    return arrays["N_est"], arrays["f"]
@@ -0,0 +1,160 @@
+# experiments/executor.py
+"""
+Process-pool execution of the shape × solver matrix.
+
+Every (shape, solver) pair is an independent work unit: the worker prepares
+the shape (surface, rendering, stereo, divergence), runs one solver and
+writes its figures through the same run_shape_solver as the serial path.
+Preparation is seeded with shape_seed and cached per process, so the
+metrics match the serial run and a worker that draws several solvers of
+the same shape pays for it once. Results come back in the same nested
+{shape: {solver: metrics}} order as the serial run, whatever order the
+units finish in.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from profiling import (
+    drain_events,
+    enable_tracing,
+    is_tracing,
+    merge_events,
+    reset_trace,
+    enable_memory_profiling,
+    is_profiling_memory,
+)
+from .cache import configure_cache, get_cache
+from .raw_store import configure_raw_store, get_raw_store
+from .exp_solver_compare import (
+    resolve_shapes,
+    resolve_solvers,
+    prepare_shape,
+    run_shape_solver,
+    protocol_params,
+    shape_seed,
+)
+from .results_store import get_results_store
+from config import OUTPUT_DIR, FIGURE_MODE
+
+
+# Per-process cache of prepared shapes, keyed by shape name and protocol settings
+_prepared = {}
+
+
+def _init_worker(cache_settings: tuple, raw_settings: tuple, tracing: bool, memory: bool) -> None:
+    """Give each worker the parent's artifact cache, raw store, tracing and memory-profiling configuration."""
+    configure_cache(*cache_settings)
+    configure_raw_store(*raw_settings)
+    # Forked workers inherit the parent's recorded spans; start empty
+    reset_trace()
+    if tracing:
+        enable_tracing()
+    if memory:
+        enable_memory_profiling()
+
+
+def _run_unit(
+    shape_name: str,
+    create_fn: Callable,
+    solver_name: str,
+    solver_fn: Callable,
+    settings: tuple,
+    generate_figs: bool,
+    figure_mode: str,
+    output_dir: str,
+) -> tuple:
+    """Run one (shape, solver) unit in a worker process; returns (metrics, trace events)."""
+    key = (shape_name,) + settings
+    prepare_ms = 0.0
+    if key not in _prepared:
+        t0 = time.perf_counter()
+        _prepared.clear()
+        _prepared[key] = prepare_shape(create_fn, *settings, seed=shape_seed(shape_name))
+        prepare_ms = (time.perf_counter() - t0) * 1000
+
+    metrics = run_shape_solver(shape_name, solver_name, solver_fn, _prepared[key], generate_figs,
+                               figure_mode=figure_mode, output_dir=output_dir)
+    metrics["prepare_ms"] = prepare_ms
+    return metrics, drain_events()
+
+
+def run_matrix_parallel(
+    shapes=None,
+    solvers=None,
+    m_lights: int = 16,
+    elevation_deg: float = 45.0,
+    noise_std: float = 0.0,
+    generate_figs: bool = True,
+    analytic_normals: bool = False,
+    workers: Optional[int] = None,
+    figure_mode: str = FIGURE_MODE,
+    output_dir: str = OUTPUT_DIR,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Run every (shape, solver) unit on a process pool.
+
+    Parameters
+    ----------
+    shapes : list, dict or None
+        Shape selection (see resolve_shapes)
+    solvers : list, dict or None
+        Solver selection (see resolve_solvers); functions must be
+        importable at module level so they can be pickled
+    m_lights, elevation_deg, noise_std, generate_figs, analytic_normals, figure_mode, output_dir
+        As for run_shape_all_solvers
+    workers : int, optional
+        Worker processes (default: os.cpu_count())
+
+    Returns
+    -------
+    results : dict
+        {shape: {solver: metrics}} in shape, then solver, order. Each unit
+        reports its own wall_time_ms (solve, raw arrays and figures, as on
+        the serial path) and prepare_ms (the preparation it paid for; 0
+        when its worker had the shape prepared already). A unit that
+        fails, including a crashed worker, reports success=False and the
+        error instead of aborting the run. Results are appended to the
+        results store from the parent process as they are collected.
+    """
+    shapes = resolve_shapes(shapes)
+    solvers = resolve_solvers(solvers)
+    workers = workers or os.cpu_count() or 1
+    settings = (m_lights, elevation_deg, noise_std, analytic_normals)
+
+    print(f"  Dispatching {len(shapes) * len(solvers)} units to {workers} workers...")
+
+    cache = get_cache()
+    cache_settings = (cache.enabled, cache.root, cache.max_bytes)
+    raw_store = get_raw_store()
+    raw_settings = (raw_store.enabled, raw_store.root)
+    results_store = get_results_store()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_settings, raw_settings, is_tracing(),
+                                       is_profiling_memory())) as pool:
+        # Shape-major submission keeps a shape's solvers close together in
+        # the queue, which makes per-process cache hits likely
+        futures = {
+            (shape_name, solver_name): pool.submit(
+                _run_unit, shape_name, create_fn, solver_name, solver_fn, settings, generate_figs,
+                figure_mode, output_dir)
+            for shape_name, create_fn in shapes.items()
+            for solver_name, solver_fn in solvers.items()
+        }
+
+        results = {shape_name: {} for shape_name in shapes}
+        for (shape_name, solver_name), future in futures.items():
+            try:
+                metrics, events = future.result()
+                merge_events(events)
+            except Exception as e:
+                metrics = {"rmse": float('nan'), "time_ms": 0, "success": False, "error": str(e)}
+            results[shape_name][solver_name] = metrics
+            resolution = metrics["grid"][1] if "grid" in metrics else None
+            results_store.append(shape_name, solver_name, metrics, protocol_params(*settings, resolution))
+            print(f"  {shape_name}/{solver_name}: {metrics.get('wall_time_ms', 0):.0f} ms")
+
+    return results
@@ -2,12 +2,17 @@
 """
 Ablation studies: Light count sweep, Noise robustness, Tikhonov regularization.
 Maps to Section 5.7 Ablation Studies in project_restructured.tex.
+
+Every sweep point is appended to the results store (experiment = the
+study's name in ABLATION_STUDIES) as soon as it is measured, with the
+swept value among its params, so an interrupted sweep keeps what it did.
 """
 
 import time
 import os
 import numpy as np
-from typing import Dict, List
+from typing import Callable, Dict, List
+from scipy import stats
 
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,10 +24,13 @@ from photometric import (
     render_photometric_images,
     photometric_stereo,
     gradients_from_normals,
-    normals_from_height,
     compute_divergence,
 )
-from config import OUTPUT_DIR, LIGHT_SWEEP_RANGE, NOISE_LEVELS, TIKHONOV_LAMBDAS
+from experiments.cache import surface_stage, stereo_stage
+from experiments.exp_solver_compare import protocol_params
+from experiments.results_store import get_results_store
+from config import OUTPUT_DIR, LIGHT_SWEEP_RANGE, NOISE_LEVELS, MONTE_CARLO_TRIALS, TIKHONOV_LAMBDAS
+from profiling import traced
 
 
 def compute_rmse(Z_true: np.ndarray, Z_est: np.ndarray) -> float:
@@ -36,32 +44,42 @@ def compute_rmse(Z_true: np.ndarray, Z_est: np.ndarray) -> float:
 # Ablation 1: Light Count Sweep
 # ============================================================================
 
+@traced
 def run_light_count_sweep(
     m_values: List[int] = None,
     noise_std: float = 0.0,
+    elevation_deg: float = 45.0,
+    create_fn: Callable = create_gaussian_surface,
+    shape_name: str = "gaussian",
 ) -> Dict[int, float]:
     """
     Sweep number of lights from 3 to 20 and measure RMSE.
-    Uses Gaussian surface with FFT solver.
+    Uses Gaussian surface (or create_fn, stored as shape_name) with FFT
+    solver, lights at elevation_deg.
     """
     if m_values is None:
         m_values = LIGHT_SWEEP_RANGE
     
-    X, Y, Z_true, dx, dy = create_gaussian_surface()
-    N_true = normals_from_height(Z_true, dx, dy)
+    Z_true, dx, dy, N_true = surface_stage(create_fn)
     
     results = {}
     
     for m in m_values:
-        lights = make_rotating_lights(m, elevation_deg=45.0)
-        images = render_photometric_images(N_true, lights, noise_std=noise_std)
-        N_est = photometric_stereo(images, lights)
-        p, q = gradients_from_normals(N_est)
-        f = compute_divergence(p, q, dx, dy)
+        lights = make_rotating_lights(m, elevation_deg)
+        if noise_std > 0:
+            images = render_photometric_images(N_true, lights, noise_std=noise_std)
+            N_est = photometric_stereo(images, lights)
+            p, q = gradients_from_normals(N_est)
+            f = compute_divergence(p, q, dx, dy)
+        else:
+            N_est, f = stereo_stage(N_true, lights, dx, dy)
         Z_est = solve_poisson_fft(f, dx, dy)
         
         rmse = compute_rmse(Z_true, Z_est)
         results[m] = rmse
+        get_results_store().append(shape_name, "fft", {"rmse": rmse},
+                                   protocol_params(m, elevation_deg, noise_std, False, Z_true.shape[1]),
+                                   experiment="light_sweep")
         print(f"    m={m:2d} lights: RMSE = {rmse:.6f}")
     
     return results
@@ -71,49 +89,140 @@ def run_light_count_sweep(
 # Ablation 2: Noise Robustness
 # ============================================================================
 
+@traced
 def run_noise_sweep(
     noise_levels: List[float] = None,
     m_lights: int = 16,
+    elevation_deg: float = 45.0,
+    create_fn: Callable = create_gaussian_surface,
+    shape_name: str = "gaussian",
 ) -> Dict[float, float]:
     """
     Sweep noise level from 0 to 0.08 and measure RMSE.
-    Uses Gaussian surface with FFT solver.
+    Uses Gaussian surface (or create_fn, stored as shape_name) with FFT
+    solver, lights at elevation_deg.
     """
     if noise_levels is None:
         noise_levels = NOISE_LEVELS
     
-    X, Y, Z_true, dx, dy = create_gaussian_surface()
-    N_true = normals_from_height(Z_true, dx, dy)
-    lights = make_rotating_lights(m_lights, elevation_deg=45.0)
+    Z_true, dx, dy, N_true = surface_stage(create_fn)
+    lights = make_rotating_lights(m_lights, elevation_deg)
     
     results = {}
     
     for sigma in noise_levels:
-        images = render_photometric_images(N_true, lights, noise_std=sigma)
-        N_est = photometric_stereo(images, lights)
-        p, q = gradients_from_normals(N_est)
-        f = compute_divergence(p, q, dx, dy)
+        if sigma > 0:
+            images = render_photometric_images(N_true, lights, noise_std=sigma)
+            N_est = photometric_stereo(images, lights)
+            p, q = gradients_from_normals(N_est)
+            f = compute_divergence(p, q, dx, dy)
+        else:
+            N_est, f = stereo_stage(N_true, lights, dx, dy)
         Z_est = solve_poisson_fft(f, dx, dy)
         
         rmse = compute_rmse(Z_true, Z_est)
         results[sigma] = rmse
+        get_results_store().append(shape_name, "fft", {"rmse": rmse},
+                                   protocol_params(m_lights, elevation_deg, sigma, False, Z_true.shape[1]),
+                                   experiment="noise_sweep")
         print(f"    σ={sigma:.3f}: RMSE = {rmse:.6f}")
     
     return results
 
 
+@traced
+def run_noise_monte_carlo(
+    noise_levels: List[float] = None,
+    m_lights: int = 16,
+    trials: int = MONTE_CARLO_TRIALS,
+    trial_batch: int = 16,
+    confidence: float = 0.95,
+    seed: int = 0,
+    elevation_deg: float = 45.0,
+    create_fn: Callable = create_gaussian_surface,
+    shape_name: str = "gaussian",
+) -> Dict[float, Dict[str, float]]:
+    """
+    Monte Carlo version of the noise sweep: RMSE mean and confidence interval.
+    
+    The clean images are rendered once; each batch of trial_batch noise
+    realizations is a (batch, m, Ny, Nx) stack pushed through batched
+    photometric stereo, divergence and FFT solve in single vectorized
+    calls. trial_batch bounds memory (batch * m * Ny * Nx floats).
+    
+    Returns
+    -------
+    results : dict
+        {σ: {'mean_rmse', 'std_rmse', 'ci_low', 'ci_high', 'trials'}},
+        with a two-sided Student-t interval at the given confidence; the
+        store rows (under shape_name) also carry the mean as rmse
+    """
+    if noise_levels is None:
+        noise_levels = NOISE_LEVELS
+    
+    Z_true, dx, dy, N_true = surface_stage(create_fn)
+    lights = make_rotating_lights(m_lights, elevation_deg)
+    clean = render_photometric_images(N_true, lights)
+    Z_true_c = Z_true - np.mean(Z_true)
+    rng = np.random.default_rng(seed)
+    
+    results = {}
+    
+    for sigma in noise_levels:
+        rmse = np.empty(trials)
+        
+        for t0 in range(0, trials, trial_batch):
+            k = min(trial_batch, trials - t0)
+            
+            # k noisy copies of the image stack, clipped non-negative in place
+            images = rng.normal(0, sigma, (k,) + clean.shape)
+            images += clean
+            np.clip(images, 0, None, out=images)
+            
+            N_est = photometric_stereo(images, lights)
+            p, q = gradients_from_normals(N_est)
+            f = compute_divergence(p, q, dx, dy)
+            Z_est = solve_poisson_fft(f, dx, dy)  # mean-centered per trial
+            
+            rmse[t0:t0 + k] = np.sqrt(np.mean((Z_true_c - Z_est)**2, axis=(-2, -1)))
+        
+        mean = float(np.mean(rmse))
+        std = float(np.std(rmse, ddof=1)) if trials > 1 else 0.0
+        half_width = float(stats.t.ppf(0.5 + confidence / 2, trials - 1) * std / np.sqrt(trials)) if trials > 1 else 0.0
+        
+        results[sigma] = {
+            'mean_rmse': mean,
+            'std_rmse': std,
+            'ci_low': mean - half_width,
+            'ci_high': mean + half_width,
+            'trials': trials,
+        }
+        params = protocol_params(m_lights, elevation_deg, sigma, False, Z_true.shape[1])
+        get_results_store().append(shape_name, "fft", {**results[sigma], "rmse": mean},
+                                   {**params, "confidence": confidence, "seed": seed},
+                                   experiment="noise_monte_carlo")
+        print(f"    σ={sigma:.3f}: RMSE = {mean:.6f} ± {half_width:.6f} ({confidence:.0%} CI, {trials} trials)")
+    
+    return results
+
+
 # ============================================================================
 # Ablation 3: Tikhonov Regularization Sweep
 # ============================================================================
 
+@traced
 def run_tikhonov_sweep(
     lambdas: np.ndarray = None,
     noise_std: float = 0.05,
     m_lights: int = 16,
+    elevation_deg: float = 45.0,
+    create_fn: Callable = create_gaussian_surface,
+    shape_name: str = "gaussian",
 ) -> Dict[str, Dict]:
     """
     Compare unregularized FFT vs Tikhonov-regularized FFT under noise.
-    Sweeps lambda from 10^-5 to 1.
+    Sweeps lambda from 10^-5 to 1. Store rows are stored under shape_name;
+    each Tikhonov row has its λ as the 'lambda' param.
     
     Returns dict with:
         - 'fft_rmse': RMSE of unregularized FFT
@@ -124,9 +233,8 @@ def run_tikhonov_sweep(
     if lambdas is None:
         lambdas = TIKHONOV_LAMBDAS
     
-    X, Y, Z_true, dx, dy = create_gaussian_surface()
-    N_true = normals_from_height(Z_true, dx, dy)
-    lights = make_rotating_lights(m_lights, elevation_deg=45.0)
+    Z_true, dx, dy, N_true = surface_stage(create_fn)
+    lights = make_rotating_lights(m_lights, elevation_deg)
     
     # Add noise
     images = render_photometric_images(N_true, lights, noise_std=noise_std)
@@ -137,6 +245,9 @@ def run_tikhonov_sweep(
     # Unregularized FFT baseline
     Z_fft = solve_poisson_fft(f, dx, dy)
     fft_rmse = compute_rmse(Z_true, Z_fft)
+    params = protocol_params(m_lights, elevation_deg, noise_std, False, Z_true.shape[1])
+    store = get_results_store()
+    store.append(shape_name, "fft", {"rmse": fft_rmse}, params, experiment="tikhonov_sweep")
     print(f"    FFT (no regularization): RMSE = {fft_rmse:.6f}")
     
     # Tikhonov sweep
@@ -145,6 +256,8 @@ def run_tikhonov_sweep(
         Z_tik = solve_poisson_tikhonov(f, dx, dy, lam=lam)
         rmse = compute_rmse(Z_true, Z_tik)
         tikhonov_results[float(lam)] = rmse
+        store.append(shape_name, "tikhonov", {"rmse": rmse}, {**params, "lambda": float(lam)},
+                     experiment="tikhonov_sweep")
         print(f"    Tikhonov λ={lam:.1e}: RMSE = {rmse:.6f}")
     
     # Find optimal lambda
@@ -167,24 +280,66 @@ def run_tikhonov_sweep(
 # Run All Ablation Studies
 # ============================================================================
 
-def run_all_ablation_studies() -> Dict:
-    """Run all ablation experiments and return results."""
+# Ablation studies selectable by name, in run order
+ABLATION_STUDIES = ("light_sweep", "noise_sweep", "noise_monte_carlo", "tikhonov_sweep")
+
+
+def run_all_ablation_studies(
+    studies: List[str] = None,
+    create_fn: Callable = create_gaussian_surface,
+    m_lights: int = 16,
+    trials: int = MONTE_CARLO_TRIALS,
+    elevation_deg: float = 45.0,
+    noise_std: float = 0.0,
+    shape_name: str = "gaussian",
+) -> Dict:
+    """
+    Run the ablation experiments and return results.
+    
+    `studies` selects a subset of ABLATION_STUDIES (default: all);
+    `create_fn` replaces the Gaussian test surface, and `m_lights` and
+    `trials` set the light count of the noise and Tikhonov studies and
+    the Monte Carlo trial count. `elevation_deg` applies to every study;
+    `noise_std` only to the light sweep, as the noise studies sweep
+    their own levels and the Tikhonov sweep runs at σ=0.05. Sweep points
+    are appended to the results store under `shape_name`.
+    """
+    studies = ABLATION_STUDIES if studies is None else studies
+    unknown = [name for name in studies if name not in ABLATION_STUDIES]
+    if unknown:
+        raise ValueError(f"Unknown ablation study {unknown}; choose from {ABLATION_STUDIES}")
+    
     results = {}
     
-    print("\n" + "="*60)
-    print("ABLATION STUDY 1: Light Count Sweep")
-    print("="*60)
-    results['light_sweep'] = run_light_count_sweep()
+    if "light_sweep" in studies:
+        print("\n" + "="*60)
+        print("ABLATION STUDY 1: Light Count Sweep")
+        print("="*60)
+        results['light_sweep'] = run_light_count_sweep(noise_std=noise_std, elevation_deg=elevation_deg,
+                                                        create_fn=create_fn, shape_name=shape_name)
     
-    print("\n" + "="*60)
-    print("ABLATION STUDY 2: Noise Robustness")
-    print("="*60)
-    results['noise_sweep'] = run_noise_sweep()
+    if "noise_sweep" in studies:
+        print("\n" + "="*60)
+        print("ABLATION STUDY 2: Noise Robustness")
+        print("="*60)
+        results['noise_sweep'] = run_noise_sweep(m_lights=m_lights, elevation_deg=elevation_deg,
+                                                  create_fn=create_fn, shape_name=shape_name)
     
-    print("\n" + "="*60)
-    print("ABLATION STUDY 3: Tikhonov Regularization Sweep (σ=0.05)")
-    print("="*60)
-    results['tikhonov_sweep'] = run_tikhonov_sweep(noise_std=0.05)
+    if "noise_monte_carlo" in studies:
+        print("\n" + "="*60)
+        print("ABLATION STUDY 2b: Noise Robustness (Monte Carlo)")
+        print("="*60)
+        results['noise_monte_carlo'] = run_noise_monte_carlo(m_lights=m_lights, trials=trials,
+                                                             elevation_deg=elevation_deg,
+                                                             create_fn=create_fn, shape_name=shape_name)
+    
+    if "tikhonov_sweep" in studies:
+        print("\n" + "="*60)
+        print("ABLATION STUDY 3: Tikhonov Regularization Sweep (σ=0.05)")
+        print("="*60)
+        results['tikhonov_sweep'] = run_tikhonov_sweep(noise_std=0.05, m_lights=m_lights,
+                                                       elevation_deg=elevation_deg,
+                                                       create_fn=create_fn, shape_name=shape_name)
     
     return results
 
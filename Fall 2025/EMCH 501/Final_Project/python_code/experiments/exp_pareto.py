@@ -0,0 +1,218 @@
+# experiments/exp_pareto.py
+"""
+Accuracy-vs-time Pareto exploration of the Poisson solvers.
+
+The solver comparison reports RMSE, but the choice of solver is a trade
+between accuracy and time. For every shape and resolution this measures
+the RMSE and median solve time of each candidate (every solver, and
+Tikhonov at several λ), marks the Pareto front (no other candidate is
+both faster and more accurate) and saves everything as the solver profile
+that solvers.auto.select_solver reads.
+
+Usage:
+    python -m experiments.exp_pareto --shapes gaussian sphere --resolutions 64 128 256
+"""
+
+import argparse
+import json
+import os
+import platform
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solvers.auto import BASE_CANDIDATES, tikhonov_candidate, get_candidate
+from experiments.exp_solver_compare import (
+    SHAPES,
+    EXTRA_SHAPES,
+    resolve_shapes,
+    prepare_shape,
+    compute_metrics,
+    protocol_params,
+)
+from experiments.results_store import get_results_store
+from config import SOLVER_PROFILE, PARETO_RESOLUTIONS, PARETO_TIKHONOV_LAMBDAS
+from profiling import span, traced
+
+
+def default_candidates(lambdas: List[float] = None) -> List[str]:
+    """Every solver plus Tikhonov at each λ (PARETO_TIKHONOV_LAMBDAS by default)."""
+    if lambdas is None:
+        lambdas = PARETO_TIKHONOV_LAMBDAS
+    return list(BASE_CANDIDATES) + [tikhonov_candidate(lam) for lam in lambdas]
+
+
+def pareto_front(points: List[Dict[str, Any]]) -> List[str]:
+    """
+    Candidates not dominated by another one that is at least as fast and
+    strictly more accurate, ordered from fastest to most accurate.
+    """
+    front, best_rmse = [], float('inf')
+    for p in sorted(points, key=lambda p: (p["time_ms"], p["rmse"])):
+        if p["rmse"] < best_rmse:
+            front.append(p["candidate"])
+            best_rmse = p["rmse"]
+    return front
+
+
+@traced
+def measure_candidates(
+    prepared: Dict[str, Any],
+    candidates: List[str],
+    repeats: int = 5,
+) -> List[Dict[str, Any]]:
+    """
+    RMSE and solve time of each candidate on one prepared shape.
+
+    Each candidate is called once untimed, then `repeats` times.
+
+    Returns
+    -------
+    points : list of dict
+        candidate, rmse, time_ms (median) and times_ms (all repeats);
+        a failing candidate gets rmse None and its error
+    """
+    f, dx, dy = prepared["f"], prepared["dx"], prepared["dy"]
+    points = []
+    for name in candidates:
+        solver_fn = get_candidate(name)
+        try:
+            Z_est = solver_fn(f, dx, dy)
+            times = []
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                solver_fn(f, dx, dy)
+                times.append((time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            points.append({"candidate": name, "rmse": None, "time_ms": None, "error": str(e)})
+            continue
+        points.append({"candidate": name, "rmse": compute_metrics(prepared["Z_true"], Z_est)["rmse"],
+                       "time_ms": float(np.median(times)), "times_ms": times})
+    return points
+
+
+def run_pareto_exploration(
+    shapes=None,
+    resolutions: List[int] = None,
+    candidates: List[str] = None,
+    m_lights: int = 16,
+    elevation_deg: float = 45.0,
+    noise_std: float = 0.0,
+    repeats: int = 5,
+    output_path: str = SOLVER_PROFILE,
+) -> Dict[str, Any]:
+    """
+    Measure every candidate on every shape at every resolution.
+
+    Points are also appended to the results store (experiment "pareto").
+
+    Parameters
+    ----------
+    shapes : list of str or dict, optional
+        Shape selection (see resolve_shapes; default: the eight shapes)
+    resolutions : list of int, optional
+        Grid sizes N (default: PARETO_RESOLUTIONS)
+    candidates : list of str, optional
+        Candidate names (default: default_candidates())
+    output_path : str or None
+        Where the profile is saved (None: not saved)
+
+    Returns
+    -------
+    profile : dict
+        settings, machine and profiles {shape: {resolution: {points, front}}}
+    """
+    if resolutions is None:
+        resolutions = PARETO_RESOLUTIONS
+    if candidates is None:
+        candidates = default_candidates()
+
+    params = protocol_params(m_lights, elevation_deg, noise_std, analytic_normals=False)
+    profile = {
+        "settings": {**params, "resolutions": list(resolutions), "candidates": list(candidates),
+                     "repeats": repeats},
+        "machine": {"platform": platform.platform(), "numpy": np.__version__, "cpus": os.cpu_count()},
+        "created": time.time(),
+        "profiles": {},
+    }
+    store = get_results_store()
+
+    for resolution in resolutions:
+        for shape_name, create_fn in resolve_shapes(shapes, resolution).items():
+            with span("experiments.pareto", cat="experiments", shape=shape_name, resolution=resolution):
+                prepared = prepare_shape(create_fn, m_lights, elevation_deg, noise_std, seed=0)
+                points = measure_candidates(prepared, candidates, repeats)
+            measured = [p for p in points if p["rmse"] is not None]
+            front = pareto_front(measured)
+            for p in points:
+                p["pareto"] = p["candidate"] in front
+                store.append(shape_name, p["candidate"], p, {**params, "resolution": resolution},
+                             experiment="pareto")
+            profile["profiles"].setdefault(shape_name, {})[str(resolution)] = {"points": points, "front": front}
+            print(f"  {shape_name:<10} {resolution:>5}: " + " → ".join(
+                f"{p['candidate']} ({p['time_ms']:.2f} ms, {p['rmse']:.4f})"
+                for name in front for p in measured if p["candidate"] == name))
+
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, 'w') as fh:
+            json.dump(profile, fh, indent=2)
+        print(f"\nSolver profile saved to: {output_path}")
+    return profile
+
+
+def save_pareto_plot(profile: Dict[str, Any], filepath: str) -> None:
+    """RMSE vs solve time, one panel per resolution, every point with each shape's front joined."""
+    resolutions = profile["settings"]["resolutions"]
+    fig, axes = plt.subplots(1, len(resolutions), figsize=(5 * len(resolutions), 4.5), squeeze=False)
+    for ax, resolution in zip(axes[0], resolutions):
+        for shape_name, by_resolution in profile["profiles"].items():
+            entry = by_resolution.get(str(resolution))
+            if entry is None:
+                continue
+            measured = {p["candidate"]: p for p in entry["points"] if p["rmse"] is not None}
+            line, = ax.plot([p["time_ms"] for p in measured.values()],
+                            [p["rmse"] for p in measured.values()], 'o', alpha=0.4, markersize=4)
+            front = [measured[name] for name in entry["front"]]
+            ax.plot([p["time_ms"] for p in front], [p["rmse"] for p in front], 'o-',
+                    color=line.get_color(), label=shape_name, markersize=5)
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel('Solve time (ms)')
+        ax.set_ylabel('RMSE')
+        ax.set_title(f'{resolution}x{resolution}')
+        ax.grid(True, which='both', alpha=0.3)
+    axes[0][-1].legend(fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig(filepath, dpi=150)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--shapes', nargs='+', choices=sorted({**SHAPES, **EXTRA_SHAPES}))
+    parser.add_argument('--resolutions', type=int, nargs='+', default=PARETO_RESOLUTIONS)
+    parser.add_argument('--lambdas', type=float, nargs='+', default=PARETO_TIKHONOV_LAMBDAS,
+                        help="Tikhonov λ values to include as candidates")
+    parser.add_argument('--lights', type=int, default=16)
+    parser.add_argument('--noise', type=float, default=0.0)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', default=SOLVER_PROFILE)
+    args = parser.parse_args()
+
+    profile = run_pareto_exploration(args.shapes, args.resolutions, default_candidates(args.lambdas),
+                                     args.lights, noise_std=args.noise, repeats=args.repeats,
+                                     output_path=args.output)
+    save_pareto_plot(profile, os.path.splitext(args.output)[0] + ".png")
+
+
+if __name__ == "__main__":
+    main()
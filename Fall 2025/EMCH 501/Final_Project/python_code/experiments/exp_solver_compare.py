@@ -4,7 +4,10 @@ Solver comparison experiments: test each shape with all three solvers.
 Maps to Section 5.8 Solver Comparison Experiments in project_restructured.tex.
 """
 
+import functools
+import inspect
 import time
+import zlib
 import os
 import numpy as np
 from typing import Dict, Callable, Tuple, Any
@@ -22,20 +25,24 @@ from surfaces import (
     create_saddle_surface,
     create_peaks_surface,
     create_sinusoid_surface,
+    create_fractal_surface,
 )
 from solvers import (
     solve_poisson_fft,
     solve_poisson_fd_dirichlet,
     solve_poisson_dct_neumann,
+    solve_poisson_auto,
 )
 from photometric import (
     make_rotating_lights,
     render_photometric_images,
     photometric_stereo,
     gradients_from_normals,
-    normals_from_height,
     compute_divergence,
 )
+from experiments.cache import surface_stage, stereo_stage
+from experiments.raw_store import get_raw_store
+from experiments.results_store import get_results_store
 from visualization import (
     save_heatmap,
     save_error_map,
@@ -43,8 +50,107 @@ from visualization import (
     save_profile_plot,
     save_error_histogram,
     save_normal_rgb,
+    save_heatmap_fast,
+    save_error_map_fast,
+    save_normal_rgb_fast,
+    save_heatmap_reuse,
+    save_error_map_reuse,
+    save_normal_rgb_reuse,
+    save_3d_surface_reuse,
+    save_profile_plot_reuse,
+    save_error_histogram_reuse,
+    save_hillshade,
 )
-from config import OUTPUT_DIR
+from config import OUTPUT_DIR, FIGURE_MODE, SOLVER_PROFILE
+from profiling import span, traced, measure_memory, is_profiling_memory
+
+
+# The eight analytic test shapes of Section 5.1 (run by default)
+SHAPES = {
+    "gaussian": create_gaussian_surface,
+    "sphere": create_sphere_surface,
+    "cube": create_cube_surface,
+    "ellipsoid": create_ellipsoid_surface,
+    "cone": create_cone_surface,
+    "saddle": create_saddle_surface,
+    "peaks": create_peaks_surface,
+    "sinusoid": create_sinusoid_surface,
+}
+
+# Poisson solvers compared in Section 5.8
+SOLVERS = {
+    "fft": solve_poisson_fft,
+    "fd_dirichlet": solve_poisson_fd_dirichlet,
+    "dct_neumann": solve_poisson_dct_neumann,
+}
+
+# Additional solvers selectable by name; "auto" picks from the solver
+# profile of experiments/exp_pareto.py (see resolve_solvers)
+EXTRA_SOLVERS = {
+    "auto": solve_poisson_auto,
+}
+
+# Figure export modes of generate_figures
+FIGURE_MODES = ("full", "reuse", "fast", "raster", "none")
+
+# Additional shapes selectable by name
+EXTRA_SHAPES = {
+    "fractal": create_fractal_surface,
+}
+
+
+def resolve_shapes(shapes=None, resolution: int = None) -> Dict[str, Callable]:
+    """
+    Map a shape selection to {name: create_fn}.
+
+    Accepts None (the default eight shapes), a list of names from SHAPES or
+    EXTRA_SHAPES, or an explicit {name: create_fn} dict. With a resolution,
+    each generator is bound to an N × N grid (Nx=Ny=resolution).
+    """
+    if shapes is None:
+        selected = dict(SHAPES)
+    elif isinstance(shapes, dict):
+        selected = dict(shapes)
+    else:
+        available = {**SHAPES, **EXTRA_SHAPES}
+        unknown = [name for name in shapes if name not in available]
+        if unknown:
+            raise ValueError(f"Unknown shape(s) {unknown}; choose from {sorted(available)}")
+        selected = {name: available[name] for name in shapes}
+
+    if resolution is not None:
+        selected = {name: functools.partial(create_fn, Nx=resolution, Ny=resolution)
+                    for name, create_fn in selected.items()}
+    return selected
+
+
+def resolve_solvers(
+    solvers=None,
+    rmse_target: float = None,
+    solver_profile: str = SOLVER_PROFILE,
+) -> Dict[str, Callable]:
+    """
+    Map a solver selection to {name: solver_fn}.
+
+    Accepts None (SOLVERS), a list of names from SOLVERS or EXTRA_SOLVERS,
+    or an explicit {name: solver_fn} dict. "auto" is bound to rmse_target
+    (None: the most accurate candidate) and the solver_profile to pick
+    from; run_shape_all_solvers adds the shape as its surface class.
+    """
+    if solvers is None:
+        return dict(SOLVERS)
+    if isinstance(solvers, dict):
+        return dict(solvers)
+
+    available = {**SOLVERS, **EXTRA_SOLVERS}
+    unknown = [name for name in solvers if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown solver(s) {unknown}; choose from {sorted(available)}")
+    selected = {name: available[name] for name in solvers}
+    if "auto" in selected:
+        selected["auto"] = functools.partial(selected["auto"], rmse_target=rmse_target,
+                                             profile_path=solver_profile)
+    return selected
 
 
 def compute_metrics(Z_true: np.ndarray, Z_est: np.ndarray) -> Dict[str, float]:
@@ -55,6 +161,7 @@ def compute_metrics(Z_true: np.ndarray, Z_est: np.ndarray) -> Dict[str, float]:
     return {"rmse": float(rmse)}
 
 
+@traced
 def generate_figures(
     shape_name: str,
     solver_name: str,
@@ -62,6 +169,9 @@ def generate_figures(
     Z_est: np.ndarray,
     N_true: np.ndarray = None,
     N_est: np.ndarray = None,
+    mode: str = FIGURE_MODE,
+    spacing: Tuple[float, float] = (1.0, 1.0),
+    output_dir: str = OUTPUT_DIR,
 ) -> None:
     """
     Generate and save figures for a shape/solver combination.
@@ -73,41 +183,244 @@ def generate_figures(
     - Center-line profile
     - Error histogram
     - Normal maps (if provided)
+    
+    `mode` is one of FIGURE_MODES: "full" draws everything with
+    matplotlib; "reuse" draws the same figures into persistent templates
+    (visualization.templates); "fast" writes the heatmaps, error map and
+    normal maps with the raster PNG writer (no titles or axes), the 3D
+    surfaces as oblique shaded reliefs (visualization.hillshade) and the
+    plots with matplotlib; "raster" writes only the raster images and
+    reliefs; "none" skips. `spacing` is the (dx, dy) grid spacing, used to
+    shade the reliefs. Figures go to output_dir/figures/<shape>/<solver>.
     """
-    base_dir = os.path.join(OUTPUT_DIR, "figures", shape_name, solver_name)
+    if mode not in FIGURE_MODES:
+        raise ValueError(f"Unknown figure mode {mode!r}; choose from {FIGURE_MODES}")
+    if mode == "none":
+        return
+    
+    base_dir = os.path.join(output_dir, "figures", shape_name, solver_name)
     os.makedirs(base_dir, exist_ok=True)
     
+    if mode == "reuse":
+        surface_3d, profile_plot, error_histogram = (save_3d_surface_reuse, save_profile_plot_reuse,
+                                                     save_error_histogram_reuse)
+    else:
+        surface_3d, profile_plot, error_histogram = save_3d_surface, save_profile_plot, save_error_histogram
+    if mode == "full":
+        heatmap, error_map, normal_rgb = save_heatmap, save_error_map, save_normal_rgb
+    elif mode == "reuse":
+        heatmap, error_map, normal_rgb = save_heatmap_reuse, save_error_map_reuse, save_normal_rgb_reuse
+    else:
+        heatmap, error_map, normal_rgb = save_heatmap_fast, save_error_map_fast, save_normal_rgb_fast
+    plots = mode != "raster"
+    
     # 3D surfaces
-    save_3d_surface(Z_true, os.path.join(base_dir, "3d_true.png"), 
-                    title=f"{shape_name} - Ground Truth")
-    save_3d_surface(Z_est, os.path.join(base_dir, "3d_est.png"),
-                    title=f"{shape_name} - {solver_name}")
+    if mode in ("fast", "raster"):
+        dx, dy = spacing
+        save_hillshade(Z_true, os.path.join(base_dir, "3d_true.png"), dx=dx, dy=dy, N=N_true)
+        save_hillshade(Z_est, os.path.join(base_dir, "3d_est.png"), dx=dx, dy=dy)
+    else:
+        surface_3d(Z_true, os.path.join(base_dir, "3d_true.png"), 
+                   title=f"{shape_name} - Ground Truth")
+        surface_3d(Z_est, os.path.join(base_dir, "3d_est.png"),
+                   title=f"{shape_name} - {solver_name}")
     
     # Depth heatmaps
-    save_heatmap(Z_true, os.path.join(base_dir, "depth_true.png"),
-                 title=f"{shape_name} - True Depth")
-    save_heatmap(Z_est, os.path.join(base_dir, "depth_est.png"),
-                 title=f"{shape_name} - Estimated ({solver_name})")
+    heatmap(Z_true, os.path.join(base_dir, "depth_true.png"),
+            title=f"{shape_name} - True Depth")
+    heatmap(Z_est, os.path.join(base_dir, "depth_est.png"),
+            title=f"{shape_name} - Estimated ({solver_name})")
     
     # Error map
-    save_error_map(Z_true, Z_est, os.path.join(base_dir, "error_map.png"),
-                   title=f"{shape_name} - Depth Error ({solver_name})")
-    
-    # Profile plot
-    save_profile_plot(Z_true, Z_est, os.path.join(base_dir, "profile.png"),
-                      title=f"{shape_name} - Center Profile ({solver_name})")
+    error_map(Z_true, Z_est, os.path.join(base_dir, "error_map.png"),
+              title=f"{shape_name} - Depth Error ({solver_name})")
     
-    # Error histogram
-    save_error_histogram(Z_true, Z_est, os.path.join(base_dir, "histogram.png"),
-                         title=f"{shape_name} - Error Distribution ({solver_name})")
+    if plots:
+        # Profile plot
+        profile_plot(Z_true, Z_est, os.path.join(base_dir, "profile.png"),
+                     title=f"{shape_name} - Center Profile ({solver_name})")
+        
+        # Error histogram
+        error_histogram(Z_true, Z_est, os.path.join(base_dir, "histogram.png"),
+                        title=f"{shape_name} - Error Distribution ({solver_name})")
     
     # Normal maps
     if N_true is not None:
-        save_normal_rgb(N_true, os.path.join(base_dir, "normals_true.png"),
-                        title=f"{shape_name} - True Normals")
+        normal_rgb(N_true, os.path.join(base_dir, "normals_true.png"),
+                   title=f"{shape_name} - True Normals")
     if N_est is not None:
-        save_normal_rgb(N_est, os.path.join(base_dir, "normals_est.png"),
-                        title=f"{shape_name} - Estimated Normals")
+        normal_rgb(N_est, os.path.join(base_dir, "normals_est.png"),
+                   title=f"{shape_name} - Estimated Normals")
+
+
+@traced
+def prepare_shape(
+    create_fn: Callable,
+    m_lights: int = 16,
+    elevation_deg: float = 45.0,
+    noise_std: float = 0.0,
+    analytic_normals: bool = False,
+    seed: int = None,
+) -> Dict[str, Any]:
+    """
+    Steps 1-5 of the protocol: everything before the solvers fork.
+    
+    Deterministic stages (surface, ground truth normals and, without
+    noise, the rendered stereo result) are served from the artifact cache.
+    While memory profiling is on, render/stereo/divergence always run so
+    their peak and net allocation can be recorded.
+
+    Ground truth normals come from finite differences of Z_true, or from
+    the generator's analytic gradients if analytic_normals=True. `seed`
+    reseeds np.random before rendering so that separate processes
+    preparing the same shape see identical noise.
+
+    Returns
+    -------
+    prepared : dict
+        Z_true, dx, dy, N_true, N_est, the divergence field f and
+        'memory' ({stage: MB figures}, empty unless memory profiling)
+    """
+    # Steps 1-2: Create surface and ground truth normals
+    Z_true, dx, dy, N_true = surface_stage(create_fn, analytic_normals)
+    
+    # Steps 3-5: Render, photometric stereo, gradients and divergence
+    lights = make_rotating_lights(m_lights, elevation_deg)
+    memory = {}
+    if noise_std > 0 or is_profiling_memory():
+        if seed is not None:
+            np.random.seed(seed)
+        with measure_memory() as mem:
+            images = render_photometric_images(N_true, lights, albedo=1.0, noise_std=noise_std)
+        memory["render"] = mem.as_dict()
+        with measure_memory() as mem:
+            N_est = photometric_stereo(images, lights)
+        memory["stereo"] = mem.as_dict()
+        with measure_memory() as mem:
+            p, q = gradients_from_normals(N_est)
+            f = compute_divergence(p, q, dx, dy)
+        memory["divergence"] = mem.as_dict()
+        del images
+    else:
+        # Noise-free stages are deterministic and come from the artifact cache
+        N_est, f = stereo_stage(N_true, lights, dx, dy)
+    
+    return {"Z_true": Z_true, "dx": dx, "dy": dy, "N_true": N_true, "N_est": N_est, "f": f,
+            "memory": memory if is_profiling_memory() else {}}
+
+
+def run_solver(
+    shape_name: str,
+    solver_name: str,
+    solver_fn: Callable,
+    prepared: Dict[str, Any],
+    generate_figs: bool = True,
+    figure_queue=None,
+    figure_mode: str = FIGURE_MODE,
+    output_dir: str = OUTPUT_DIR,
+) -> Dict[str, Any]:
+    """
+    Steps 6-8 for one solver: solve, score against Z_true, save figures.
+    
+    With a figure_queue (experiments.figure_queue.FigureQueue) the figures
+    are handed to background workers and this returns immediately. The
+    arrays behind the figures are also saved to the raw store
+    (experiments.raw_store) unless it is disabled.
+    
+    Any exception is caught and reported in the metrics (success=False),
+    so one failing solver never aborts the rest of the matrix. While
+    memory profiling is on, metrics['memory'] holds the peak/net MB of the
+    solve and of the shared preparation stages.
+    """
+    with span("experiments.run_solver", cat="experiments", shape=shape_name, solver=solver_name):
+        try:
+            with measure_memory() as mem:
+                t0 = time.perf_counter()
+                Z_est = solver_fn(prepared["f"], prepared["dx"], prepared["dy"])
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+            metrics = compute_metrics(prepared["Z_true"], Z_est)
+            metrics["time_ms"] = elapsed_ms
+            metrics["success"] = True
+            if is_profiling_memory():
+                metrics["memory"] = {"solve": mem.as_dict(), **prepared.get("memory", {})}
+            
+            # Keep the arrays so figures can be redrawn later (render_figures.py)
+            get_raw_store().save(shape_name, solver_name, prepared["Z_true"], Z_est,
+                                 prepared["N_true"], prepared["N_est"],
+                                 (prepared["dx"], prepared["dy"]))
+            
+            # Generate figures
+            if generate_figs and figure_queue is not None:
+                figure_queue.submit(shape_name, solver_name, prepared["Z_true"], Z_est,
+                                    prepared["N_true"], prepared["N_est"], figure_mode,
+                                    (prepared["dx"], prepared["dy"]), output_dir)
+            elif generate_figs:
+                generate_figures(shape_name, solver_name, prepared["Z_true"], Z_est,
+                                 prepared["N_true"], prepared["N_est"], figure_mode,
+                                 (prepared["dx"], prepared["dy"]), output_dir)
+                
+        except Exception as e:
+            metrics = {"rmse": float('nan'), "time_ms": 0, "success": False, "error": str(e)}
+    
+    return metrics
+
+
+def protocol_params(
+    m_lights: int,
+    elevation_deg: float,
+    noise_std: float,
+    analytic_normals: bool,
+    resolution: int = None,
+) -> Dict[str, Any]:
+    """
+    Protocol settings recorded with each result in the results store.
+
+    `resolution` is the grid width Nx actually used (omitted if None).
+    """
+    params = {"m_lights": m_lights, "elevation_deg": elevation_deg, "noise_std": noise_std,
+              "analytic_normals": analytic_normals}
+    if resolution is not None:
+        params["resolution"] = int(resolution)
+    return params
+
+
+def shape_seed(shape_name: str) -> int:
+    """Noise seed of a shape, the same in every process and on every path."""
+    return zlib.crc32(shape_name.encode())
+
+
+def run_shape_solver(
+    shape_name: str,
+    solver_name: str,
+    solver_fn: Callable,
+    prepared: Dict[str, Any],
+    generate_figs: bool = True,
+    figure_queue=None,
+    figure_mode: str = FIGURE_MODE,
+    output_dir: str = OUTPUT_DIR,
+) -> Dict[str, Any]:
+    """
+    Steps 6-8 for one solver on a prepared shape, as both the serial path
+    and the process pool run them.
+
+    Solvers that choose by surface class (auto) are told the shape, and
+    the solver they chose is recorded as selected_solver. Adds
+    wall_time_ms (solve, raw arrays and figures) and the grid [Ny, Nx] to
+    run_solver's metrics.
+    """
+    parameters = inspect.signature(solver_fn).parameters
+    selection = {}
+    if "surface" in parameters:
+        solver_fn = functools.partial(solver_fn, surface=shape_name)
+    if "selection" in parameters:
+        solver_fn = functools.partial(solver_fn, selection=selection)
+    t0 = time.perf_counter()
+    metrics = run_solver(shape_name, solver_name, solver_fn, prepared, generate_figs, figure_queue,
+                         figure_mode, output_dir)
+    metrics["wall_time_ms"] = (time.perf_counter() - t0) * 1000
+    metrics.update(selection)
+    metrics["grid"] = list(prepared["Z_true"].shape)
+    return metrics
 
 
 def run_shape_all_solvers(
@@ -117,64 +430,55 @@ def run_shape_all_solvers(
     elevation_deg: float = 45.0,
     noise_std: float = 0.0,
     generate_figs: bool = True,
+    analytic_normals: bool = False,
+    solvers: Dict[str, Callable] = None,
+    figure_queue=None,
+    figure_mode: str = FIGURE_MODE,
+    output_dir: str = OUTPUT_DIR,
+    record: bool = True,
 ) -> Dict[str, Dict[str, float]]:
     """
     Test ONE SHAPE with ALL THREE SOLVERS.
     
     Protocol (Section 5.8.1):
     1. Create surface → get Z_true, dx, dy
-    2. Compute ground truth normals
+    2. Compute ground truth normals (finite differences of Z_true, or the
+       generator's analytic gradients if analytic_normals=True)
     3. Render Lambertian images
     4. Run photometric stereo → get estimated normals
     5. Convert to gradients → compute divergence f
     6. Fork to 3 solvers: FFT, FD-Dirichlet, FD-Neumann
     7. Mean-center all, compute RMSE vs Z_true
     8. Generate figures for each solver
-    """
-    # Step 1: Create surface
-    X, Y, Z_true, dx, dy = create_fn()
-    
-    # Step 2: Compute ground truth normals
-    N_true = normals_from_height(Z_true, dx, dy)
-    
-    # Step 3: Set up lights and render
-    lights = make_rotating_lights(m_lights, elevation_deg)
-    images = render_photometric_images(N_true, lights, albedo=1.0, noise_std=noise_std)
     
-    # Step 4: Photometric stereo
-    N_est = photometric_stereo(images, lights)
+    `solvers` selects solvers (see resolve_solvers); `figure_queue` renders
+    the figures in the background (see run_solver); `figure_mode` selects
+    the figure set and writer and `output_dir` where they go (see
+    generate_figures). With `record`, each result is appended to the
+    results store as soon as its solver finishes (the process pool
+    records from the parent instead).
     
-    # Step 5: Gradients and divergence
-    p, q = gradients_from_normals(N_est)
-    f = compute_divergence(p, q, dx, dy)
+    Noise is seeded with shape_seed(shape_name), so the serial and
+    parallel paths see the same images. Each solver's metrics hold
+    prepare_ms (steps 1-5, shared by the solvers) and wall_time_ms (its
+    own steps 6-8: solve, raw arrays and figures), plus the grid
+    [Ny, Nx] it ran on.
+    """
+    t0 = time.perf_counter()
+    prepared = prepare_shape(create_fn, m_lights, elevation_deg, noise_std, analytic_normals,
+                             seed=shape_seed(shape_name))
+    prepare_ms = (time.perf_counter() - t0) * 1000
+    params = protocol_params(m_lights, elevation_deg, noise_std, analytic_normals,
+                             prepared["Z_true"].shape[1])
     
-    # Step 6: Run all three solvers
+    # Steps 6-8: Run all three solvers
     results = {}
-    
-    solvers = {
-        "fft": solve_poisson_fft,
-        "fd_dirichlet": solve_poisson_fd_dirichlet,
-        "dct_neumann": solve_poisson_dct_neumann,
-    }
-    
-    for solver_name, solver_fn in solvers.items():
-        t0 = time.time()
-        try:
-            Z_est = solver_fn(f, dx, dy)
-            elapsed_ms = (time.time() - t0) * 1000
-            metrics = compute_metrics(Z_true, Z_est)
-            metrics["time_ms"] = elapsed_ms
-            metrics["success"] = True
-            
-            # Generate figures
-            if generate_figs:
-                generate_figures(shape_name, solver_name, Z_true, Z_est, N_true, N_est)
-                
-        except Exception as e:
-            metrics = {"rmse": float('nan'), "time_ms": 0, "success": False, "error": str(e)}
-            Z_est = None
-        
-        results[solver_name] = metrics
+    for solver_name, solver_fn in resolve_solvers(solvers).items():
+        results[solver_name] = run_shape_solver(shape_name, solver_name, solver_fn, prepared,
+                                                generate_figs, figure_queue, figure_mode, output_dir)
+        results[solver_name]["prepare_ms"] = prepare_ms
+        if record:
+            get_results_store().append(shape_name, solver_name, results[solver_name], params)
     
     return results
 
@@ -184,20 +488,48 @@ def run_all_shapes_all_solvers(
     elevation_deg: float = 45.0,
     noise_std: float = 0.0,
     generate_figs: bool = True,
+    analytic_normals: bool = False,
+    shapes=None,
+    workers: int = 1,
+    figure_queue=None,
+    figure_mode: str = FIGURE_MODE,
+    solvers=None,
+    resolution: int = None,
+    output_dir: str = OUTPUT_DIR,
+    rmse_target: float = None,
+    solver_profile: str = SOLVER_PROFILE,
 ) -> Dict[str, Dict[str, Dict[str, float]]]:
     """
     Test ALL 8 SHAPES with ALL 3 SOLVERS.
+    
+    `shapes` selects a subset or adds extra shapes (see resolve_shapes),
+    e.g. shapes=["gaussian", "fractal"], and `solvers` a subset of the
+    solvers (see resolve_solvers); `resolution` overrides the generators'
+    default grid size; `rmse_target` and `solver_profile` configure the
+    auto solver. With workers != 1 the
+    shapes are dispatched to a process pool
+    (see experiments.executor; None uses every core) and figures are
+    rendered by those workers. On the serial path, a `figure_queue`
+    moves figure rendering to background processes instead; join it
+    once everything has been submitted.
     """
-    shapes = {
-        "gaussian": create_gaussian_surface,
-        "sphere": create_sphere_surface,
-        "cube": create_cube_surface,
-        "ellipsoid": create_ellipsoid_surface,
-        "cone": create_cone_surface,
-        "saddle": create_saddle_surface,
-        "peaks": create_peaks_surface,
-        "sinusoid": create_sinusoid_surface,
-    }
+    shapes = resolve_shapes(shapes, resolution)
+    solvers = resolve_solvers(solvers, rmse_target, solver_profile)
+    
+    if workers != 1:
+        from .executor import run_matrix_parallel
+        return run_matrix_parallel(
+            shapes=shapes,
+            solvers=solvers,
+            m_lights=m_lights,
+            elevation_deg=elevation_deg,
+            noise_std=noise_std,
+            generate_figs=generate_figs,
+            analytic_normals=analytic_normals,
+            workers=workers,
+            figure_mode=figure_mode,
+            output_dir=output_dir,
+        )
     
     results = {}
     
@@ -210,27 +542,49 @@ def run_all_shapes_all_solvers(
             elevation_deg=elevation_deg,
             noise_std=noise_std,
             generate_figs=generate_figs,
+            analytic_normals=analytic_normals,
+            solvers=solvers,
+            figure_queue=figure_queue,
+            figure_mode=figure_mode,
+            output_dir=output_dir,
         )
     
     return results
 
 
+# Column headings of print_results_table
+SOLVER_LABELS = {
+    "fft": "FFT (Periodic)",
+    "fd_dirichlet": "FD-Dirichlet",
+    "dct_neumann": "DCT (Neumann)",
+}
+
+
 def print_results_table(results: Dict[str, Dict[str, Dict[str, float]]]) -> None:
-    """Pretty-print results as a table."""
+    """Pretty-print RMSE results as a table, one column per solver that was run."""
+    solver_names = list(dict.fromkeys(name for solvers in results.values() for name in solvers))
+    labels = [SOLVER_LABELS.get(name, name) for name in solver_names]
+    widths = [max(len(label), 12) for label in labels]
+    
     print("\n" + "="*80)
-    print("SOLVER COMPARISON RESULTS (256x256, 32 lights)")
+    print("SOLVER COMPARISON RESULTS (RMSE)")
     print("="*80)
-    print(f"{'Shape':<12} | {'FFT (Periodic)':<14} | {'FD-Dirichlet':<12} | {'DCT (Neumann)':<13}")
+    print(f"{'Shape':<12} | " + " | ".join(f"{label:<{w}}" for label, w in zip(labels, widths)))
     print("-"*80)
     
     for shape_name, solvers in results.items():
-        fft_rmse = solvers.get("fft", {}).get("rmse", float('nan'))
-        dir_rmse = solvers.get("fd_dirichlet", {}).get("rmse", float('nan'))
-        dct_rmse = solvers.get("dct_neumann", {}).get("rmse", float('nan'))
-        
-        print(f"{shape_name:<12} | {fft_rmse:<14.6f} | {dir_rmse:<12.6f} | {dct_rmse:<13.6f}")
+        cells = [f"{solvers.get(name, {}).get('rmse', float('nan')):<{w}.6f}"
+                 for name, w in zip(solver_names, widths)]
+        print(f"{shape_name:<12} | " + " | ".join(cells))
     
     print("="*80)
+    
+    # Solvers that pick another solver (auto) report what they picked
+    for name in solver_names:
+        picks = [f"{shape_name} → {solvers[name]['selected_solver']}" for shape_name, solvers in results.items()
+                 if "selected_solver" in solvers.get(name, {})]
+        if picks:
+            print(f"{SOLVER_LABELS.get(name, name)} selected: " + ", ".join(picks))
 
 
 if __name__ == "__main__":
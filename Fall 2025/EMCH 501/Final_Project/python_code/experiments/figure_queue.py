@@ -0,0 +1,191 @@
+# experiments/figure_queue.py
+"""
+Background figure rendering on a process pool.
+
+generate_figures dominates a full run (nine matplotlib PNGs per shape/solver
+pair), while the reconstruction itself takes milliseconds. FigureQueue takes
+figure jobs off the compute path: submit() copies the job's arrays into
+shared memory and returns at once, worker processes attach by name and
+render, and join() waits for the backlog and reports failures. Arrays
+shared by several jobs (Z_true, N_true and N_est of a shape are the same
+for every solver) are copied once and released when their last job ends.
+At most max_pending jobs are in flight; submit() blocks beyond that, which
+bounds the shared memory held by the queue.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from parallel import SharedArray
+from profiling import drain_events, enable_tracing, is_tracing, merge_events, reset_trace
+from .exp_solver_compare import generate_figures
+from config import OUTPUT_DIR, FIGURE_MODE
+
+
+def _init_worker(tracing: bool) -> None:
+    """Start each rendering process with an empty trace, recording if the parent is."""
+    reset_trace()
+    if tracing:
+        enable_tracing()
+
+
+def _render_job(shape_name: str, solver_name: str, specs: Dict[str, tuple], mode: str,
+                spacing: tuple, output_dir: str) -> tuple:
+    """Attach to a job's shared arrays and render its figures; returns (ms spent, trace events)."""
+    t0 = time.perf_counter()
+    shared = {key: SharedArray.attach(spec) for key, spec in specs.items()}
+    try:
+        arrays = {key: sa.array for key, sa in shared.items()}
+        generate_figures(shape_name, solver_name, arrays["Z_true"], arrays["Z_est"],
+                         arrays.get("N_true"), arrays.get("N_est"), mode, spacing,
+                         output_dir)
+        del arrays
+    finally:
+        for sa in shared.values():
+            try:
+                sa.close()
+            except BufferError:
+                pass  # a lingering view; the mapping goes away with the worker
+    return (time.perf_counter() - t0) * 1000, drain_events()
+
+
+class FigureQueue:
+    """
+    Bounded queue of figure jobs consumed by a process pool.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Rendering processes (default: os.cpu_count())
+    max_pending : int, optional
+        Jobs in flight before submit() blocks (default: 2 * workers)
+
+    Examples
+    --------
+    >>> with FigureQueue() as figures:
+    ...     results = run_all_shapes_all_solvers(figure_queue=figures)
+    ... # leaving the block joins the queue
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         initargs=(is_tracing(),))
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * self.workers)
+        self._lock = threading.Lock()
+        self._shared = {}  # id(array) → [SharedArray, refcount, array]
+        self._futures = []
+        self.submitted = 0
+        self.completed = 0
+        self.failures: List[dict] = []
+        self.render_ms = 0.0
+
+    def _share(self, arr: np.ndarray) -> SharedArray:
+        """Shared copy of arr, reused while another pending job holds it."""
+        with self._lock:
+            entry = self._shared.get(id(arr))
+            if entry is not None and entry[2] is arr:
+                entry[1] += 1
+                return entry[0]
+        shared = SharedArray.from_array(arr)
+        with self._lock:
+            self._shared[id(arr)] = [shared, 1, arr]
+        return shared
+
+    def _release(self, arrays: List[np.ndarray]) -> None:
+        with self._lock:
+            for arr in arrays:
+                entry = self._shared[id(arr)]
+                entry[1] -= 1
+                if entry[1] == 0:
+                    entry[0].close()
+                    del self._shared[id(arr)]
+
+    def submit(
+        self,
+        shape_name: str,
+        solver_name: str,
+        Z_true: np.ndarray,
+        Z_est: np.ndarray,
+        N_true: np.ndarray = None,
+        N_est: np.ndarray = None,
+        mode: str = FIGURE_MODE,
+        spacing: tuple = (1.0, 1.0),
+        output_dir: str = OUTPUT_DIR,
+    ) -> None:
+        """Queue the figures of one shape/solver pair (same arguments as generate_figures)."""
+        self._slots.acquire()
+
+        named = {"Z_true": Z_true, "Z_est": Z_est, "N_true": N_true, "N_est": N_est}
+        arrays = {key: arr for key, arr in named.items() if arr is not None}
+        # The caller's objects are the dedup keys, so shared inputs are copied once
+        owners = list(arrays.values())
+        specs = {key: self._share(arr).spec for key, arr in arrays.items()}
+
+        future = self._pool.submit(_render_job, shape_name, solver_name, specs, mode, spacing,
+                                   output_dir)
+        self.submitted += 1
+
+        def done(fut, shape_name=shape_name, solver_name=solver_name):
+            self._release(owners)
+            with self._lock:
+                self.completed += 1
+                try:
+                    render_ms, events = fut.result()
+                    self.render_ms += render_ms
+                    merge_events(events)
+                except Exception as e:
+                    self.failures.append({"shape": shape_name, "solver": solver_name, "error": repr(e)})
+            self._slots.release()
+
+        future.add_done_callback(done)
+        self._futures.append(future)
+
+    def join(self, progress_interval: float = 2.0) -> Dict[str, object]:
+        """
+        Wait for every queued job, printing progress, and shut the pool down.
+
+        Returns
+        -------
+        summary : dict
+            submitted, completed, failed counts, the failures
+            ({shape, solver, error}), total render time summed over workers
+            and the wall time spent waiting in join
+        """
+        t0 = time.perf_counter()
+        while True:
+            _, not_done = wait(self._futures, timeout=progress_interval)
+            if not not_done:
+                break
+            print(f"  Figures: {self.submitted - len(not_done)}/{self.submitted} jobs done, "
+                  f"{len(self.failures)} failed")
+
+        # Shutting down also guarantees every done-callback has run
+        self._pool.shutdown(wait=True)
+        wait_ms = (time.perf_counter() - t0) * 1000
+
+        print(f"  Figures: {self.completed}/{self.submitted} jobs done, {len(self.failures)} failed "
+              f"({self.render_ms / 1000:.1f} s of rendering on {self.workers} workers, "
+              f"{wait_ms / 1000:.1f} s waited at join)")
+        for failure in self.failures:
+            print(f"    FAILED {failure['shape']}/{failure['solver']}: {failure['error']}")
+
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": len(self.failures),
+            "failures": list(self.failures),
+            "render_ms": self.render_ms,
+            "join_wait_ms": wait_ms,
+        }
+
+    def __enter__(self) -> "FigureQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.join()
@@ -0,0 +1,192 @@
+# experiments/raw_store.py
+"""
+Raw per-run arrays, saved so figures can be regenerated without solving.
+
+Each (shape, solver) run stores Z_true, Z_est, N_true and N_est as one
+compressed .npz under <root>/<shape>/<solver>.npz. manifest.json at the
+root lists every run with its grid spacing and a SHA-256 of its inputs,
+which render_figures.py compares against the hashes it last rendered to
+redraw only what changed. Worker processes update the manifest under a
+file lock, so a parallel run can share one store.
+"""
+
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; runs there are serial
+    fcntl = None
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import RAW_DIR
+from profiling import traced
+
+
+# Arrays of a run, in hashing order
+RUN_ARRAYS = ("Z_true", "Z_est", "N_true", "N_est")
+
+
+def run_key(shape_name: str, solver_name: str) -> str:
+    """Manifest key of a run."""
+    return f"{shape_name}/{solver_name}"
+
+
+def hash_run(arrays: Dict[str, np.ndarray], spacing: tuple) -> str:
+    """SHA-256 of a run's arrays (names, shapes, dtypes, bytes) and grid spacing."""
+    h = hashlib.sha256(json.dumps([float(s) for s in spacing]).encode())
+    for name in RUN_ARRAYS:
+        arr = arrays.get(name)
+        if arr is None:
+            continue
+        arr = np.ascontiguousarray(arr)
+        h.update(f"{name}:{arr.shape}:{arr.dtype.str}".encode())
+        h.update(arr.data)
+    return h.hexdigest()
+
+
+class RawStore:
+    """
+    Directory of per-run array bundles with a manifest.
+
+    Parameters
+    ----------
+    root : str
+        Store directory
+    enabled : bool
+        If False, save() does nothing
+    """
+
+    def __init__(self, root: str = RAW_DIR, enabled: bool = True):
+        self.root = root
+        self.enabled = enabled
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, "manifest.json")
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive lock on the manifest while reading and rewriting it."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, ".manifest.lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        """{run key: entry} of every saved run (empty if nothing was saved)."""
+        try:
+            with open(self.manifest_path) as fh:
+                return json.load(fh)["runs"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def _write_manifest(self, runs: Dict[str, Dict[str, Any]]) -> None:
+        tmp = f"{self.manifest_path}.tmp-{os.getpid()}"
+        with open(tmp, "w") as fh:
+            json.dump({"runs": runs}, fh, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    @traced
+    def save(
+        self,
+        shape_name: str,
+        solver_name: str,
+        Z_true: np.ndarray,
+        Z_est: np.ndarray,
+        N_true: np.ndarray = None,
+        N_est: np.ndarray = None,
+        spacing: tuple = (1.0, 1.0),
+    ) -> Optional[str]:
+        """
+        Write one run's arrays and record it in the manifest.
+
+        Returns
+        -------
+        digest : str or None
+            SHA-256 of the run's inputs (None if the store is disabled)
+        """
+        if not self.enabled:
+            return None
+
+        named = {"Z_true": Z_true, "Z_est": Z_est, "N_true": N_true, "N_est": N_est}
+        arrays = {name: arr for name, arr in named.items() if arr is not None}
+        digest = hash_run(arrays, spacing)
+
+        relpath = os.path.join(shape_name, f"{solver_name}.npz")
+        path = os.path.join(self.root, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp-{os.getpid()}.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+
+        entry = {
+            "shape": shape_name,
+            "solver": solver_name,
+            "file": relpath,
+            "arrays": list(arrays),
+            "grid": list(Z_true.shape),
+            "dx": float(spacing[0]),
+            "dy": float(spacing[1]),
+            "sha256": digest,
+            "bytes": os.path.getsize(path),
+            "saved": time.time(),
+        }
+        with self._locked():
+            runs = self.manifest()
+            runs[run_key(shape_name, solver_name)] = entry
+            self._write_manifest(runs)
+        return digest
+
+    def load(self, key: str) -> Dict[str, Any]:
+        """
+        Arrays and spacing of a run.
+
+        Returns
+        -------
+        run : dict
+            The manifest entry plus one item per stored array
+        """
+        entry = self.manifest()[key]
+        with np.load(os.path.join(self.root, entry["file"])) as data:
+            arrays = {name: data[name] for name in data.files}
+        return {**entry, **arrays}
+
+    def select(self, shapes: Iterable[str] = None, solvers: Iterable[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Manifest entries restricted to the given shapes and solvers (None: all)."""
+        shapes = set(shapes) if shapes else None
+        solvers = set(solvers) if solvers else None
+        return {
+            key: entry for key, entry in sorted(self.manifest().items())
+            if (shapes is None or entry["shape"] in shapes)
+            and (solvers is None or entry["solver"] in solvers)
+        }
+
+
+# Process-wide store used by the experiment modules
+_store = RawStore()
+
+
+def get_raw_store() -> RawStore:
+    """The process-wide raw array store."""
+    return _store
+
+
+def configure_raw_store(enabled: bool = True, root: str = RAW_DIR) -> RawStore:
+    """Replace the process-wide store (e.g. enabled=False for --no-raw)."""
+    global _store
+    _store = RawStore(root, enabled)
+    return _store
@@ -0,0 +1,243 @@
+# experiments/results_store.py
+"""
+Append-only SQLite store of experiment results.
+
+runner.save_results writes one nested JSON dict when everything is done,
+so a crash loses the whole sweep and finding one configuration means
+loading all of them. Here every (shape, solver) result is inserted and
+committed as soon as it completes, tagged with the run it belongs to.
+Shape, solver and the headline metrics are indexed columns; the protocol
+parameters and the full metrics dict are stored as JSON, and parameters
+can be filtered on with SQLite's json_extract. to_nested() rebuilds the
+{shape: {solver: metrics}} layout of solver_comparison_results.json.
+query_results.py is the command-line front end.
+"""
+
+import json
+import math
+import os
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import RESULTS_DB
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id  TEXT PRIMARY KEY,
+    started REAL NOT NULL,
+    label   TEXT,
+    config  TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id           INTEGER PRIMARY KEY,
+    run_id       TEXT NOT NULL,
+    experiment   TEXT NOT NULL,
+    shape        TEXT NOT NULL,
+    solver       TEXT NOT NULL,
+    params       TEXT NOT NULL,
+    rmse         REAL,
+    time_ms      REAL,
+    wall_time_ms REAL,
+    success      INTEGER,
+    metrics      TEXT NOT NULL,
+    created      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_config ON results (experiment, shape, solver);
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id);
+"""
+
+
+def make_serializable(obj: Any) -> Any:
+    """
+    Convert results to JSON-safe values.
+
+    Handles nested dicts, lists and tuples, NumPy scalars and arrays
+    (as lists), and maps NaN and ±inf to None.
+    """
+    if isinstance(obj, dict):
+        return {str(k): make_serializable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [make_serializable(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return make_serializable(obj.tolist())
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+class ResultsStore:
+    """
+    SQLite-backed, append-only result log.
+
+    Parameters
+    ----------
+    path : str
+        Database file (created on first use)
+    enabled : bool
+        If False, appends are ignored and queries return nothing
+    """
+
+    def __init__(self, path: str = RESULTS_DB, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.run_id: Optional[str] = None
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened lazily so a store can be configured in one process and used in another
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.row_factory = sqlite3.Row
+            # WAL lets readers query a sweep while it is being written
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def begin_run(self, label: str = "", config: Dict[str, Any] = None) -> Optional[str]:
+        """Start a new run; later appends are tagged with its id."""
+        if not self.enabled:
+            return None
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self._connect() as conn:
+            conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?)",
+                         (self.run_id, time.time(), label, json.dumps(make_serializable(config or {}))))
+        return self.run_id
+
+    def append(
+        self,
+        shape: str,
+        solver: str,
+        metrics: Dict[str, Any],
+        params: Dict[str, Any] = None,
+        experiment: str = "solver_compare",
+    ) -> None:
+        """Insert and commit one result row."""
+        if not self.enabled:
+            return
+        if self.run_id is None:
+            self.begin_run()
+
+        metrics = make_serializable(metrics)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO results (run_id, experiment, shape, solver, params, rmse, time_ms, "
+                "wall_time_ms, success, metrics, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, experiment, shape, solver,
+                 json.dumps(make_serializable(params or {}), sort_keys=True),
+                 metrics.get("rmse"), metrics.get("time_ms"), metrics.get("wall_time_ms"),
+                 int(bool(metrics.get("success", True))), json.dumps(metrics), time.time()),
+            )
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Every run, newest first, with its result count."""
+        if not self.enabled:
+            return []
+        rows = self._connect().execute(
+            "SELECT runs.*, COUNT(results.id) AS results FROM runs "
+            "LEFT JOIN results USING (run_id) GROUP BY run_id ORDER BY started DESC"
+        )
+        return [dict(row) for row in rows]
+
+    def resolve_run(self, run_id: Optional[str]) -> Optional[str]:
+        """'latest' → the newest run id; anything else passes through."""
+        if run_id != "latest":
+            return run_id
+        runs = self.runs()
+        return runs[0]["run_id"] if runs else None
+
+    def query(
+        self,
+        run_id: str = None,
+        experiment: str = None,
+        shape: str = None,
+        solver: str = None,
+        success: bool = None,
+        max_rmse: float = None,
+        **params,
+    ) -> List[Dict[str, Any]]:
+        """
+        Result rows matching every given filter, in insertion order.
+
+        Keyword arguments beyond the named filters match protocol
+        parameters, e.g. query(solver="fft", noise_std=0.01).
+
+        Returns
+        -------
+        rows : list of dict
+            run_id, experiment, shape, solver, params and metrics (decoded)
+        """
+        if not self.enabled:
+            return []
+
+        if run_id is not None:
+            run_id = self.resolve_run(run_id)
+            if run_id is None:
+                return []
+
+        clauses, values = [], []
+        for column, value in (("run_id", run_id), ("experiment", experiment),
+                              ("shape", shape), ("solver", solver)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+        if success is not None:
+            clauses.append("success = ?")
+            values.append(int(success))
+        if max_rmse is not None:
+            clauses.append("rmse <= ?")
+            values.append(max_rmse)
+        for name, value in params.items():
+            clauses.append("json_extract(params, ?) = ?")
+            values.extend([f"$.{name}", value])
+
+        sql = "SELECT run_id, experiment, shape, solver, params, metrics FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        rows = self._connect().execute(sql + " ORDER BY id", values)
+        return [{**dict(row), "params": json.loads(row["params"]), "metrics": json.loads(row["metrics"])}
+                for row in rows]
+
+    def to_nested(self, run_id: str = "latest", experiment: str = "solver_compare") -> Dict[str, Dict[str, Any]]:
+        """{shape: {solver: metrics}} of one run, the solver_comparison_results.json layout."""
+        nested = {}
+        for row in self.query(run_id=run_id, experiment=experiment):
+            nested.setdefault(row["shape"], {})[row["solver"]] = row["metrics"]
+        return nested
+
+    def export_json(self, filepath: str, run_id: str = "latest", experiment: str = "solver_compare") -> None:
+        """Write to_nested() as JSON."""
+        with open(filepath, "w") as fh:
+            json.dump(self.to_nested(run_id, experiment), fh, indent=2)
+
+
+# Process-wide store used by the experiment modules
+_store = ResultsStore()
+
+
+def get_results_store() -> ResultsStore:
+    """The process-wide results store."""
+    return _store
+
+
+def configure_results_store(enabled: bool = True, path: str = RESULTS_DB) -> ResultsStore:
+    """Replace the process-wide store (e.g. enabled=False for --no-db)."""
+    global _store
+    _store.close()
+    _store = ResultsStore(path, enabled)
+    return _store
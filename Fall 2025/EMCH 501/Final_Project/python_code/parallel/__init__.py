@@ -0,0 +1,10 @@
+# parallel/__init__.py
+"""
+Process-parallel helpers shared by the photometric and experiment modules.
+"""
+
+from .shared import SharedArray
+
+__all__ = [
+    'SharedArray',
+]
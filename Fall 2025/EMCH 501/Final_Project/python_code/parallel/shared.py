@@ -0,0 +1,64 @@
+# parallel/shared.py
+"""NumPy arrays backed by multiprocessing.shared_memory."""
+
+from multiprocessing import shared_memory
+from typing import Tuple
+
+import numpy as np
+
+
+class SharedArray:
+    """
+    NumPy array living in a named shared-memory block.
+
+    The creating process owns the block and unlinks it; worker processes
+    attach by name through the small, picklable `spec` tuple, so large
+    arrays cross process boundaries without being pickled.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: tuple, dtype, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self.array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, shape: tuple, dtype=np.float64) -> "SharedArray":
+        """Allocate an uninitialized shared array."""
+        dtype = np.dtype(dtype)
+        nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        return cls(shm, tuple(shape), dtype, owner=True)
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray, dtype=None) -> "SharedArray":
+        """Allocate a shared array and copy `arr` into it."""
+        arr = np.asarray(arr)
+        shared = cls.create(arr.shape, dtype or arr.dtype)
+        shared.array[...] = arr
+        return shared
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, tuple, str]) -> "SharedArray":
+        """Attach to an existing block from another process's `spec`."""
+        name, shape, dtype = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, shape, np.dtype(dtype), owner=False)
+
+    @property
+    def spec(self) -> Tuple[str, tuple, str]:
+        """Picklable (name, shape, dtype) handle for attach()."""
+        return (self._shm.name, self.array.shape, self.array.dtype.str)
+
+    def close(self) -> None:
+        """Release this process's mapping (and the block itself, if owner)."""
+        self.array = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            self._owner = False
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -4,17 +4,46 @@ Photometric stereo pipeline components.
 Maps to Chapter 4 Implementation in project_restructured.tex.
 """
 
-from .lighting import make_rotating_lights
-from .rendering import render_photometric_images
-from .stereo import photometric_stereo, gradients_from_normals
-from .gradient import compute_gradients, normals_from_height, compute_divergence
+from .lighting import make_rotating_lights, make_near_field_lights, point_light_vectors
+from .rendering import render_photometric_images, render_near_field_images
+from .shadows import cast_shadow_mask, cast_shadow_masks
+from .stereo import photometric_stereo, photometric_stereo_near_field, gradients_from_normals
+from .gradient import compute_gradients, normals_from_gradients, normals_from_height, compute_divergence
+from .tiling import iter_row_tiles, stereo_divergence_tile
+from .ingest import (
+    load_lights_file,
+    decode_image,
+    load_image_stack,
+    load_photometric_capture,
+    estimate_divergence_tiled,
+    reconstruct_tiled,
+)
+from .parallel_stereo import photometric_stereo_parallel
+from .streaming import StreamingPhotometricStereo
 
 __all__ = [
     'make_rotating_lights',
+    'make_near_field_lights',
+    'point_light_vectors',
     'render_photometric_images',
+    'render_near_field_images',
+    'cast_shadow_mask',
+    'cast_shadow_masks',
     'photometric_stereo',
+    'photometric_stereo_near_field',
     'gradients_from_normals',
     'compute_gradients',
+    'normals_from_gradients',
     'normals_from_height',
     'compute_divergence',
+    'iter_row_tiles',
+    'stereo_divergence_tile',
+    'load_lights_file',
+    'decode_image',
+    'load_image_stack',
+    'load_photometric_capture',
+    'estimate_divergence_tiled',
+    'reconstruct_tiled',
+    'photometric_stereo_parallel',
+    'StreamingPhotometricStereo',
 ]
@@ -3,7 +3,10 @@
 
 import numpy as np
 
+from profiling import traced
 
+
+@traced
 def compute_gradients(Z: np.ndarray, dx: float, dy: float) -> tuple:
     """
     Compute finite-difference gradients p = ∂Z/∂x, q = ∂Z/∂y.
@@ -38,27 +41,24 @@ def compute_gradients(Z: np.ndarray, dx: float, dy: float) -> tuple:
     return p, q
 
 
-def normals_from_height(Z: np.ndarray, dx: float, dy: float) -> np.ndarray:
+@traced
+def normals_from_gradients(p: np.ndarray, q: np.ndarray) -> np.ndarray:
     """
-    Compute unit surface normals from height map.
+    Compute unit surface normals from gradient fields.
     
     n = [-p, -q, 1] / ||[-p, -q, 1]||
     
     Parameters
     ----------
-    Z : ndarray
-        Height map
-    dx, dy : float
-        Grid spacing
+    p, q : ndarray
+        Gradient fields ∂Z/∂x, ∂Z/∂y (e.g. analytic surface gradients)
         
     Returns
     -------
     N : ndarray, shape (Ny, Nx, 3)
         Unit surface normals
     """
-    p, q = compute_gradients(Z, dx, dy)
-    
-    Ny, Nx = Z.shape
+    Ny, Nx = p.shape
     N = np.zeros((Ny, Nx, 3))
     N[:, :, 0] = -p
     N[:, :, 1] = -q
@@ -71,15 +71,41 @@ def normals_from_height(Z: np.ndarray, dx: float, dy: float) -> np.ndarray:
     return N
 
 
+@traced
+def normals_from_height(Z: np.ndarray, dx: float, dy: float) -> np.ndarray:
+    """
+    Compute unit surface normals from height map.
+    
+    n = [-p, -q, 1] / ||[-p, -q, 1]||
+    
+    Parameters
+    ----------
+    Z : ndarray
+        Height map
+    dx, dy : float
+        Grid spacing
+        
+    Returns
+    -------
+    N : ndarray, shape (Ny, Nx, 3)
+        Unit surface normals
+    """
+    p, q = compute_gradients(Z, dx, dy)
+    
+    return normals_from_gradients(p, q)
+
+
+@traced
 def compute_divergence(p: np.ndarray, q: np.ndarray, dx: float, dy: float) -> np.ndarray:
     """
     Compute divergence field f = ∂p/∂x + ∂q/∂y.
     
-    This is the source term for the Poisson equation.
+    This is the source term for the Poisson equation. Leading batch
+    axes are allowed; derivatives are taken over the last two.
     
     Parameters
     ----------
-    p, q : ndarray
+    p, q : ndarray, shape (..., Ny, Nx)
         Gradient fields
     dx, dy : float
         Grid spacing
@@ -93,14 +119,14 @@ def compute_divergence(p: np.ndarray, q: np.ndarray, dx: float, dy: float) -> np
     dp_dx = np.zeros_like(p)
     dq_dy = np.zeros_like(q)
     
-    dp_dx[:, 1:-1] = (p[:, 2:] - p[:, :-2]) / (2 * dx)
-    dq_dy[1:-1, :] = (q[2:, :] - q[:-2, :]) / (2 * dy)
+    dp_dx[..., :, 1:-1] = (p[..., :, 2:] - p[..., :, :-2]) / (2 * dx)
+    dq_dy[..., 1:-1, :] = (q[..., 2:, :] - q[..., :-2, :]) / (2 * dy)
     
     # Boundaries
-    dp_dx[:, 0] = (p[:, 1] - p[:, 0]) / dx
-    dp_dx[:, -1] = (p[:, -1] - p[:, -2]) / dx
-    dq_dy[0, :] = (q[1, :] - q[0, :]) / dy
-    dq_dy[-1, :] = (q[-1, :] - q[-2, :]) / dy
+    dp_dx[..., :, 0] = (p[..., :, 1] - p[..., :, 0]) / dx
+    dp_dx[..., :, -1] = (p[..., :, -1] - p[..., :, -2]) / dx
+    dq_dy[..., 0, :] = (q[..., 1, :] - q[..., 0, :]) / dy
+    dq_dy[..., -1, :] = (q[..., -1, :] - q[..., -2, :]) / dy
     
     f = dp_dx + dq_dy
     
@@ -0,0 +1,299 @@
+# photometric/ingest.py
+"""
+Ingestion of captured photometric image sequences.
+
+Decodes 8/16-bit PNG or TIFF frames into a memory-mapped (m, Ny, Nx) stack
+and feeds it through the stereo → gradient → divergence chain tile by tile,
+so large captures are reconstructed without holding every frame in RAM.
+"""
+
+import glob
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from profiling import traced
+from .tiling import iter_row_tiles, stereo_divergence_tile
+
+
+IMAGE_EXTENSIONS = ('.png', '.tif', '.tiff')
+
+# Rec. 601 luma weights for colour captures
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114])
+
+
+def load_lights_file(path: str) -> np.ndarray:
+    """
+    Load light directions from a .npy file or whitespace/comma text file.
+
+    Parameters
+    ----------
+    path : str
+        File with one light per row: Lx Ly Lz
+
+    Returns
+    -------
+    lights : ndarray, shape (m, 3)
+        Unit light direction vectors
+    """
+    if path.lower().endswith('.npy'):
+        lights = np.load(path)
+    else:
+        with open(path) as fh:
+            text = fh.read().replace(',', ' ')
+        lights = np.loadtxt(text.splitlines(), ndmin=2)
+
+    lights = np.asarray(lights, dtype=np.float64)
+    if lights.ndim != 2 or lights.shape[1] != 3:
+        raise ValueError(f"Lights file must contain (m, 3) directions, got shape {lights.shape}")
+
+    norms = np.linalg.norm(lights, axis=1, keepdims=True)
+    if np.any(norms == 0):
+        raise ValueError("Lights file contains a zero-length direction")
+
+    return lights / norms
+
+
+def _read_raw_image(path: str) -> np.ndarray:
+    """Decode one image file to an integer or float array."""
+    if path.lower().endswith(('.tif', '.tiff')):
+        try:
+            import tifffile
+            return tifffile.imread(path)
+        except ImportError:
+            pass  # Fall back to Pillow
+
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError("Reading PNG/TIFF captures requires Pillow (pip install pillow)") from e
+
+    with Image.open(path) as im:
+        return np.asarray(im)
+
+
+def decode_image(path: str, dtype=np.float32) -> np.ndarray:
+    """
+    Decode an 8/16-bit PNG or TIFF into a grayscale intensity image.
+
+    Integer images are scaled to [0, 1] by their type range; colour images
+    are converted to luma and alpha channels are dropped.
+
+    Parameters
+    ----------
+    path : str
+        Image file path
+    dtype : dtype
+        Output floating-point type
+
+    Returns
+    -------
+    I : ndarray, shape (Ny, Nx)
+        Intensity image
+    """
+    raw = _read_raw_image(path)
+
+    if np.issubdtype(raw.dtype, np.integer):
+        scale = 1.0 / np.iinfo(raw.dtype).max
+    else:
+        scale = 1.0
+
+    if raw.ndim == 3 and raw.shape[2] >= 3:
+        # Drop alpha, convert RGB to luma
+        I = raw[..., :3] @ (_LUMA_WEIGHTS * scale)
+    elif raw.ndim == 3:
+        # Gray + alpha (or a single channel): drop alpha
+        I = raw[..., 0] * scale
+    elif raw.ndim == 2:
+        I = raw * scale
+    else:
+        raise ValueError(f"Unsupported image shape {raw.shape} in {path}")
+
+    return I.astype(dtype, copy=False)
+
+
+def list_image_files(directory: str) -> List[str]:
+    """Return the sorted PNG/TIFF files in a directory."""
+    paths = [p for p in glob.glob(os.path.join(directory, '*'))
+             if p.lower().endswith(IMAGE_EXTENSIONS)]
+    return sorted(paths)
+
+
+@traced
+def load_image_stack(
+    image_paths: Sequence[str],
+    out_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    dtype=np.float32
+) -> np.memmap:
+    """
+    Decode an image sequence into a memory-mapped (m, Ny, Nx) stack.
+
+    Frames are decoded in parallel threads (PNG/TIFF decompression releases
+    the GIL) and written straight into the memory map, so only a few frames
+    are resident at a time.
+
+    Parameters
+    ----------
+    image_paths : sequence of str
+        One image per light, in the same order as the lights file
+    out_path : str, optional
+        Backing file for the stack; an anonymous temporary file is used
+        (and removed when the stack is released) if not given
+    workers : int, optional
+        Decoder threads (default: os.cpu_count())
+    dtype : dtype
+        Stack floating-point type
+
+    Returns
+    -------
+    stack : memmap, shape (m, Ny, Nx)
+        Intensity images
+    """
+    if len(image_paths) == 0:
+        raise ValueError("No images to load")
+
+    first = decode_image(image_paths[0], dtype=dtype)
+    shape = (len(image_paths),) + first.shape
+
+    backing = out_path if out_path is not None else tempfile.TemporaryFile()
+    stack = np.memmap(backing, dtype=dtype, mode='w+', shape=shape)
+    stack[0] = first
+    del first
+
+    def _decode_into(k: int) -> None:
+        I = decode_image(image_paths[k], dtype=dtype)
+        if I.shape != shape[1:]:
+            raise ValueError(
+                f"Image {image_paths[k]} has shape {I.shape}, expected {shape[1:]}")
+        stack[k] = I
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() re-raises the first decoding error
+        list(pool.map(_decode_into, range(1, shape[0])))
+
+    stack.flush()
+    return stack
+
+
+def load_photometric_capture(
+    images: Union[str, Sequence[str]],
+    lights_path: str,
+    out_path: Optional[str] = None,
+    workers: Optional[int] = None
+) -> tuple:
+    """
+    Load a captured image sequence and its lights file.
+
+    Parameters
+    ----------
+    images : str or sequence of str
+        Directory of PNG/TIFF frames (sorted by name) or explicit file list
+    lights_path : str
+        Lights file, one direction per frame
+    out_path : str, optional
+        Backing file for the memory-mapped stack
+    workers : int, optional
+        Decoder threads
+
+    Returns
+    -------
+    stack : memmap, shape (m, Ny, Nx)
+        Intensity images
+    lights : ndarray, shape (m, 3)
+        Unit light direction vectors
+    """
+    paths = list_image_files(images) if isinstance(images, str) else list(images)
+    lights = load_lights_file(lights_path)
+
+    if len(paths) != lights.shape[0]:
+        raise ValueError(
+            f"Found {len(paths)} images but {lights.shape[0]} lights in {lights_path}")
+
+    stack = load_image_stack(paths, out_path=out_path, workers=workers)
+    return stack, lights
+
+
+@traced
+def estimate_divergence_tiled(
+    stack: np.ndarray,
+    lights: np.ndarray,
+    dx: float = 1.0,
+    dy: float = 1.0,
+    tile_rows: int = 256,
+    normals_out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Compute the Poisson source term from an image stack, one row tile at a time.
+
+    Runs photometric_stereo → gradients_from_normals → compute_divergence on
+    each tile; only tile_rows (+2 halo) rows of every frame are read at once.
+
+    Parameters
+    ----------
+    stack : ndarray or memmap, shape (m, Ny, Nx)
+        Intensity images
+    lights : ndarray, shape (m, 3)
+        Light direction matrix S
+    dx, dy : float
+        Grid spacing (pixel pitch)
+    tile_rows : int
+        Rows per tile
+    normals_out : ndarray or memmap, shape (Ny, Nx, 3), optional
+        If given, estimated normals are written here
+
+    Returns
+    -------
+    f : ndarray, shape (Ny, Nx)
+        Divergence field
+    """
+    _, Ny, Nx = stack.shape
+    f = np.empty((Ny, Nx))
+
+    for r0, r1 in iter_row_tiles(Ny, tile_rows):
+        N_tile, _, _, f_tile = stereo_divergence_tile(stack, lights, r0, r1, dx, dy)
+        f[r0:r1] = f_tile
+        if normals_out is not None:
+            normals_out[r0:r1] = N_tile
+
+    return f
+
+
+@traced
+def reconstruct_tiled(
+    stack: np.ndarray,
+    lights: np.ndarray,
+    solver: Callable,
+    dx: float = 1.0,
+    dy: float = 1.0,
+    tile_rows: int = 256,
+    normals_out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Reconstruct a height map from an (out-of-core) image stack.
+
+    Parameters
+    ----------
+    stack : ndarray or memmap, shape (m, Ny, Nx)
+        Intensity images
+    lights : ndarray, shape (m, 3)
+        Light direction matrix S
+    solver : callable
+        Poisson solver with signature solver(f, dx, dy) -> Z
+    dx, dy : float
+        Grid spacing (pixel pitch)
+    tile_rows : int
+        Rows per stereo tile
+    normals_out : ndarray or memmap, shape (Ny, Nx, 3), optional
+        If given, estimated normals are written here
+
+    Returns
+    -------
+    Z : ndarray, shape (Ny, Nx)
+        Reconstructed height map
+    """
+    f = estimate_divergence_tiled(stack, lights, dx, dy, tile_rows, normals_out)
+    return solver(f, dx, dy)
@@ -33,3 +33,79 @@ def make_rotating_lights(
     lights[:, 2] = np.cos(elevation)                      # Lz
     
     return lights
+
+
+def make_near_field_lights(
+    m: int = 16,
+    radius: float = 1.0,
+    height: float = 1.0
+) -> np.ndarray:
+    """
+    Create point lights (LEDs) on a ring above the part.
+
+    Parameters
+    ----------
+    m : int
+        Number of lights
+    radius : float
+        Ring radius in the x-y plane (same units as the surface grid)
+    height : float
+        Ring height above z = 0
+
+    Returns
+    -------
+    positions : ndarray, shape (m, 3)
+        Light positions [Px, Py, Pz]
+    """
+    azimuths = np.linspace(0, 2 * np.pi, m, endpoint=False)
+
+    positions = np.zeros((m, 3))
+    positions[:, 0] = radius * np.cos(azimuths)
+    positions[:, 1] = radius * np.sin(azimuths)
+    positions[:, 2] = height
+
+    return positions
+
+
+def point_light_vectors(
+    positions: np.ndarray,
+    X: np.ndarray,
+    Y: np.ndarray,
+    Z,
+    intensity=1.0
+) -> np.ndarray:
+    """
+    Per-pixel effective light vectors of near-field point lights.
+
+    s = Φ (P - x) / |P - x|³
+
+    i.e. the unit direction towards the light scaled by inverse-square
+    falloff, so that a Lambertian pixel sees I = albedo * max(0, n · s).
+
+    Parameters
+    ----------
+    positions : ndarray, shape (m, 3) or (3,)
+        Light positions
+    X, Y : ndarray
+        Surface point coordinates (any mutually broadcastable shape)
+    Z : float or ndarray
+        Surface heights (a reference plane or a height map)
+    intensity : float or ndarray, shape (m,)
+        Radiant intensity Φ of each light
+
+    Returns
+    -------
+    S : ndarray, shape (m, ...) + (3,)
+        Light vectors for every light and surface point
+    """
+    P = np.atleast_2d(positions)
+    points = np.stack(np.broadcast_arrays(X, Y, Z), axis=-1)  # (..., 3)
+
+    # Broadcast (m, 1, ..., 1, 3) against (..., 3)
+    P = P.reshape((P.shape[0],) + (1,) * (points.ndim - 1) + (3,))
+    D = P - points
+    r2 = np.sum(D * D, axis=-1, keepdims=True)
+
+    phi = np.asarray(intensity, dtype=np.float64).reshape((-1,) + (1,) * points.ndim)
+
+    return phi * D / (r2 * np.sqrt(r2))
@@ -0,0 +1,120 @@
+# photometric/parallel_stereo.py
+"""
+Process-parallel tiled photometric stereo.
+
+The image stack and all outputs live in shared memory; worker processes
+attach once at start-up and then only receive (r0, r1) row bounds, so no
+large array is ever pickled.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from parallel import SharedArray
+from profiling import traced
+from .tiling import iter_row_tiles, stereo_divergence_tile
+
+
+# Per-worker state, populated by _init_worker
+_worker = {}
+
+
+def _init_worker(specs: dict, lights: np.ndarray, dx: float, dy: float) -> None:
+    """Attach to the shared stack and output arrays once per worker."""
+    _worker['shared'] = {key: SharedArray.attach(spec) for key, spec in specs.items()}
+    _worker['lights'] = lights
+    _worker['dx'] = dx
+    _worker['dy'] = dy
+
+
+def _run_tile(bounds: tuple) -> None:
+    """Compute normals, p/q and divergence for one row tile in place."""
+    r0, r1 = bounds
+    arrays = {key: sa.array for key, sa in _worker['shared'].items()}
+
+    N, p, q, f = stereo_divergence_tile(
+        arrays['images'], _worker['lights'], r0, r1, _worker['dx'], _worker['dy'])
+
+    arrays['N'][r0:r1] = N
+    arrays['p'][r0:r1] = p
+    arrays['q'][r0:r1] = q
+    arrays['f'][r0:r1] = f
+
+
+@traced
+def photometric_stereo_parallel(
+    images: np.ndarray,
+    lights: np.ndarray,
+    dx: float = 1.0,
+    dy: float = 1.0,
+    workers: Optional[int] = None,
+    tile_rows: Optional[int] = None
+) -> tuple:
+    """
+    Photometric stereo, gradients and divergence on disjoint tiles in parallel.
+
+    Equivalent to photometric_stereo → gradients_from_normals →
+    compute_divergence on the full image.
+
+    Parameters
+    ----------
+    images : ndarray or SharedArray, shape (m, Ny, Nx)
+        Intensity images; pass a SharedArray to skip the copy into shared memory
+    lights : ndarray, shape (m, 3)
+        Light direction matrix S
+    dx, dy : float
+        Grid spacing
+    workers : int, optional
+        Worker processes (default: os.cpu_count())
+    tile_rows : int, optional
+        Rows per tile (default: about four tiles per worker)
+
+    Returns
+    -------
+    N_est : ndarray, shape (Ny, Nx, 3)
+        Estimated unit surface normals
+    p, q : ndarray
+        Gradient fields
+    f : ndarray
+        Divergence field
+    """
+    workers = workers or os.cpu_count() or 1
+
+    owns_images = not isinstance(images, SharedArray)
+    shared_images = SharedArray.from_array(images) if owns_images else images
+
+    _, Ny, Nx = shared_images.array.shape
+    if tile_rows is None:
+        tile_rows = max(1, -(-Ny // (4 * workers)))
+
+    outputs = {
+        'N': SharedArray.create((Ny, Nx, 3)),
+        'p': SharedArray.create((Ny, Nx)),
+        'q': SharedArray.create((Ny, Nx)),
+        'f': SharedArray.create((Ny, Nx)),
+    }
+
+    try:
+        specs = {key: sa.spec for key, sa in outputs.items()}
+        specs['images'] = shared_images.spec
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(specs, np.asarray(lights, dtype=np.float64), dx, dy),
+        ) as pool:
+            # list() re-raises the first worker error
+            list(pool.map(_run_tile, iter_row_tiles(Ny, tile_rows)))
+
+        # Copy results out before the shared blocks are unlinked
+        N_est, p, q, f = (outputs[key].array.copy() for key in ('N', 'p', 'q', 'f'))
+    finally:
+        for sa in outputs.values():
+            sa.close()
+        if owns_images:
+            shared_images.close()
+
+    return N_est, p, q, f
@@ -3,17 +3,28 @@
 
 import numpy as np
 
+from profiling import traced
+from .shadows import cast_shadow_mask
+from .lighting import point_light_vectors
 
+
+@traced
 def render_photometric_images(
     N: np.ndarray,
     lights: np.ndarray,
     albedo: float = 1.0,
-    noise_std: float = 0.0
+    noise_std: float = 0.0,
+    Z: np.ndarray = None,
+    dx: float = 1.0,
+    dy: float = 1.0
 ) -> np.ndarray:
     """
     Render Lambertian images given surface normals and light directions.
     
-    I = albedo * max(0, N · L) + noise
+    I = albedo * max(0, N · L) * V + noise
+    
+    where V is the cast-shadow visibility mask (1 everywhere unless a height
+    map is supplied).
     
     Parameters
     ----------
@@ -25,6 +36,11 @@ def render_photometric_images(
         Surface albedo (reflectance)
     noise_std : float
         Standard deviation of Gaussian noise to add
+    Z : ndarray, shape (Ny, Nx), optional
+        Height map; if given, cast shadows are rendered in addition
+        to attached shadows
+    dx, dy : float
+        Grid spacing of Z (used only for cast shadows)
         
     Returns
     -------
@@ -39,9 +55,12 @@ def render_photometric_images(
     for k in range(m):
         L = lights[k]
         # Dot product N · L at each pixel
-        I = albedo * np.sum(N * L, axis=2)
+        I = albedo * (N @ L)
         # Clamp negative (self-shadowing)
         I = np.maximum(0, I)
+        # Zero out pixels occluded by other parts of the surface
+        if Z is not None:
+            I[~cast_shadow_mask(Z, L, dx, dy)] = 0
         images[k] = I
     
     # Add noise if requested
@@ -51,3 +70,60 @@ def render_photometric_images(
         images = np.clip(images, 0, None)  # Keep non-negative
     
     return images
+
+
+@traced
+def render_near_field_images(
+    N: np.ndarray,
+    X: np.ndarray,
+    Y: np.ndarray,
+    Z: np.ndarray,
+    positions: np.ndarray,
+    intensity=1.0,
+    albedo: float = 1.0,
+    noise_std: float = 0.0
+) -> np.ndarray:
+    """
+    Render Lambertian images lit by near-field point lights.
+
+    I = albedo * max(0, N · s(x)),  s(x) = Φ (P - x) / |P - x|³
+
+    so both the light direction and the inverse-square falloff vary per pixel.
+
+    Parameters
+    ----------
+    N : ndarray, shape (Ny, Nx, 3)
+        Unit surface normals
+    X, Y, Z : ndarray, shape (Ny, Nx)
+        Surface point coordinates and heights
+    positions : ndarray, shape (m, 3)
+        Light positions
+    intensity : float or ndarray, shape (m,)
+        Radiant intensity of each light
+    albedo : float
+        Surface albedo (reflectance)
+    noise_std : float
+        Standard deviation of Gaussian noise to add
+
+    Returns
+    -------
+    images : ndarray, shape (m, Ny, Nx)
+        Rendered intensity images
+    """
+    m = positions.shape[0]
+    Ny, Nx = N.shape[:2]
+    phi = np.broadcast_to(np.asarray(intensity, dtype=np.float64), (m,))
+
+    images = np.zeros((m, Ny, Nx))
+
+    for k in range(m):
+        S = point_light_vectors(positions[k], X, Y, Z, phi[k])[0]
+        images[k] = np.maximum(0, albedo * np.sum(N * S, axis=2))
+
+    # Add noise if requested
+    if noise_std > 0:
+        noise = np.random.normal(0, noise_std, images.shape)
+        images = images + noise
+        images = np.clip(images, 0, None)  # Keep non-negative
+
+    return images
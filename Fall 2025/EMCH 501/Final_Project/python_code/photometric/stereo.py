@@ -3,7 +3,11 @@
 
 import numpy as np
 
+from profiling import traced
+from .lighting import point_light_vectors
 
+
+@traced
 def photometric_stereo(
     images: np.ndarray,
     lights: np.ndarray
@@ -14,38 +18,115 @@ def photometric_stereo(
     Solves S @ g = I for each pixel, where g = albedo * n.
     Returns estimated unit normals.
     
+    Leading batch axes (e.g. K noise realizations) are solved in the
+    same matrix product.
+    
     Parameters
     ----------
-    images : ndarray, shape (m, Ny, Nx)
+    images : ndarray, shape (..., m, Ny, Nx)
         Intensity images from m light sources
     lights : ndarray, shape (m, 3)
         Light direction matrix S
         
     Returns
     -------
-    N_est : ndarray, shape (Ny, Nx, 3)
+    N_est : ndarray, shape (..., Ny, Nx, 3)
         Estimated unit surface normals
     """
-    m, Ny, Nx = images.shape
+    *batch, m, Ny, Nx = images.shape
     
-    # Stack images as (m, N_pixels)
-    I = images.reshape(m, -1)  # (m, Ny*Nx)
+    # Stack images as (..., m, N_pixels)
+    I = images.reshape(*batch, m, Ny * Nx)
     
     # Solve least squares: S @ g = I → g = S^+ @ I
     S_pinv = np.linalg.pinv(lights)  # (3, m)
-    G = S_pinv @ I  # (3, Ny*Nx)
+    G = S_pinv @ I  # (..., 3, Ny*Nx)
     
     # Normalize to get unit normals
-    norms = np.linalg.norm(G, axis=0, keepdims=True)
+    norms = np.linalg.norm(G, axis=-2, keepdims=True)
     norms = np.maximum(norms, 1e-10)  # Avoid division by zero
-    N_flat = G / norms  # (3, Ny*Nx)
+    N_flat = G / norms  # (..., 3, Ny*Nx)
     
-    # Reshape to (Ny, Nx, 3)
-    N_est = N_flat.T.reshape(Ny, Nx, 3)
+    # Reshape to (..., Ny, Nx, 3)
+    N_est = np.swapaxes(N_flat, -1, -2).reshape(*batch, Ny, Nx, 3)
     
     return N_est
 
 
+@traced
+def photometric_stereo_near_field(
+    images: np.ndarray,
+    positions: np.ndarray,
+    X: np.ndarray,
+    Y: np.ndarray,
+    Z,
+    intensity=1.0,
+    chunk_size: int = 65536
+) -> np.ndarray:
+    """
+    Per-pixel least-squares photometric stereo with near-field point lights.
+
+    Each pixel has its own light matrix S_p (rows s_k(x_p), see
+    point_light_vectors), so a single pinv no longer applies. Pixels are
+    processed in chunks; within a chunk the normal equations
+    (S_pᵀ S_p) g_p = S_pᵀ I_p are formed and solved as one batched
+    (chunk, 3, 3) np.linalg.solve. A chunk containing a singular system
+    (coplanar or too few lights at some pixel) is solved with the batched
+    pseudo-inverse instead.
+
+    Parameters
+    ----------
+    images : ndarray, shape (m, Ny, Nx)
+        Intensity images from m point lights
+    positions : ndarray, shape (m, 3)
+        Light positions
+    X, Y : ndarray, shape (Ny, Nx)
+        Surface point coordinates
+    Z : float or ndarray, shape (Ny, Nx)
+        Surface heights used to evaluate the light vectors (a reference
+        plane or a previous height estimate)
+    intensity : float or ndarray, shape (m,)
+        Radiant intensity of each light
+    chunk_size : int
+        Pixels per batched solve
+
+    Returns
+    -------
+    N_est : ndarray, shape (Ny, Nx, 3)
+        Estimated unit surface normals
+    """
+    m, Ny, Nx = images.shape
+
+    I = images.reshape(m, -1)  # (m, Ny*Nx)
+    xs, ys, zs = (np.broadcast_to(a, (Ny, Nx)).reshape(-1) for a in (X, Y, Z))
+
+    G = np.empty((Ny * Nx, 3))
+
+    for c0 in range(0, Ny * Nx, chunk_size):
+        c1 = min(c0 + chunk_size, Ny * Nx)
+
+        S = point_light_vectors(positions, xs[c0:c1], ys[c0:c1], zs[c0:c1], intensity)  # (m, c, 3)
+        S = np.moveaxis(S, 0, 1)  # (c, m, 3)
+
+        A = np.einsum('cmi,cmj->cij', S, S)  # (c, 3, 3)
+        b = np.einsum('cmi,mc->ci', S, I[:, c0:c1])  # (c, 3)
+
+        try:
+            G[c0:c1] = np.linalg.solve(A, b[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            # Some pixel sees fewer than 3 independent lights: fall back to the
+            # minimum-norm least-squares solution for this chunk, as the
+            # far-field pinv does
+            G[c0:c1] = (np.linalg.pinv(A, hermitian=True) @ b[..., None])[..., 0]
+
+    # Normalize to get unit normals
+    norms = np.linalg.norm(G, axis=1, keepdims=True)
+    norms = np.maximum(norms, 1e-10)  # Avoid division by zero
+
+    return (G / norms).reshape(Ny, Nx, 3)
+
+
+@traced
 def gradients_from_normals(N_est: np.ndarray) -> tuple:
     """
     Convert unit normals to gradient fields (p, q).
@@ -55,17 +136,17 @@ def gradients_from_normals(N_est: np.ndarray) -> tuple:
     
     Parameters
     ----------
-    N_est : ndarray, shape (Ny, Nx, 3)
+    N_est : ndarray, shape (..., Ny, Nx, 3)
         Unit surface normals
         
     Returns
     -------
-    p, q : ndarray
+    p, q : ndarray, shape (..., Ny, Nx)
         Gradient fields
     """
-    nx = N_est[:, :, 0]
-    ny = N_est[:, :, 1]
-    nz = N_est[:, :, 2]
+    nx = N_est[..., 0]
+    ny = N_est[..., 1]
+    nz = N_est[..., 2]
     
     # Avoid division by zero where surface is too steep
     nz_safe = np.where(np.abs(nz) > 1e-6, nz, 1e-6)
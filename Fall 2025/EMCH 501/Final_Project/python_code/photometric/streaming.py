@@ -0,0 +1,134 @@
+# photometric/streaming.py
+"""Incremental (recursive least-squares) photometric stereo for live frame feeds."""
+
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from solvers import solve_poisson_fft
+from .stereo import gradients_from_normals
+from .gradient import compute_divergence
+
+
+class StreamingPhotometricStereo:
+    """
+    Per-pixel least-squares photometric stereo updated one frame at a time.
+
+    Keeps the normal-equation accumulators of S @ g = I:
+
+        SᵀS = Σ_k l_k l_kᵀ        (3, 3), shared by every pixel
+        SᵀI = Σ_k l_k I_k          (3, Ny*Nx), per pixel
+
+    so adding a frame costs O(pixels) and the estimate after m frames equals
+    photometric_stereo(images[:m], lights[:m]).
+
+    Parameters
+    ----------
+    Ny, Nx : int
+        Image size
+    """
+
+    def __init__(self, Ny: int, Nx: int):
+        self.Ny = Ny
+        self.Nx = Nx
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all accumulated frames and latency history."""
+        self.StS = np.zeros((3, 3))
+        self.StI = np.zeros((3, self.Ny * self.Nx))
+        self.frame_count = 0
+        self.frame_latencies_ms = []
+
+    def add_frame(self, image: np.ndarray, light: np.ndarray, emit: bool = True) -> Optional[np.ndarray]:
+        """
+        Accumulate one image and its light direction.
+
+        Parameters
+        ----------
+        image : ndarray, shape (Ny, Nx)
+            Intensity image
+        light : ndarray, shape (3,)
+            Light direction for this frame
+        emit : bool
+            If True, return the updated normals (included in the latency)
+
+        Returns
+        -------
+        N_est : ndarray, shape (Ny, Nx, 3) or None
+            Current normal estimate if emit is True
+        """
+        t0 = time.perf_counter()
+
+        l = np.asarray(light, dtype=np.float64)
+        I = np.asarray(image, dtype=np.float64).reshape(-1)
+        if I.size != self.StI.shape[1]:
+            raise ValueError(f"Image has {I.size} pixels, expected {self.Ny}x{self.Nx}")
+
+        self.StS += np.outer(l, l)
+        for k in range(3):
+            self.StI[k] += l[k] * I
+        self.frame_count += 1
+
+        N_est = self.normals() if emit else None
+
+        self.frame_latencies_ms.append((time.perf_counter() - t0) * 1000)
+        return N_est
+
+    def normals(self) -> np.ndarray:
+        """
+        Current unit normal estimate.
+
+        Uses pinv(SᵀS), so fewer than three (or coplanar) lights give the
+        minimum-norm solution, matching pinv(S) @ I.
+
+        Returns
+        -------
+        N_est : ndarray, shape (Ny, Nx, 3)
+            Estimated unit surface normals
+        """
+        G = np.linalg.pinv(self.StS) @ self.StI  # (3, Ny*Nx)
+
+        norms = np.linalg.norm(G, axis=0, keepdims=True)
+        norms = np.maximum(norms, 1e-10)  # Avoid division by zero
+        N_flat = G / norms
+
+        return N_flat.T.reshape(self.Ny, self.Nx, 3)
+
+    def gradients(self) -> tuple:
+        """Current gradient fields (p, q)."""
+        return gradients_from_normals(self.normals())
+
+    def height(self, dx: float, dy: float, solver: Callable = solve_poisson_fft) -> np.ndarray:
+        """
+        Integrate the current gradients into a height map.
+
+        Parameters
+        ----------
+        dx, dy : float
+            Grid spacing
+        solver : callable
+            Poisson solver (default: FFT)
+
+        Returns
+        -------
+        Z : ndarray, shape (Ny, Nx)
+            Height map
+        """
+        p, q = self.gradients()
+        f = compute_divergence(p, q, dx, dy)
+        return solver(f, dx, dy)
+
+    def latency_summary(self) -> Dict[str, float]:
+        """Per-frame latency statistics in milliseconds."""
+        if not self.frame_latencies_ms:
+            return {"frames": 0}
+        t = np.asarray(self.frame_latencies_ms)
+        return {
+            "frames": int(t.size),
+            "mean_ms": float(np.mean(t)),
+            "median_ms": float(np.median(t)),
+            "p95_ms": float(np.percentile(t, 95)),
+            "max_ms": float(np.max(t)),
+        }
@@ -0,0 +1,46 @@
+# profiling/__init__.py
+"""
+Instrumentation for locating where a pipeline run spends its time.
+"""
+
+from .trace import (
+    span,
+    traced,
+    enable_tracing,
+    disable_tracing,
+    is_tracing,
+    reset_trace,
+    drain_events,
+    merge_events,
+    export_chrome_trace,
+    trace_summary,
+    print_trace_summary,
+)
+from .memory import (
+    MemoryRecord,
+    measure_memory,
+    enable_memory_profiling,
+    disable_memory_profiling,
+    is_profiling_memory,
+    check_memory_budget,
+)
+
+__all__ = [
+    'span',
+    'traced',
+    'enable_tracing',
+    'disable_tracing',
+    'is_tracing',
+    'reset_trace',
+    'drain_events',
+    'merge_events',
+    'export_chrome_trace',
+    'trace_summary',
+    'print_trace_summary',
+    'MemoryRecord',
+    'measure_memory',
+    'enable_memory_profiling',
+    'disable_memory_profiling',
+    'is_profiling_memory',
+    'check_memory_budget',
+]
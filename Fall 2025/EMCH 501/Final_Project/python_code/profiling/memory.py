@@ -0,0 +1,206 @@
+# profiling/memory.py
+"""
+Per-stage peak and net memory accounting.
+
+Two sources are combined: tracemalloc (exact Python/NumPy allocations,
+including the temporaries a stage frees before returning) and resident set
+size sampled from /proc/self/statm by a background thread (everything
+else, e.g. FFT work buffers allocated outside NumPy). Both report a peak
+that can be reset, and measurements nest: before a child stage resets the
+peak counters, the parent folds the peak seen so far into its own, so the
+parent's peak still covers its children.
+
+Memory profiling is off by default and slows allocation-heavy code; turn it
+on with enable_memory_profiling(). Measurements are process-wide, so only
+nest them on one thread at a time.
+"""
+
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+_enabled = False
+_stack: List["MemoryRecord"] = []
+_sampler: Optional["_RssSampler"] = None
+
+
+class _RssSampler(threading.Thread):
+    """Background thread tracking current and peak resident set size."""
+
+    def __init__(self, interval: float = 0.002):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._stop_event = threading.Event()
+        self._peak = self.current()
+
+    @staticmethod
+    def available() -> bool:
+        return os.path.exists("/proc/self/statm")
+
+    def current(self) -> int:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * self._page_size
+
+    def peak(self) -> int:
+        return max(self._peak, self.current())
+
+    def reset_peak(self) -> None:
+        self._peak = self.current()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._peak = max(self._peak, self.current())
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+class MemoryRecord:
+    """
+    Memory used by one measured region, in bytes.
+
+    Attributes
+    ----------
+    peak_bytes : int
+        Highest traced allocation above the level at entry
+    net_bytes : int
+        Traced allocation still held at exit (e.g. the returned arrays)
+    rss_peak_bytes, rss_net_bytes : int or None
+        The same for resident set size (None without /proc)
+    """
+
+    __slots__ = ("start", "max", "rss_start", "rss_max",
+                 "peak_bytes", "net_bytes", "rss_peak_bytes", "rss_net_bytes")
+
+    def __init__(self):
+        self.peak_bytes = self.net_bytes = None
+        self.rss_peak_bytes = self.rss_net_bytes = None
+
+    def as_dict(self) -> Dict[str, float]:
+        """Sizes in MB (empty if memory profiling was off)."""
+        if self.peak_bytes is None:
+            return {}
+        out = {"peak_mb": self.peak_bytes / 2**20, "net_mb": self.net_bytes / 2**20}
+        if self.rss_peak_bytes is not None:
+            out["rss_peak_mb"] = self.rss_peak_bytes / 2**20
+            out["rss_net_mb"] = self.rss_net_bytes / 2**20
+        return out
+
+
+def enable_memory_profiling(rss_interval: float = 0.002) -> None:
+    """Start tracemalloc and the RSS sampler."""
+    global _enabled, _sampler
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if _sampler is None and _RssSampler.available():
+        _sampler = _RssSampler(rss_interval)
+        _sampler.start()
+    _enabled = True
+
+
+def disable_memory_profiling() -> None:
+    """Stop tracemalloc and the RSS sampler."""
+    global _enabled, _sampler
+    _enabled = False
+    if _sampler is not None:
+        _sampler.stop()
+        _sampler = None
+    tracemalloc.stop()
+
+
+def is_profiling_memory() -> bool:
+    """Whether memory is currently measured."""
+    return _enabled
+
+
+def begin_record(record: MemoryRecord) -> None:
+    """Start measuring into record (use measure_memory unless hooking spans)."""
+    if _stack:
+        parent = _stack[-1]
+        parent.max = max(parent.max, tracemalloc.get_traced_memory()[1])
+        if _sampler is not None:
+            parent.rss_max = max(parent.rss_max, _sampler.peak())
+
+    tracemalloc.reset_peak()
+    record.start = record.max = tracemalloc.get_traced_memory()[0]
+    if _sampler is not None:
+        _sampler.reset_peak()
+        record.rss_start = record.rss_max = _sampler.current()
+    _stack.append(record)
+
+
+def end_record(record: MemoryRecord) -> None:
+    """Finish a record started with begin_record."""
+    current, peak = tracemalloc.get_traced_memory()
+    record.max = max(record.max, peak)
+    record.peak_bytes = record.max - record.start
+    record.net_bytes = current - record.start
+
+    if _sampler is not None:
+        rss = _sampler.current()
+        record.rss_max = max(record.rss_max, _sampler.peak())
+        record.rss_peak_bytes = record.rss_max - record.rss_start
+        record.rss_net_bytes = rss - record.rss_start
+
+    _stack.pop()
+    if _stack:
+        parent = _stack[-1]
+        parent.max = max(parent.max, record.max)
+        if _sampler is not None:
+            parent.rss_max = max(parent.rss_max, record.rss_max)
+
+
+@contextmanager
+def measure_memory():
+    """
+    Measure the peak and net memory of a block.
+
+    Yields a MemoryRecord that is filled in when the block exits; it stays
+    empty while memory profiling is off.
+
+    Examples
+    --------
+    >>> with measure_memory() as mem:
+    ...     Z = solve_poisson_fft(f, dx, dy)
+    >>> mem.as_dict()
+    {'peak_mb': ..., 'net_mb': ..., 'rss_peak_mb': ..., 'rss_net_mb': ...}
+    """
+    record = MemoryRecord()
+    if not _enabled:
+        yield record
+        return
+
+    begin_record(record)
+    try:
+        yield record
+    finally:
+        end_record(record)
+
+
+def check_memory_budget(measured: Dict[str, Dict[str, float]], budgets_mb: Dict[str, float]) -> List[str]:
+    """
+    Compare per-stage peaks against budgets.
+
+    Parameters
+    ----------
+    measured : dict
+        {stage: {'peak_mb': ..., ...}}, e.g. a results 'memory' entry or
+        trace_summary()
+    budgets_mb : dict
+        {stage: maximum peak_mb}
+
+    Returns
+    -------
+    violations : list of str
+        One message per stage over budget (empty if all fit)
+    """
+    violations = []
+    for stage, budget in budgets_mb.items():
+        peak = measured.get(stage, {}).get("peak_mb")
+        if peak is not None and peak > budget:
+            violations.append(f"{stage}: peak {peak:.1f} MB exceeds budget {budget:.1f} MB")
+    return violations
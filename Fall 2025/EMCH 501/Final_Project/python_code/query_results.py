@@ -0,0 +1,80 @@
+# query_results.py
+"""
+Inspect the append-only results store written by runner.py.
+
+Usage:
+    python query_results.py runs
+    python query_results.py query --solver fft --param noise_std=0.01 --max-rmse 0.05
+    python query_results.py export --run latest results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from experiments.results_store import ResultsStore
+from config import RESULTS_DB
+
+
+def _parse_value(text: str) -> Any:
+    """Command-line parameter value: JSON if it parses (numbers, true/false), else the string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--db', default=RESULTS_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("runs", help="list runs")
+
+    query = commands.add_parser("query", help="print matching results")
+    query.add_argument('--run', help="run id or 'latest'")
+    query.add_argument('--experiment')
+    query.add_argument('--shape')
+    query.add_argument('--solver')
+    query.add_argument('--failed', action='store_true', help="only failed results")
+    query.add_argument('--max-rmse', type=float)
+    query.add_argument('--param', nargs='*', default=[], metavar="NAME=VALUE")
+
+    export = commands.add_parser("export", help="write one run in the nested JSON layout")
+    export.add_argument('output')
+    export.add_argument('--run', default="latest")
+    export.add_argument('--experiment', default="solver_compare")
+
+    args = parser.parse_args()
+    store = ResultsStore(args.db)
+
+    if args.command == "runs":
+        for run in store.runs():
+            started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(run["started"]))
+            print(f"{run['run_id']}  {started}  {run['results']:>6} results  {run['label'] or ''}")
+
+    elif args.command == "query":
+        params = {name: _parse_value(value) for name, _, value in (p.partition("=") for p in args.param)}
+        rows = store.query(run_id=args.run, experiment=args.experiment, shape=args.shape,
+                           solver=args.solver, success=False if args.failed else None,
+                           max_rmse=args.max_rmse, **params)
+        for row in rows:
+            m = row["metrics"]
+            rmse = f"{m['rmse']:.6f}" if m.get("rmse") is not None else "nan"
+            print(f"{row['run_id']}  {row['shape']:<12} {row['solver']:<14} rmse {rmse:>10}  "
+                  f"{m.get('time_ms') or 0:8.2f} ms  {json.dumps(row['params'], sort_keys=True)}")
+        print(f"{len(rows)} results")
+
+    elif args.command == "export":
+        store.export_json(args.output, args.run, args.experiment)
+        print(f"Exported {store.resolve_run(args.run)} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# render_figures.py
+"""
+Regenerate figures from the raw arrays saved by an experiment run.
+
+runner.py saves Z_true, Z_est, N_true and N_est of every shape/solver run
+to the raw store (experiments/raw_store.py); this script redraws their
+figures without solving anything, so a new title or colormap only costs
+the rendering. Runs are rendered in parallel, one process per run. As in
+runner.py, --output-dir holds both the raw store (<output-dir>/raw unless
+--raw-dir says otherwise) and the figures. With --changed-only, runs whose
+input hash and figure mode match their last render into the same output
+directory (recorded in rendered.json in the store) are skipped.
+
+Usage:
+    python render_figures.py --output-dir output --shapes gaussian sphere --figures fast --changed-only
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from experiments.exp_solver_compare import generate_figures, FIGURE_MODES
+from experiments.raw_store import RawStore
+from config import OUTPUT_DIR, FIGURE_MODE
+
+
+def load_render_state(store: RawStore) -> dict:
+    """{output dir: {run key: {sha256, mode, rendered}}} of the last successful renders."""
+    try:
+        with open(os.path.join(store.root, "rendered.json")) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_render_state(store: RawStore, state: dict) -> None:
+    path = os.path.join(store.root, "rendered.json")
+    with open(f"{path}.tmp", "w") as fh:
+        json.dump(state, fh, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def render_run(root: str, key: str, mode: str, output_dir: str = OUTPUT_DIR) -> float:
+    """Draw the figures of one stored run; returns the milliseconds spent."""
+    t0 = time.perf_counter()
+    run = RawStore(root).load(key)
+    generate_figures(run["shape"], run["solver"], run["Z_true"], run["Z_est"],
+                     run.get("N_true"), run.get("N_est"), mode, (run["dx"], run["dy"]), output_dir)
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output-dir', default=OUTPUT_DIR,
+                        help="runner.py's --output-dir; figures go to OUTPUT_DIR/figures")
+    parser.add_argument('--raw-dir', help="raw store written by runner.py (default: OUTPUT_DIR/raw)")
+    parser.add_argument('--shapes', nargs='+', help="only these shapes (default: all stored)")
+    parser.add_argument('--solvers', nargs='+', help="only these solvers (default: all stored)")
+    parser.add_argument('--figures', choices=[m for m in FIGURE_MODES if m != "none"], default=FIGURE_MODE,
+                        help="figure mode (see generate_figures)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--changed-only', action='store_true',
+                        help="skip runs whose inputs and figure mode are unchanged since the last render")
+    parser.add_argument('--list', action='store_true', help="list the selected runs and exit")
+    args = parser.parse_args()
+
+    store = RawStore(args.raw_dir or os.path.join(args.output_dir, "raw"))
+    runs = store.select(args.shapes, args.solvers)
+    if not runs:
+        print(f"No stored runs match in {store.root} (run runner.py first)")
+        sys.exit(1)
+
+    # Figures rendered into another output directory do not count
+    state = load_render_state(store)
+    rendered = state.setdefault(os.path.abspath(args.output_dir), {})
+    if args.changed_only:
+        pending = {key: entry for key, entry in runs.items()
+                   if rendered.get(key, {}).get("sha256") != entry["sha256"]
+                   or rendered.get(key, {}).get("mode") != args.figures}
+    else:
+        pending = runs
+
+    if args.list:
+        for key, entry in runs.items():
+            mark = "*" if key in pending else " "
+            print(f"{mark} {key:<28} {entry['grid'][0]}x{entry['grid'][1]}  {entry['sha256'][:12]}")
+        return
+
+    print(f"Rendering {len(pending)} of {len(runs)} runs ({args.figures}) on {args.workers} workers...")
+    t0 = time.perf_counter()
+    failures = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(render_run, store.root, key, args.figures, args.output_dir): key for key in pending}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                ms = future.result()
+            except Exception as e:
+                failures[key] = repr(e)
+                print(f"  FAILED {key}: {e!r}")
+                continue
+            rendered[key] = {"sha256": pending[key]["sha256"], "mode": args.figures, "rendered": time.time()}
+            print(f"  {key}: {ms:.0f} ms")
+
+    save_render_state(store, state)
+    print(f"Rendered {len(pending) - len(failures)} runs in {time.perf_counter() - t0:.1f} s, "
+          f"{len(failures)} failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,22 @@
 """
 Main experiment orchestrator.
 Runs all experiments defined in project_restructured.tex Chapter 5.
+
+With no arguments, runs the full solver comparison (all eight shapes, all
+three solvers, all figures). Options narrow the run, e.g. one solver on
+one small shape without figures:
+
+    python runner.py --shapes gaussian --solvers dct_neumann --resolution 64 --figures none
+
+or add the ablation studies (Section 5.7):
+
+    python runner.py --experiments solvers ablation --workers 4
+
+The pareto experiment measures RMSE against solve time for every solver
+candidate and saves the solver profile that --solvers auto picks from.
 """
 
+import argparse
 import json
 import os
 import sys
@@ -11,30 +25,40 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from experiments.exp_solver_compare import run_all_shapes_all_solvers, print_results_table
-from config import OUTPUT_DIR
+from experiments.exp_solver_compare import (
+    run_all_shapes_all_solvers,
+    print_results_table,
+    resolve_shapes,
+    SHAPES,
+    EXTRA_SHAPES,
+    SOLVERS,
+    EXTRA_SOLVERS,
+    FIGURE_MODES,
+)
+from experiments.exp_ablation import run_all_ablation_studies, ABLATION_STUDIES
+from experiments.exp_pareto import run_pareto_exploration, save_pareto_plot
+from experiments.cache import configure_cache
+from experiments.raw_store import configure_raw_store
+from experiments.results_store import configure_results_store, make_serializable
+from experiments.figure_queue import FigureQueue
+from profiling import enable_tracing, export_chrome_trace, print_trace_summary, enable_memory_profiling
+from config import OUTPUT_DIR, FIGURE_MODE, MONTE_CARLO_TRIALS, PARETO_RESOLUTIONS
 
 
-def ensure_output_dir():
+# Experiments selectable with --experiments; "ablation" means every ablation study
+EXPERIMENTS = ("solvers",) + ABLATION_STUDIES + ("pareto", "ablation", "all")
+
+
+def ensure_output_dir(output_dir: str = OUTPUT_DIR):
     """Create output directory if it doesn't exist."""
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
 
 
-def save_results(results: dict, filename: str = "solver_comparison_results.json"):
+def save_results(results: dict, filename: str = "solver_comparison_results.json", output_dir: str = OUTPUT_DIR):
     """Save results to JSON file."""
-    ensure_output_dir()
-    filepath = os.path.join(OUTPUT_DIR, filename)
-    
-    # Convert any non-JSON-serializable values
-    def make_serializable(obj):
-        if isinstance(obj, dict):
-            return {k: make_serializable(v) for k, v in obj.items()}
-        elif isinstance(obj, float):
-            if obj != obj:  # NaN check
-                return None
-            return obj
-        return obj
+    ensure_output_dir(output_dir)
+    filepath = os.path.join(output_dir, filename)
     
     with open(filepath, 'w') as f:
         json.dump(make_serializable(results), f, indent=2)
@@ -42,23 +66,180 @@ def save_results(results: dict, filename: str = "solver_comparison_results.json"
     print(f"\nResults saved to: {filepath}")
 
 
-def main():
-    """Run the complete experiment suite."""
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Photometric stereo experiment suite")
+    
+    selection = parser.add_argument_group("selection")
+    selection.add_argument('--experiments', nargs='+', choices=EXPERIMENTS, default=["solvers"],
+                           help="solvers (Section 5.8 comparison), individual ablation studies, "
+                                "ablation (all of them), pareto (accuracy vs time of every solver "
+                                "candidate) or all (default: solvers)")
+    selection.add_argument('--shapes', nargs='+', choices=sorted({**SHAPES, **EXTRA_SHAPES}),
+                           help="shapes for the solver comparison (default: the eight of Section 5.1); "
+                                "the first one is also the ablation surface (default: gaussian)")
+    selection.add_argument('--solvers', nargs='+', choices=list(SOLVERS) + list(EXTRA_SOLVERS),
+                           help="solvers for the solver comparison (default: all three); auto "
+                                "picks, per shape and grid size, the fastest solver of the "
+                                "solver profile in OUTPUT_DIR (written by pareto) that meets "
+                                "--rmse-target")
+    
+    protocol = parser.add_argument_group("protocol")
+    protocol.add_argument('--resolution', type=int,
+                          help="N x N grid (default: the generators' 128; pareto: "
+                               f"{', '.join(map(str, PARETO_RESOLUTIONS))})")
+    protocol.add_argument('--lights', type=int, default=16, help="number of lights (default: 16)")
+    protocol.add_argument('--elevation', type=float, default=45.0,
+                          help="light elevation in degrees (every experiment)")
+    protocol.add_argument('--noise', type=float, default=0.0,
+                          help="image noise std for the solver comparison, pareto and the light sweep "
+                               "(default: 0); the noise and Tikhonov studies use their own levels")
+    protocol.add_argument('--rmse-target', type=float,
+                          help="largest acceptable RMSE for --solvers auto (default: the most "
+                               "accurate solver)")
+    protocol.add_argument('--trials', type=int, default=MONTE_CARLO_TRIALS,
+                          help="Monte Carlo trials per noise level")
+    
+    execution = parser.add_argument_group("execution and output")
+    execution.add_argument('--workers', type=int, default=1,
+                           help="processes for the shape x solver matrix (0: one per core); with 1, "
+                                "figures render on a background queue instead")
+    execution.add_argument('--figures', choices=FIGURE_MODES, default=FIGURE_MODE,
+                           help="figure export: full (matplotlib), reuse (matplotlib with persistent "
+                                "figure templates), fast (raster writer for image figures), raster "
+                                "(image figures only) or none")
+    execution.add_argument('--output-dir', default=OUTPUT_DIR,
+                           help="where results, figures, raw arrays, the artifact cache and the results store go "
+                                f"(default: {OUTPUT_DIR})")
+    execution.add_argument('--no-cache', action='store_true',
+                           help="recompute every pipeline stage instead of using the artifact cache")
+    execution.add_argument('--no-raw', action='store_true',
+                           help="do not save the per-run arrays used by render_figures.py")
+    execution.add_argument('--no-db', action='store_true',
+                           help="do not append results to the SQLite results store")
+    execution.add_argument('--trace', action='store_true',
+                           help="record stage timings; writes trace.json and prints a summary")
+    execution.add_argument('--memory', action='store_true',
+                           help="record per-stage peak/net memory (tracemalloc + RSS) in the results "
+                                "and trace; slows the run")
+    
+    args = parser.parse_args(argv)
+    
+    experiments = set(args.experiments)
+    if "all" in experiments:
+        experiments |= {"solvers", "ablation", "pareto"}
+    if "ablation" in experiments:
+        experiments |= set(ABLATION_STUDIES)
+    args.experiments = [name for name in EXPERIMENTS if name in experiments
+                        and name not in ("ablation", "all")]
+    return args
+
+
+def run_solver_comparison(args: argparse.Namespace) -> dict:
+    """Section 5.8: the selected shapes × solvers, figures in the selected mode."""
+    print("\nSection 5.8: Solver Comparison Experiments")
+    print("-"*60)
+    
+    n_shapes = len(args.shapes) if args.shapes else len(SHAPES)
+    n_solvers = len(args.solvers) if args.solvers else len(SOLVERS)
+    print(f"\nRunning {n_shapes} shape(s) with {n_solvers} solver(s)...")
+    
+    options = dict(
+        m_lights=args.lights,
+        elevation_deg=args.elevation,
+        noise_std=args.noise,
+        generate_figs=args.figures != "none",
+        shapes=args.shapes,
+        solvers=args.solvers,
+        resolution=args.resolution,
+        workers=args.workers or None,
+        figure_mode=args.figures,
+        output_dir=args.output_dir,
+        rmse_target=args.rmse_target,
+        solver_profile=os.path.join(args.output_dir, "solver_profile.json"),
+    )
+    
+    # The serial path renders figures in the background; pool workers draw their own
+    if args.workers == 1 and args.figures != "none":
+        figure_queue = FigureQueue()
+        results = run_all_shapes_all_solvers(figure_queue=figure_queue, **options)
+        print_results_table(results)
+        print("\nWaiting for figures...")
+        figure_queue.join()
+    else:
+        results = run_all_shapes_all_solvers(**options)
+        print_results_table(results)
+    
+    save_results(results, output_dir=args.output_dir)
+    return results
+
+
+def run_ablation(args: argparse.Namespace) -> dict:
+    """Section 5.7: the selected ablation studies on one surface."""
+    print("\nSection 5.7: Ablation Studies")
+    print("-"*60)
+    
+    shape = args.shapes[0] if args.shapes else "gaussian"
+    create_fn = resolve_shapes([shape], args.resolution)[shape]
+    studies = [name for name in args.experiments if name in ABLATION_STUDIES]
+    results = run_all_ablation_studies(studies, create_fn=create_fn, m_lights=args.lights,
+                                       trials=args.trials, elevation_deg=args.elevation,
+                                       noise_std=args.noise, shape_name=shape)
+    
+    save_results({"shape": shape, **results}, filename="ablation_results.json", output_dir=args.output_dir)
+    return results
+
+
+def run_pareto(args: argparse.Namespace) -> dict:
+    """RMSE vs solve time of every solver candidate; saves the solver profile."""
+    print("\nAccuracy vs Time: Solver Pareto Fronts")
+    print("-"*60)
+    
+    resolutions = [args.resolution] if args.resolution else PARETO_RESOLUTIONS
+    output_path = os.path.join(args.output_dir, "solver_profile.json")
+    profile = run_pareto_exploration(args.shapes, resolutions, m_lights=args.lights,
+                                     elevation_deg=args.elevation, noise_std=args.noise,
+                                     output_path=output_path)
+    if args.figures != "none":
+        save_pareto_plot(profile, os.path.join(args.output_dir, "solver_profile.png"))
+    return profile
+
+
+def main(argv=None):
+    """Run the selected experiments (default: the full solver comparison)."""
+    args = parse_args(argv)
+    
+    configure_cache(enabled=not args.no_cache, root=os.path.join(args.output_dir, "cache"))
+    configure_raw_store(enabled=not args.no_raw, root=os.path.join(args.output_dir, "raw"))
+    results_store = configure_results_store(enabled=not args.no_db,
+                                            path=os.path.join(args.output_dir, "results.db"))
+    run_id = results_store.begin_run(label="runner", config=vars(args))
+    if args.trace:
+        enable_tracing()
+    if args.memory:
+        enable_memory_profiling()
+    
     print("="*60)
     print("PHOTOMETRIC STEREO EXPERIMENT SUITE")
     print("="*60)
-    print("\nSection 5.8: Solver Comparison Experiments")
-    print("-"*60)
+    print(f"Experiments: {', '.join(args.experiments)}")
+    
+    # First, so that --solvers auto picks from the fresh profile
+    if "pareto" in args.experiments:
+        run_pareto(args)
     
-    # Run solver comparison on all shapes
-    print("\nRunning all 8 shapes with all 3 solvers...")
-    results = run_all_shapes_all_solvers()
+    if "solvers" in args.experiments:
+        run_solver_comparison(args)
+        if run_id:
+            print(f"Results appended to {results_store.path} as run {run_id}")
     
-    # Print results table
-    print_results_table(results)
+    if any(name in ABLATION_STUDIES for name in args.experiments):
+        run_ablation(args)
     
-    # Save to JSON
-    save_results(results)
+    if args.trace:
+        trace_path = os.path.join(args.output_dir, "trace.json")
+        export_chrome_trace(trace_path)
+        print_trace_summary()
+        print(f"Chrome trace saved to: {trace_path} (open in chrome://tracing or Perfetto)")
     
     print("\nExperiment suite complete!")
     
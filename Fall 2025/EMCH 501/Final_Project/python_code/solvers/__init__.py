@@ -8,10 +8,13 @@ from .fft_periodic import solve_poisson_fft
 from .fd_dirichlet import solve_poisson_fd_dirichlet
 from .dct_neumann import solve_poisson_dct_neumann
 from .tikhonov import solve_poisson_tikhonov
+from .auto import solve_poisson_auto, select_solver
 
 __all__ = [
     'solve_poisson_fft',
     'solve_poisson_fd_dirichlet',
     'solve_poisson_dct_neumann',
     'solve_poisson_tikhonov',
+    'solve_poisson_auto',
+    'select_solver',
 ]
@@ -0,0 +1,200 @@
+# solvers/auto.py
+"""
+Automatic solver selection from a measured accuracy-vs-time profile.
+
+experiments/exp_pareto.py measures the RMSE and solve time of every
+candidate (each solver, Tikhonov at several λ) per shape and resolution
+and saves them as a profile. select_solver picks from it the fastest
+candidate whose RMSE meets a target for the given surface class and grid
+size; solve_poisson_auto does that and solves, with the same (f, dx, dy)
+signature as the other solvers.
+"""
+
+import json
+import math
+import os
+import warnings
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from config import SOLVER_PROFILE
+from profiling import traced
+from .fft_periodic import solve_poisson_fft
+from .fd_dirichlet import solve_poisson_fd_dirichlet
+from .dct_neumann import solve_poisson_dct_neumann
+from .tikhonov import solve_poisson_tikhonov
+from .cg_iterative import solve_poisson_cg
+
+
+# Candidates without parameters; Tikhonov candidates are named "tikhonov:<λ>"
+BASE_CANDIDATES = {
+    "fft": solve_poisson_fft,
+    "fd_dirichlet": solve_poisson_fd_dirichlet,
+    "dct_neumann": solve_poisson_dct_neumann,
+    "cg": solve_poisson_cg,
+}
+
+# Used when no profile has been measured yet
+DEFAULT_CANDIDATE = "dct_neumann"
+
+
+def tikhonov_candidate(lam: float) -> str:
+    """Candidate name of Tikhonov regularization with parameter λ."""
+    return f"tikhonov:{lam:g}"
+
+
+def get_candidate(name: str) -> Callable:
+    """Solver function (f, dx, dy) → Z of a candidate name."""
+    if name in BASE_CANDIDATES:
+        return BASE_CANDIDATES[name]
+    solver, _, param = name.partition(":")
+    if solver == "tikhonov" and param:
+        lam = float(param)
+        return lambda f, dx, dy: solve_poisson_tikhonov(f, dx, dy, lam=lam)
+    raise ValueError(f"Unknown solver candidate {name!r}; choose from {sorted(BASE_CANDIDATES)} "
+                     f"or tikhonov:<lambda>")
+
+
+_profiles: Dict[str, tuple] = {}
+
+
+def load_profile(path: str = SOLVER_PROFILE) -> Optional[dict]:
+    """The saved profile (reloaded when the file changes), or None if there is none."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _profiles.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path) as fh:
+            _profiles[path] = (mtime, json.load(fh))
+    return _profiles[path][1]
+
+
+def _nearest_resolution(by_resolution: dict, size: Optional[int]) -> Optional[str]:
+    """Measured resolution closest to size on a log scale (the largest if size is None)."""
+    if not by_resolution:
+        return None
+    if size is None:
+        return max(by_resolution, key=int)
+    return min(by_resolution, key=lambda res: abs(math.log(int(res) / size)))
+
+
+def candidate_points(profile: dict, surface: str = None, size: int = None) -> List[dict]:
+    """
+    Worst-case RMSE and time of each candidate for a surface class and size.
+
+    A surface missing from the profile (or None) is treated as any of the
+    measured ones, so each candidate is scored by its worst shape. Each
+    shape contributes its resolution nearest to size.
+
+    Returns
+    -------
+    points : list of dict
+        candidate, rmse, time_ms; only candidates measured on every shape
+    """
+    shapes = profile["profiles"]
+    selected = [surface] if surface in shapes else list(shapes)
+    worst: Dict[str, dict] = {}
+    counts: Dict[str, int] = {}
+    for shape in selected:
+        res = _nearest_resolution(shapes[shape], size)
+        if res is None:
+            continue
+        for point in shapes[shape][res]["points"]:
+            if point["rmse"] is None:
+                continue
+            name = point["candidate"]
+            entry = worst.setdefault(name, {"candidate": name, "rmse": 0.0, "time_ms": 0.0})
+            entry["rmse"] = max(entry["rmse"], point["rmse"])
+            entry["time_ms"] = max(entry["time_ms"], point["time_ms"])
+            counts[name] = counts.get(name, 0) + 1
+    n_shapes = max(counts.values(), default=0)
+    return [entry for name, entry in worst.items() if counts[name] == n_shapes]
+
+
+def select_solver(
+    rmse_target: float = None,
+    surface: str = None,
+    size: int = None,
+    profile: dict = None,
+    profile_path: str = SOLVER_PROFILE
+) -> str:
+    """
+    Fastest candidate whose RMSE meets a target.
+
+    Parameters
+    ----------
+    rmse_target : float, optional
+        Largest acceptable RMSE; None asks for the most accurate candidate
+    surface : str, optional
+        Shape name the surface resembles (None: any measured shape)
+    size : int, optional
+        Grid size N of an N x N problem (None: the largest measured)
+    profile : dict, optional
+        A profile from experiments.exp_pareto (default: load profile_path)
+    profile_path : str
+        Saved profile to load if profile is not given
+
+    Returns
+    -------
+    name : str
+        Candidate name (see get_candidate). If nothing meets the target,
+        the most accurate candidate; without a profile, DEFAULT_CANDIDATE.
+    """
+    if profile is None:
+        profile = load_profile(profile_path)
+    if profile is None:
+        warnings.warn(f"No solver profile at {profile_path} (run python -m experiments.exp_pareto); "
+                      f"using {DEFAULT_CANDIDATE}")
+        return DEFAULT_CANDIDATE
+    points = candidate_points(profile, surface, size)
+    if not points:
+        warnings.warn(f"Solver profile at {profile_path} has no candidate measured on every shape "
+                      f"(surface={surface}, size={size}); using {DEFAULT_CANDIDATE}")
+        return DEFAULT_CANDIDATE
+
+    meeting = [p for p in points if rmse_target is not None and p["rmse"] <= rmse_target]
+    if meeting:
+        return min(meeting, key=lambda p: (p["time_ms"], p["rmse"]))["candidate"]
+    return min(points, key=lambda p: (p["rmse"], p["time_ms"]))["candidate"]
+
+
+@traced
+def solve_poisson_auto(
+    f: np.ndarray,
+    dx: float,
+    dy: float,
+    rmse_target: float = None,
+    surface: str = None,
+    profile_path: str = SOLVER_PROFILE,
+    selection: dict = None
+) -> np.ndarray:
+    """
+    Solve the Poisson equation with the solver chosen by select_solver.
+
+    Parameters
+    ----------
+    f : ndarray
+        Divergence field (source term)
+    dx, dy : float
+        Grid spacing
+    rmse_target : float, optional
+        Largest acceptable RMSE (None: the most accurate candidate)
+    surface : str, optional
+        Shape name the surface resembles (None: the worst measured shape)
+    profile_path : str
+        Solver profile written by experiments.exp_pareto
+    selection : dict, optional
+        Receives the chosen candidate name under 'selected_solver'
+
+    Returns
+    -------
+    Z : ndarray
+        Height field from the selected solver
+    """
+    name = select_solver(rmse_target, surface, max(f.shape), profile_path=profile_path)
+    if selection is not None:
+        selection["selected_solver"] = name
+    return get_candidate(name)(f, dx, dy)
@@ -8,7 +8,10 @@ import numpy as np
 from scipy import sparse
 from scipy.sparse.linalg import cg
 
+from profiling import traced
 
+
+@traced
 def solve_poisson_cg_iterative(
     f: np.ndarray, 
     dx: float, 
@@ -156,6 +159,7 @@ def solve_poisson_cg_iterative(
 
 
 # Wrapper for compatibility with other solvers (returns just z)
+@traced
 def solve_poisson_cg(f: np.ndarray, dx: float, dy: float) -> np.ndarray:
     """
     Sparse iterative CG solver with default parameters.
@@ -4,7 +4,10 @@
 import numpy as np
 from scipy.fftpack import dctn, idctn
 
+from profiling import traced
 
+
+@traced
 def solve_poisson_dct_neumann(f: np.ndarray, dx: float, dy: float) -> np.ndarray:
     """
     Solve Poisson equation ∇²z = f using DCT (true Neumann BC).
@@ -5,7 +5,10 @@ import numpy as np
 from scipy import sparse
 from scipy.sparse.linalg import cg
 
+from profiling import traced
 
+
+@traced
 def solve_poisson_fd_dirichlet(f: np.ndarray, dx: float, dy: float) -> np.ndarray:
     """
     Solve Poisson equation ∇²z = f using finite differences (Dirichlet BC).
@@ -3,17 +3,21 @@
 
 import numpy as np
 
+from profiling import traced
 
+
+@traced
 def solve_poisson_fft(f: np.ndarray, dx: float, dy: float) -> np.ndarray:
     """
     Solve Poisson equation ∇²z = f using FFT (periodic BC).
     
     This is Solver 1 from Section 3.2 of project_restructured.tex.
-    Assumes periodic boundary conditions.
+    Assumes periodic boundary conditions. A stack of fields with leading
+    batch axes is solved in one batched transform.
     
     Parameters
     ----------
-    f : ndarray
+    f : ndarray, shape (..., Ny, Nx)
         Divergence field (source term)
     dx, dy : float
         Grid spacing
@@ -23,7 +27,7 @@ def solve_poisson_fft(f: np.ndarray, dx: float, dy: float) -> np.ndarray:
     Z : ndarray
         Height field solution (mean-centered)
     """
-    Ny, Nx = f.shape
+    Ny, Nx = f.shape[-2:]
     
     # Frequency grids
     kx = np.fft.fftfreq(Nx, d=dx) * 2 * np.pi
@@ -39,11 +43,11 @@ def solve_poisson_fft(f: np.ndarray, dx: float, dy: float) -> np.ndarray:
     # Transform, divide, inverse transform
     F_hat = np.fft.fft2(f)
     Z_hat = F_hat / denom
-    Z_hat[0, 0] = 0  # Set DC to zero (removes constant ambiguity)
+    Z_hat[..., 0, 0] = 0  # Set DC to zero (removes constant ambiguity)
     
     Z = np.real(np.fft.ifft2(Z_hat))
     
     # Mean-center the result
-    Z = Z - np.mean(Z)
+    Z = Z - np.mean(Z, axis=(-2, -1), keepdims=True)
     
     return Z
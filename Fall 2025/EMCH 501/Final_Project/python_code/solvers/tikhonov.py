@@ -3,7 +3,10 @@
 
 import numpy as np
 
+from profiling import traced
 
+
+@traced
 def solve_poisson_tikhonov(
     f: np.ndarray,
     dx: float,
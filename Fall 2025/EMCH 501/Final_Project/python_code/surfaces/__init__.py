@@ -4,14 +4,18 @@ Surface generators for photometric stereo experiments.
 Maps to Section 5.1 Test Surfaces in project_restructured.tex.
 """
 
-from .gaussian import create_gaussian_surface
-from .sphere import create_sphere_surface
-from .cube import create_cube_surface
-from .ellipsoid import create_ellipsoid_surface
-from .cone import create_cone_surface
-from .saddle import create_saddle_surface
-from .peaks import create_peaks_surface
-from .sinusoid import create_sinusoid_surface
+from .grid import coordinate_vector, open_grid, grid_arrays
+from .base import Surface, ArraySurface
+from .gaussian import GaussianSurface, create_gaussian_surface
+from .sphere import SphereSurface, create_sphere_surface
+from .cube import CubeSurface, create_cube_surface
+from .ellipsoid import EllipsoidSurface, create_ellipsoid_surface
+from .cone import ConeSurface, create_cone_surface
+from .saddle import SaddleSurface, create_saddle_surface
+from .peaks import PeaksSurface, create_peaks_surface
+from .sinusoid import SinusoidSurface, create_sinusoid_surface
+from .fractal import create_fractal_surface, fbm_spectrum
+from .heightmap import open_height_map, HeightMapSurface, create_height_map_surface
 
 __all__ = [
     'create_gaussian_surface',
@@ -22,4 +26,22 @@ __all__ = [
     'create_saddle_surface',
     'create_peaks_surface',
     'create_sinusoid_surface',
+    'create_fractal_surface',
+    'fbm_spectrum',
+    'create_height_map_surface',
+    'open_height_map',
+    'HeightMapSurface',
+    'coordinate_vector',
+    'open_grid',
+    'grid_arrays',
+    'Surface',
+    'ArraySurface',
+    'GaussianSurface',
+    'SphereSurface',
+    'CubeSurface',
+    'EllipsoidSurface',
+    'ConeSurface',
+    'SaddleSurface',
+    'PeaksSurface',
+    'SinusoidSurface',
 ]
@@ -0,0 +1,208 @@
+# surfaces/base.py
+"""Lazily evaluated surfaces that can be sampled one tile at a time."""
+
+import numpy as np
+from typing import Optional, Tuple, Union
+
+from .grid import coordinate_vector, grid_arrays
+
+
+# A tile is a (row_slice, col_slice) pair, a row slice alone, or None (full grid)
+Tile = Optional[Union[slice, Tuple[slice, slice]]]
+
+
+def _as_slices(tile: Tile) -> Tuple[slice, slice]:
+    """Normalize a tile specification to (row_slice, col_slice)."""
+    if tile is None:
+        return slice(None), slice(None)
+    if isinstance(tile, slice):
+        return tile, slice(None)
+    rows, cols = tile
+    return rows, cols
+
+
+class Surface:
+    """
+    Height map z(x, y) on a regular grid, evaluated on demand.
+
+    Subclasses implement `_evaluate(x, y, gradients)` on open-grid
+    coordinates (x of shape (1, nx), y of shape (ny, 1)); the base class
+    maps tiles of the full (Ny, Nx) grid onto those coordinates so callers
+    can pull only the region they need.
+
+    Parameters
+    ----------
+    Nx, Ny : int
+        Grid resolution
+    x_range, y_range : tuple
+        Domain bounds
+    """
+
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1)
+    ):
+        self.Nx = Nx
+        self.Ny = Ny
+        self.x_range = tuple(x_range)
+        self.y_range = tuple(y_range)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Full grid shape (Ny, Nx)."""
+        return (self.Ny, self.Nx)
+
+    @property
+    def x(self) -> np.ndarray:
+        """1-D x coordinates (cached, read-only)."""
+        return coordinate_vector(self.Nx, self.x_range[0], self.x_range[1])
+
+    @property
+    def y(self) -> np.ndarray:
+        """1-D y coordinates (cached, read-only)."""
+        return coordinate_vector(self.Ny, self.y_range[0], self.y_range[1])
+
+    @property
+    def dx(self) -> float:
+        """Grid spacing in x."""
+        return self.x[1] - self.x[0]
+
+    @property
+    def dy(self) -> float:
+        """Grid spacing in y."""
+        return self.y[1] - self.y[0]
+
+    @property
+    def extent(self) -> Tuple[float, float, float, float]:
+        """Domain bounds (x_min, x_max, y_min, y_max), as for imshow."""
+        return (self.x_range[0], self.x_range[1], self.y_range[0], self.y_range[1])
+
+    def tile_coordinates(self, tile: Tile = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Open-grid coordinates (x (1, nx), y (ny, 1)) of a tile."""
+        rows, cols = _as_slices(tile)
+        return self.x[cols][np.newaxis, :], self.y[rows][:, np.newaxis]
+
+    def iter_tiles(self, tile_rows: int):
+        """Yield row-band tiles of tile_rows rows covering the grid."""
+        for r0 in range(0, self.Ny, tile_rows):
+            yield slice(r0, min(r0 + tile_rows, self.Ny)), slice(None)
+
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        """Return Z, or (Z, p, q) if gradients, on open-grid coordinates."""
+        raise NotImplementedError
+
+    def evaluate(self, tile: Tile = None) -> np.ndarray:
+        """
+        Height map over a tile.
+
+        Parameters
+        ----------
+        tile : (slice, slice), slice or None
+            Rows/columns of the full grid (None for the whole grid)
+
+        Returns
+        -------
+        Z : ndarray
+            Heights on the tile
+        """
+        x, y = self.tile_coordinates(tile)
+        return self._evaluate(x, y, gradients=False)
+
+    def evaluate_gradients(self, tile: Tile = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Gradients p = ∂Z/∂x, q = ∂Z/∂y over a tile."""
+        x, y = self.tile_coordinates(tile)
+        _, p, q = self._evaluate(x, y, gradients=True)
+        return p, q
+
+    def evaluate_normals(self, tile: Tile = None) -> np.ndarray:
+        """
+        Unit normals n = [-p, -q, 1] / ||[-p, -q, 1]|| over a tile.
+
+        Returns
+        -------
+        N : ndarray, shape (ny, nx, 3)
+            Unit surface normals
+        """
+        p, q = self.evaluate_gradients(tile)
+        N = np.stack([-p, -q, np.ones_like(p)], axis=-1)
+        return N / np.linalg.norm(N, axis=-1, keepdims=True)
+
+    def generate(self, dense_grid: bool = False, return_gradients: bool = False) -> tuple:
+        """
+        Evaluate the full grid with the create_*_surface return contract.
+
+        Returns
+        -------
+        X, Y, Z, dx, dy : tuple
+            Plus p, q if return_gradients
+        """
+        x, y = self.tile_coordinates()
+        X, Y = grid_arrays(x, y, dense_grid)
+
+        if return_gradients:
+            Z, p, q = self._evaluate(x, y, gradients=True)
+            return X, Y, Z, self.dx, self.dy, p, q
+
+        Z = self._evaluate(x, y, gradients=False)
+        return X, Y, Z, self.dx, self.dy
+
+
+class ArraySurface(Surface):
+    """
+    Surface backed by a precomputed (possibly memory-mapped) height array.
+
+    Tiles are sliced from the array, so only the touched region is read.
+    Gradients use the same stencil as compute_gradients (central
+    differences, one-sided at the grid edge) with a one-sample halo, so
+    tiled gradients match the full-grid result.
+
+    Parameters
+    ----------
+    Z : ndarray or memmap, shape (Ny, Nx)
+        Height map
+    x_range, y_range : tuple
+        Domain bounds
+    """
+
+    def __init__(
+        self,
+        Z: np.ndarray,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1)
+    ):
+        Ny, Nx = Z.shape
+        super().__init__(Nx, Ny, x_range, y_range)
+        self.Z = Z
+
+    def evaluate(self, tile: Tile = None) -> np.ndarray:
+        rows, cols = _as_slices(tile)
+        return np.asarray(self.Z[rows, cols], dtype=np.float64)
+
+    def evaluate_gradients(self, tile: Tile = None) -> Tuple[np.ndarray, np.ndarray]:
+        rows, cols = _as_slices(tile)
+        r0, r1, r_step = rows.indices(self.Ny)
+        c0, c1, c_step = cols.indices(self.Nx)
+        if r_step != 1 or c_step != 1:
+            raise ValueError("Gradients of an ArraySurface need unit-step tiles")
+
+        # Read a one-sample halo where the grid continues
+        h_r0, h_r1 = max(r0 - 1, 0), min(r1 + 1, self.Ny)
+        h_c0, h_c1 = max(c0 - 1, 0), min(c1 + 1, self.Nx)
+        block = np.asarray(self.Z[h_r0:h_r1, h_c0:h_c1], dtype=np.float64)
+
+        q, p = np.gradient(block, self.dy, self.dx)
+
+        inner = (slice(r0 - h_r0, r1 - h_r0), slice(c0 - h_c0, c1 - h_c0))
+        return p[inner], q[inner]
+
+    def generate(self, dense_grid: bool = False, return_gradients: bool = False) -> tuple:
+        x, y = self.tile_coordinates()
+        X, Y = grid_arrays(x, y, dense_grid)
+
+        if return_gradients:
+            p, q = self.evaluate_gradients()
+            return X, Y, self.Z, self.dx, self.dy, p, q
+        return X, Y, self.Z, self.dx, self.dy
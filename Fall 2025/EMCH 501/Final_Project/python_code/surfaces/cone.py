@@ -4,6 +4,41 @@
 import numpy as np
 from typing import Tuple
 
+from .base import Surface
+
+
+class ConeSurface(Surface):
+    """Soft cone surface. Evaluated lazily, tile by tile."""
+    
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1),
+        height: float = 0.8,
+        radius: float = 0.9
+    ):
+        super().__init__(Nx, Ny, x_range, y_range)
+        self.height = height
+        self.radius = radius
+    
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        height, radius = self.height, self.radius
+        
+        r = np.sqrt(x**2 + y**2)
+        Z = height * np.maximum(0, 1 - r / radius)
+        
+        if not gradients:
+            return Z
+        
+        # Radial slope -height/radius inside the base; apex set to 0
+        inside = (r > 0) & (r < radius)
+        p = np.divide(-height / radius * x, r, out=np.zeros_like(Z), where=inside)
+        q = np.divide(-height / radius * y, r, out=np.zeros_like(Z), where=inside)
+        
+        return Z, p, q
+
 
 def create_cone_surface(
     Nx: int = 128,
@@ -11,7 +46,9 @@ def create_cone_surface(
     x_range: Tuple[float, float] = (-1, 1),
     y_range: Tuple[float, float] = (-1, 1),
     height: float = 0.8,
-    radius: float = 0.9
+    radius: float = 0.9,
+    dense_grid: bool = False,
+    return_gradients: bool = False
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
     """
     Create a soft cone surface on a regular grid.
@@ -28,24 +65,22 @@ def create_cone_surface(
         Cone apex height
     radius : float
         Base radius
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return analytic gradients evaluated alongside Z
         
     Returns
     -------
     X, Y : ndarray
-        Meshgrid coordinates
+        Meshgrid coordinates (read-only broadcast views by default)
     Z : ndarray
         Height map
     dx, dy : float
         Grid spacing
+    p, q : ndarray
+        Analytic gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
     """
-    x = np.linspace(x_range[0], x_range[1], Nx)
-    y = np.linspace(y_range[0], y_range[1], Ny)
-    X, Y = np.meshgrid(x, y, indexing='xy')
-    
-    r = np.sqrt(X**2 + Y**2)
-    Z = height * np.maximum(0, 1 - r / radius)
-    
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    return X, Y, Z, dx, dy
+    surface = ConeSurface(Nx, Ny, x_range, y_range, height, radius)
+    return surface.generate(dense_grid, return_gradients)
@@ -4,6 +4,50 @@
 import numpy as np
 from typing import Tuple
 
+from .base import Surface
+
+
+class CubeSurface(Surface):
+    """Softened cube surface. Evaluated lazily, tile by tile."""
+    
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1),
+        cube_half: float = 0.35,
+        cube_edge: float = 0.1,
+        cube_height: float = 0.6
+    ):
+        super().__init__(Nx, Ny, x_range, y_range)
+        self.cube_half = cube_half
+        self.cube_edge = cube_edge
+        self.cube_height = cube_height
+    
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        cube_half, cube_edge, cube_height = self.cube_half, self.cube_edge, self.cube_height
+        
+        # Distance from center in L-infinity norm
+        d = np.maximum(np.abs(x), np.abs(y))
+        
+        # Soft transition: 1 inside, 0 outside, smooth between
+        t = (d - cube_half) / cube_edge
+        t = np.clip(t, 0, 1)
+        
+        Z = cube_height * (1 - t)
+        
+        if not gradients:
+            return Z
+        
+        # Nonzero only on the sloped edge band, along the dominant axis
+        slope = np.where((t > 0) & (t < 1), -cube_height / cube_edge, 0.0)
+        x_dominant = np.abs(x) >= np.abs(y)
+        p = np.where(x_dominant, slope * np.sign(x), 0.0)
+        q = np.where(x_dominant, 0.0, slope * np.sign(y))
+        
+        return Z, p, q
+
 
 def create_cube_surface(
     Nx: int = 128,
@@ -12,7 +56,9 @@ def create_cube_surface(
     y_range: Tuple[float, float] = (-1, 1),
     cube_half: float = 0.35,
     cube_edge: float = 0.1,
-    cube_height: float = 0.6
+    cube_height: float = 0.6,
+    dense_grid: bool = False,
+    return_gradients: bool = False
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
     """
     Create a softened cube surface on a regular grid.
@@ -31,30 +77,22 @@ def create_cube_surface(
         Width of edge transition zone
     cube_height : float
         Maximum height of cube
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return analytic gradients evaluated alongside Z
         
     Returns
     -------
     X, Y : ndarray
-        Meshgrid coordinates
+        Meshgrid coordinates (read-only broadcast views by default)
     Z : ndarray
         Height map
     dx, dy : float
         Grid spacing
+    p, q : ndarray
+        Analytic gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
     """
-    x = np.linspace(x_range[0], x_range[1], Nx)
-    y = np.linspace(y_range[0], y_range[1], Ny)
-    X, Y = np.meshgrid(x, y, indexing='xy')
-    
-    # Distance from center in L-infinity norm
-    d = np.maximum(np.abs(X), np.abs(Y))
-    
-    # Soft transition: 1 inside, 0 outside, smooth between
-    t = (d - cube_half) / cube_edge
-    t = np.clip(t, 0, 1)
-    
-    Z = cube_height * (1 - t)
-    
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    return X, Y, Z, dx, dy
+    surface = CubeSurface(Nx, Ny, x_range, y_range, cube_half, cube_edge, cube_height)
+    return surface.generate(dense_grid, return_gradients)
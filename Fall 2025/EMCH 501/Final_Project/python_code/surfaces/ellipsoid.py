@@ -4,6 +4,45 @@
 import numpy as np
 from typing import Tuple
 
+from .base import Surface
+
+
+class EllipsoidSurface(Surface):
+    """Ellipsoid (triaxial) surface. Evaluated lazily, tile by tile."""
+    
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1),
+        a: float = 0.8,
+        b: float = 0.6,
+        c: float = 0.5
+    ):
+        super().__init__(Nx, Ny, x_range, y_range)
+        self.a = a
+        self.b = b
+        self.c = c
+    
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        a, b, c = self.a, self.b, self.c
+        
+        # Ellipse footprint (zero outside)
+        r2_norm = (x / a)**2 + (y / b)**2
+        
+        Z = c * np.sqrt(np.maximum(1 - r2_norm, 0))
+        
+        if not gradients:
+            return Z
+        
+        # ∂Z/∂x = -c² x / (a² Z); unbounded at the rim, set to 0 where Z = 0
+        inside = Z > 0
+        p = np.divide(-c**2 * x / a**2, Z, out=np.zeros_like(Z), where=inside)
+        q = np.divide(-c**2 * y / b**2, Z, out=np.zeros_like(Z), where=inside)
+        
+        return Z, p, q
+
 
 def create_ellipsoid_surface(
     Nx: int = 128,
@@ -12,7 +51,9 @@ def create_ellipsoid_surface(
     y_range: Tuple[float, float] = (-1, 1),
     a: float = 0.8,
     b: float = 0.6,
-    c: float = 0.5
+    c: float = 0.5,
+    dense_grid: bool = False,
+    return_gradients: bool = False
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
     """
     Create an ellipsoid surface on a regular grid.
@@ -27,28 +68,22 @@ def create_ellipsoid_surface(
         Domain bounds
     a, b, c : float
         Semi-axes in x, y, z directions
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return analytic gradients evaluated alongside Z
         
     Returns
     -------
     X, Y : ndarray
-        Meshgrid coordinates
+        Meshgrid coordinates (read-only broadcast views by default)
     Z : ndarray
         Height map (0 outside ellipsoid footprint)
     dx, dy : float
         Grid spacing
+    p, q : ndarray
+        Analytic gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
     """
-    x = np.linspace(x_range[0], x_range[1], Nx)
-    y = np.linspace(y_range[0], y_range[1], Ny)
-    X, Y = np.meshgrid(x, y, indexing='xy')
-    
-    # Ellipse footprint
-    r2_norm = (X / a)**2 + (Y / b)**2
-    inside = r2_norm <= 1
-    
-    Z = np.zeros_like(X)
-    Z[inside] = c * np.sqrt(1 - r2_norm[inside])
-    
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    return X, Y, Z, dx, dy
+    surface = EllipsoidSurface(Nx, Ny, x_range, y_range, a, b, c)
+    return surface.generate(dense_grid, return_gradients)
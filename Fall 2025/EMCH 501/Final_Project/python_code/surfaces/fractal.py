@@ -0,0 +1,194 @@
+# surfaces/fractal.py
+"""Spectral (fractional-Brownian) fractal surface generator."""
+
+import tempfile
+import numpy as np
+from typing import Callable, Optional, Tuple
+
+from .grid import open_grid, grid_arrays
+
+
+def fbm_spectrum(hurst: float) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Amplitude filter of fractional Brownian motion, |k|^-(H+1).
+
+    Parameters
+    ----------
+    hurst : float
+        Hurst exponent H in (0, 1); larger is smoother
+
+    Returns
+    -------
+    spectrum : callable
+        Maps radial wavenumber k (cycles per unit length) to amplitude
+    """
+    def spectrum(k: np.ndarray) -> np.ndarray:
+        out = np.zeros_like(k)
+        nonzero = k > 0
+        out[nonzero] = k[nonzero] ** -(hurst + 1)
+        return out
+    return spectrum
+
+
+def _inverse_transform(spec: np.ndarray, out: np.ndarray, chunk: int) -> float:
+    """
+    Inverse 2-D real transform of an rfft half-plane spectrum into out.
+
+    Transforms along y in place (column blocks), then along x (row
+    blocks), so only spec and out are ever allocated in full.
+
+    Returns
+    -------
+    sum_sq : float
+        Sum of squares of out
+    """
+    Ny, Nkx = spec.shape
+    Nx = out.shape[1]
+
+    # Inverse transform along y, column block by column block
+    for c0 in range(0, Nkx, chunk):
+        c1 = min(c0 + chunk, Nkx)
+        spec[:, c0:c1] = np.fft.ifft(spec[:, c0:c1], axis=0)
+
+    # Inverse real transform along x, accumulating the sum of squares
+    sum_sq = 0.0
+    for r0 in range(0, Ny, chunk):
+        r1 = min(r0 + chunk, Ny)
+        out[r0:r1] = np.fft.irfft(spec[r0:r1], n=Nx, axis=1)
+        sum_sq += float(np.sum(out[r0:r1]**2))
+    return sum_sq
+
+
+def create_fractal_surface(
+    Nx: int = 128,
+    Ny: int = 128,
+    x_range: Tuple[float, float] = (-1, 1),
+    y_range: Tuple[float, float] = (-1, 1),
+    hurst: float = 0.8,
+    rms_height: float = 0.1,
+    seed: int = 0,
+    spectrum: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    out_path: Optional[str] = None,
+    chunk: int = 1024,
+    dense_grid: bool = False,
+    return_gradients: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
+    """
+    Create a multi-scale fractal surface by spectral filtering of seeded noise.
+
+    Complex white noise is shaped by the amplitude spectrum in the rfft
+    half-plane and inverse-transformed as two chunked 1-D passes (ifft over
+    rows in column blocks, then irfft over columns in row blocks), so
+    8192² and larger surfaces never need more than one spectrum-sized
+    buffer. With out_path both the spectrum and Z are memory-mapped.
+
+    Noise is drawn per spectral row from np.random.default_rng((seed, row)),
+    so the surface depends only on (seed, Nx, Ny, ranges, spectrum) and
+    not on the chunk size.
+
+    With return_gradients, ∂Z/∂x and ∂Z/∂y are the spectral derivatives of
+    the same spectrum (multiplied by 2πi·k before the inverse transforms),
+    exact for the periodic trigonometric interpolant of Z. They are held in
+    memory even with out_path.
+
+    Parameters
+    ----------
+    Nx, Ny : int
+        Grid resolution
+    x_range, y_range : tuple
+        Domain bounds
+    hurst : float
+        Hurst exponent of the default fBm spectrum
+    rms_height : float
+        RMS height of the (zero-mean) result
+    seed : int
+        Noise seed
+    spectrum : callable, optional
+        User amplitude spectrum k → A(k), k in cycles per unit length;
+        overrides hurst
+    out_path : str, optional
+        If given, Z is written to this file as a float64 np.memmap
+        (the spectrum buffer goes to an anonymous temporary file)
+    chunk : int
+        Rows/columns transformed per block
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return the spectral gradients of Z
+
+    Returns
+    -------
+    X, Y : ndarray
+        Meshgrid coordinates (read-only broadcast views by default)
+    Z : ndarray or memmap
+        Height map
+    dx, dy : float
+        Grid spacing
+    p, q : ndarray
+        Spectral gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
+    """
+    x, y, dx, dy = open_grid(Nx, Ny, x_range, y_range)
+
+    if spectrum is None:
+        spectrum = fbm_spectrum(hurst)
+
+    # rfft half-plane wavenumbers (cycles per unit length)
+    Nkx = Nx // 2 + 1
+    kx = np.fft.rfftfreq(Nx, d=dx)
+    ky = np.fft.fftfreq(Ny, d=dy)
+
+    if out_path is None:
+        spec = np.empty((Ny, Nkx), dtype=np.complex128)
+        Z = np.empty((Ny, Nx))
+    else:
+        spec = np.memmap(tempfile.TemporaryFile(), dtype=np.complex128, mode='w+', shape=(Ny, Nkx))
+        Z = np.memmap(out_path, dtype=np.float64, mode='w+', shape=(Ny, Nx))
+
+    # Seeded complex white noise shaped by the spectrum, row block by row block
+    for r0 in range(0, Ny, chunk):
+        r1 = min(r0 + chunk, Ny)
+        noise = np.empty((r1 - r0, Nkx), dtype=np.complex128)
+        for i in range(r0, r1):
+            rng = np.random.default_rng((seed, i))
+            noise[i - r0].real = rng.standard_normal(Nkx)
+            noise[i - r0].imag = rng.standard_normal(Nkx)
+        k = np.hypot(kx[np.newaxis, :], ky[r0:r1, np.newaxis])
+        spec[r0:r1] = noise * spectrum(k)
+
+    # No DC component: zero-mean surface
+    spec[0, 0] = 0
+
+    gradients = []
+    if return_gradients:
+        # Spectral derivatives; the Nyquist terms have no real derivative
+        ikx = 2j * np.pi * kx
+        iky = 2j * np.pi * ky
+        if Nx % 2 == 0:
+            ikx[-1] = 0
+        if Ny % 2 == 0:
+            iky[Ny // 2] = 0
+        gradients = [(spec * ikx[np.newaxis, :], np.empty((Ny, Nx))),
+                     (spec * iky[:, np.newaxis], np.empty((Ny, Nx)))]
+
+    sum_sq = _inverse_transform(spec, Z, chunk)
+    del spec
+    for grad_spec, grad in gradients:
+        _inverse_transform(grad_spec, grad, chunk)
+
+    # Scale to the requested RMS height
+    rms = np.sqrt(sum_sq / (Nx * Ny))
+    if rms > 0:
+        for out in [Z] + [grad for _, grad in gradients]:
+            for r0 in range(0, Ny, chunk):
+                out[r0:r0 + chunk] *= rms_height / rms
+
+    if isinstance(Z, np.memmap):
+        Z.flush()
+
+    X, Y = grid_arrays(x, y, dense_grid)
+
+    if return_gradients:
+        p, q = (grad for _, grad in gradients)
+        return X, Y, Z, dx, dy, p, q
+    return X, Y, Z, dx, dy
@@ -4,13 +4,45 @@
 import numpy as np
 from typing import Tuple
 
+from .base import Surface
+
+
+class GaussianSurface(Surface):
+    """Gaussian bump surface. Evaluated lazily, tile by tile."""
+    
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1),
+        sigma: float = 0.4
+    ):
+        super().__init__(Nx, Ny, x_range, y_range)
+        self.sigma = sigma
+    
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        sigma = self.sigma
+        
+        Z = np.exp(-(x**2 + y**2) / (2 * sigma**2))
+        
+        if not gradients:
+            return Z
+        
+        p = -x / sigma**2 * Z
+        q = -y / sigma**2 * Z
+        
+        return Z, p, q
+
 
 def create_gaussian_surface(
     Nx: int = 128,
     Ny: int = 128,
     x_range: Tuple[float, float] = (-1, 1),
     y_range: Tuple[float, float] = (-1, 1),
-    sigma: float = 0.4
+    sigma: float = 0.4,
+    dense_grid: bool = False,
+    return_gradients: bool = False
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
     """
     Create a Gaussian bump surface on a regular grid.
@@ -23,23 +55,22 @@ def create_gaussian_surface(
         Domain bounds
     sigma : float
         Gaussian width parameter
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return analytic gradients evaluated alongside Z
         
     Returns
     -------
     X, Y : ndarray
-        Meshgrid coordinates
+        Meshgrid coordinates (read-only broadcast views by default)
     Z : ndarray
         Height map
     dx, dy : float
         Grid spacing
+    p, q : ndarray
+        Analytic gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
     """
-    x = np.linspace(x_range[0], x_range[1], Nx)
-    y = np.linspace(y_range[0], y_range[1], Ny)
-    X, Y = np.meshgrid(x, y, indexing='xy')
-    
-    Z = np.exp(-(X**2 + Y**2) / (2 * sigma**2))
-    
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    return X, Y, Z, dx, dy
+    surface = GaussianSurface(Nx, Ny, x_range, y_range, sigma)
+    return surface.generate(dense_grid, return_gradients)
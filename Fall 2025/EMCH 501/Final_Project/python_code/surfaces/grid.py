@@ -0,0 +1,93 @@
+# surfaces/grid.py
+"""Cached coordinate vectors and open (broadcast) grids for surface generators."""
+
+import numpy as np
+from functools import lru_cache
+from typing import Tuple
+
+
+@lru_cache(maxsize=64)
+def coordinate_vector(n: int, lo: float, hi: float) -> np.ndarray:
+    """
+    Cached, read-only np.linspace(lo, hi, n).
+
+    Parameters
+    ----------
+    n : int
+        Number of samples
+    lo, hi : float
+        Interval end points (inclusive)
+
+    Returns
+    -------
+    v : ndarray, shape (n,)
+        Coordinate vector (shared between callers, do not modify)
+    """
+    v = np.linspace(lo, hi, n)
+    v.setflags(write=False)
+    return v
+
+
+def open_grid(
+    Nx: int,
+    Ny: int,
+    x_range: Tuple[float, float],
+    y_range: Tuple[float, float]
+) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    """
+    Open-grid coordinates, equivalent to np.ogrid for a linspace domain.
+
+    Surface formulas written in terms of x and y broadcast to the full
+    (Ny, Nx) grid, so only the height map itself is materialized.
+
+    Parameters
+    ----------
+    Nx, Ny : int
+        Grid resolution
+    x_range, y_range : tuple
+        Domain bounds
+
+    Returns
+    -------
+    x : ndarray, shape (1, Nx)
+        Row vector of x coordinates
+    y : ndarray, shape (Ny, 1)
+        Column vector of y coordinates
+    dx, dy : float
+        Grid spacing
+    """
+    x = coordinate_vector(Nx, x_range[0], x_range[1])
+    y = coordinate_vector(Ny, y_range[0], y_range[1])
+
+    dx = x[1] - x[0]
+    dy = y[1] - y[0]
+
+    return x[np.newaxis, :], y[:, np.newaxis], dx, dy
+
+
+def grid_arrays(x: np.ndarray, y: np.ndarray, dense: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Full-size X, Y coordinate arrays for an open grid.
+
+    Parameters
+    ----------
+    x : ndarray, shape (1, Nx)
+        Row vector of x coordinates
+    y : ndarray, shape (Ny, 1)
+        Column vector of y coordinates
+    dense : bool
+        If True, return writable meshgrid copies; otherwise zero-copy,
+        read-only broadcast views (no extra memory until copied)
+
+    Returns
+    -------
+    X, Y : ndarray, shape (Ny, Nx)
+        Meshgrid coordinates
+    """
+    shape = (y.shape[0], x.shape[1])
+    X = np.broadcast_to(x, shape)
+    Y = np.broadcast_to(y, shape)
+
+    if dense:
+        return X.copy(), Y.copy()
+    return X, Y
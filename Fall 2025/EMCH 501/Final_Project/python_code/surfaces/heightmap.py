@@ -0,0 +1,149 @@
+# surfaces/heightmap.py
+"""Memory-mapped measured height maps (DEM tiles, profilometer scans)."""
+
+import numpy as np
+from typing import Optional, Tuple
+
+from .base import ArraySurface
+
+
+def open_height_map(
+    path: str,
+    shape: Optional[Tuple[int, int]] = None,
+    dtype: str = 'float32',
+    offset: int = 0
+) -> np.ndarray:
+    """
+    Open a height map file read-only through np.memmap.
+
+    Parameters
+    ----------
+    path : str
+        .npy file, or a raw binary array (requires shape)
+    shape : tuple, optional
+        (Ny, Nx) of a raw file
+    dtype : str
+        Element type of a raw file
+    offset : int
+        Header bytes to skip in a raw file
+
+    Returns
+    -------
+    Z : memmap, shape (Ny, Nx)
+        Height map; no data is read until it is indexed
+    """
+    if path.lower().endswith('.npy'):
+        Z = np.load(path, mmap_mode='r')
+    else:
+        if shape is None:
+            raise ValueError("Raw height maps need an explicit (Ny, Nx) shape")
+        Z = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=tuple(shape))
+
+    if Z.ndim != 2:
+        raise ValueError(f"Height map must be 2-D, got shape {Z.shape}")
+
+    return Z
+
+
+class HeightMapSurface(ArraySurface):
+    """
+    Measured height map as a lazily read Surface.
+
+    Downsampling to a target resolution is a strided view of the memory
+    map, so tiles read only the rows they touch.
+
+    Parameters
+    ----------
+    path : str
+        .npy or raw binary height map
+    target_shape : tuple, optional
+        Approximate (Ny, Nx) to downsample to, at least 2 per axis; the
+        stride per axis is ceil(full / target)
+    shape, dtype, offset
+        Raw file layout (see open_height_map)
+    spacing : tuple
+        Sample spacing (dx, dy) of the full-resolution file
+    """
+
+    def __init__(
+        self,
+        path: str,
+        target_shape: Optional[Tuple[int, int]] = None,
+        shape: Optional[Tuple[int, int]] = None,
+        dtype: str = 'float32',
+        offset: int = 0,
+        spacing: Tuple[float, float] = (1.0, 1.0)
+    ):
+        full = open_height_map(path, shape, dtype, offset)
+        Ny_full, Nx_full = full.shape
+
+        # Gradients and normals need at least two samples along each axis
+        if min(Ny_full, Nx_full) < 2:
+            raise ValueError(f"Height map must be at least 2 x 2, got shape {full.shape}")
+        if target_shape is not None and min(target_shape) < 2:
+            raise ValueError(f"target_shape must be at least (2, 2), got {tuple(target_shape)}")
+
+        if target_shape is None:
+            sy = sx = 1
+        else:
+            sy = max(1, -(-Ny_full // target_shape[0]))
+            sx = max(1, -(-Nx_full // target_shape[1]))
+
+        Z = full[::sy, ::sx]
+        Ny, Nx = Z.shape
+
+        # Domain spans the retained samples of the full-resolution grid
+        x_range = (0.0, (Nx - 1) * sx * spacing[0])
+        y_range = (0.0, (Ny - 1) * sy * spacing[1])
+
+        super().__init__(Z, x_range, y_range)
+        self.path = path
+        self.stride = (sy, sx)
+
+
+def create_height_map_surface(
+    path: str,
+    target_shape: Optional[Tuple[int, int]] = None,
+    shape: Optional[Tuple[int, int]] = None,
+    dtype: str = 'float32',
+    offset: int = 0,
+    spacing: Tuple[float, float] = (1.0, 1.0),
+    dense_grid: bool = False,
+    return_gradients: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
+    """
+    Load a measured height map as ground truth.
+
+    Parameters
+    ----------
+    path : str
+        .npy or raw binary height map
+    target_shape : tuple, optional
+        Approximate (Ny, Nx) after strided downsampling
+    shape : tuple, optional
+        (Ny, Nx) of a raw file
+    dtype : str
+        Element type of a raw file
+    offset : int
+        Header bytes to skip in a raw file
+    spacing : tuple
+        Sample spacing (dx, dy) of the full-resolution file
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return finite-difference gradients (reads all of Z)
+
+    Returns
+    -------
+    X, Y : ndarray
+        Meshgrid coordinates (read-only broadcast views by default)
+    Z : memmap
+        Height map (strided view, read on access)
+    dx, dy : float
+        Grid spacing
+    p, q : ndarray
+        Gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
+    """
+    surface = HeightMapSurface(path, target_shape, shape, dtype, offset, spacing)
+    return surface.generate(dense_grid, return_gradients)
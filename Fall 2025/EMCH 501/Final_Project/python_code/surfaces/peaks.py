@@ -4,12 +4,49 @@
 import numpy as np
 from typing import Tuple
 
+from .base import Surface
+
+
+class PeaksSurface(Surface):
+    """MATLAB peaks function surface. Evaluated lazily, tile by tile."""
+    
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-3, 3),
+        y_range: Tuple[float, float] = (-3, 3)
+    ):
+        super().__init__(Nx, Ny, x_range, y_range)
+    
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        # The three Gaussian factors are shared by Z and its gradients
+        e1 = np.exp(-x**2 - (y + 1)**2)
+        e2 = np.exp(-x**2 - y**2)
+        e3 = np.exp(-(x + 1)**2 - y**2)
+        poly = x/5 - x**3 - y**5
+        Z = 3 * (1 - x)**2 * e1 - 10 * poly * e2 - (1/3) * e3
+        
+        if not gradients:
+            return Z
+        
+        p = (-6 * (1 - x) * (1 + x - x**2) * e1
+             - 10 * (1/5 - 3 * x**2 - 2 * x * poly) * e2
+             + (2/3) * (x + 1) * e3)
+        q = (-6 * (1 - x)**2 * (y + 1) * e1
+             - 10 * (-5 * y**4 - 2 * y * poly) * e2
+             + (2/3) * y * e3)
+        
+        return Z, p, q
+
 
 def create_peaks_surface(
     Nx: int = 128,
     Ny: int = 128,
     x_range: Tuple[float, float] = (-3, 3),
-    y_range: Tuple[float, float] = (-3, 3)
+    y_range: Tuple[float, float] = (-3, 3),
+    dense_grid: bool = False,
+    return_gradients: bool = False
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
     """
     Create MATLAB peaks function surface on a regular grid.
@@ -22,25 +59,22 @@ def create_peaks_surface(
         Grid resolution
     x_range, y_range : tuple
         Domain bounds (default wider for peaks)
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return analytic gradients evaluated alongside Z
         
     Returns
     -------
     X, Y : ndarray
-        Meshgrid coordinates
+        Meshgrid coordinates (read-only broadcast views by default)
     Z : ndarray
         Height map
     dx, dy : float
         Grid spacing
+    p, q : ndarray
+        Analytic gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
     """
-    x = np.linspace(x_range[0], x_range[1], Nx)
-    y = np.linspace(y_range[0], y_range[1], Ny)
-    X, Y = np.meshgrid(x, y, indexing='xy')
-    
-    Z = (3 * (1 - X)**2 * np.exp(-X**2 - (Y + 1)**2)
-         - 10 * (X/5 - X**3 - Y**5) * np.exp(-X**2 - Y**2)
-         - (1/3) * np.exp(-(X + 1)**2 - Y**2))
-    
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    return X, Y, Z, dx, dy
+    surface = PeaksSurface(Nx, Ny, x_range, y_range)
+    return surface.generate(dense_grid, return_gradients)
@@ -4,13 +4,45 @@
 import numpy as np
 from typing import Tuple
 
+from .base import Surface
+
+
+class SaddleSurface(Surface):
+    """Hyperbolic paraboloid (saddle) surface. Evaluated lazily, tile by tile."""
+    
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1),
+        scale: float = 0.3
+    ):
+        super().__init__(Nx, Ny, x_range, y_range)
+        self.scale = scale
+    
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        scale = self.scale
+        
+        Z = scale * x * y
+        
+        if not gradients:
+            return Z
+        
+        p = np.broadcast_to(scale * y, Z.shape).copy()
+        q = np.broadcast_to(scale * x, Z.shape).copy()
+        
+        return Z, p, q
+
 
 def create_saddle_surface(
     Nx: int = 128,
     Ny: int = 128,
     x_range: Tuple[float, float] = (-1, 1),
     y_range: Tuple[float, float] = (-1, 1),
-    scale: float = 0.3
+    scale: float = 0.3,
+    dense_grid: bool = False,
+    return_gradients: bool = False
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
     """
     Create a saddle (hyperbolic paraboloid) surface on a regular grid.
@@ -25,23 +57,22 @@ def create_saddle_surface(
         Domain bounds
     scale : float
         Amplitude scaling factor
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return analytic gradients evaluated alongside Z
         
     Returns
     -------
     X, Y : ndarray
-        Meshgrid coordinates
+        Meshgrid coordinates (read-only broadcast views by default)
     Z : ndarray
         Height map
     dx, dy : float
         Grid spacing
+    p, q : ndarray
+        Analytic gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
     """
-    x = np.linspace(x_range[0], x_range[1], Nx)
-    y = np.linspace(y_range[0], y_range[1], Ny)
-    X, Y = np.meshgrid(x, y, indexing='xy')
-    
-    Z = scale * X * Y
-    
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    return X, Y, Z, dx, dy
+    surface = SaddleSurface(Nx, Ny, x_range, y_range, scale)
+    return surface.generate(dense_grid, return_gradients)
@@ -4,13 +4,46 @@
 import numpy as np
 from typing import Tuple
 
+from .base import Surface
+
+
+class SinusoidSurface(Surface):
+    """Sinusoidal surface. Evaluated lazily, tile by tile."""
+    
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1),
+        amplitude: float = 0.3
+    ):
+        super().__init__(Nx, Ny, x_range, y_range)
+        self.amplitude = amplitude
+    
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        amplitude = self.amplitude
+        
+        # sin() is evaluated on the 1-D vectors only
+        Z = amplitude * np.sin(np.pi * x) * np.sin(np.pi * y)
+        
+        if not gradients:
+            return Z
+        
+        p = amplitude * np.pi * np.cos(np.pi * x) * np.sin(np.pi * y)
+        q = amplitude * np.pi * np.sin(np.pi * x) * np.cos(np.pi * y)
+        
+        return Z, p, q
+
 
 def create_sinusoid_surface(
     Nx: int = 128,
     Ny: int = 128,
     x_range: Tuple[float, float] = (-1, 1),
     y_range: Tuple[float, float] = (-1, 1),
-    amplitude: float = 0.3
+    amplitude: float = 0.3,
+    dense_grid: bool = False,
+    return_gradients: bool = False
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
     """
     Create a sinusoidal bump surface on a regular grid.
@@ -25,23 +58,22 @@ def create_sinusoid_surface(
         Domain bounds
     amplitude : float
         Surface amplitude
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return analytic gradients evaluated alongside Z
         
     Returns
     -------
     X, Y : ndarray
-        Meshgrid coordinates
+        Meshgrid coordinates (read-only broadcast views by default)
     Z : ndarray
         Height map
     dx, dy : float
         Grid spacing
+    p, q : ndarray
+        Analytic gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
     """
-    x = np.linspace(x_range[0], x_range[1], Nx)
-    y = np.linspace(y_range[0], y_range[1], Ny)
-    X, Y = np.meshgrid(x, y, indexing='xy')
-    
-    Z = amplitude * np.sin(np.pi * X) * np.sin(np.pi * Y)
-    
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    return X, Y, Z, dx, dy
+    surface = SinusoidSurface(Nx, Ny, x_range, y_range, amplitude)
+    return surface.generate(dense_grid, return_gradients)
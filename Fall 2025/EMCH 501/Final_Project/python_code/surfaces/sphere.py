@@ -4,13 +4,50 @@
 import numpy as np
 from typing import Tuple
 
+from .base import Surface
+
+
+class SphereSurface(Surface):
+    """Hemisphere surface. Evaluated lazily, tile by tile."""
+    
+    def __init__(
+        self,
+        Nx: int = 128,
+        Ny: int = 128,
+        x_range: Tuple[float, float] = (-1, 1),
+        y_range: Tuple[float, float] = (-1, 1),
+        radius: float = 0.9
+    ):
+        super().__init__(Nx, Ny, x_range, y_range)
+        self.radius = radius
+    
+    def _evaluate(self, x: np.ndarray, y: np.ndarray, gradients: bool):
+        radius = self.radius
+        
+        r2 = x**2 + y**2
+        
+        # Zero outside the footprint
+        Z = np.sqrt(np.maximum(radius**2 - r2, 0))
+        
+        if not gradients:
+            return Z
+        
+        # Slope is unbounded at the rim; set to 0 where Z = 0
+        inside = Z > 0
+        p = np.divide(-x, Z, out=np.zeros_like(Z), where=inside)
+        q = np.divide(-y, Z, out=np.zeros_like(Z), where=inside)
+        
+        return Z, p, q
+
 
 def create_sphere_surface(
     Nx: int = 128,
     Ny: int = 128,
     x_range: Tuple[float, float] = (-1, 1),
     y_range: Tuple[float, float] = (-1, 1),
-    radius: float = 0.9
+    radius: float = 0.9,
+    dense_grid: bool = False,
+    return_gradients: bool = False
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]:
     """
     Create a hemisphere surface on a regular grid.
@@ -23,27 +60,22 @@ def create_sphere_surface(
         Domain bounds
     radius : float
         Hemisphere radius
+    dense_grid : bool
+        If True, return writable full-size X, Y arrays instead of
+        zero-copy broadcast views
+    return_gradients : bool
+        If True, also return analytic gradients evaluated alongside Z
         
     Returns
     -------
     X, Y : ndarray
-        Meshgrid coordinates
+        Meshgrid coordinates (read-only broadcast views by default)
     Z : ndarray
         Height map (0 outside sphere)
     dx, dy : float
         Grid spacing
+    p, q : ndarray
+        Analytic gradients ∂Z/∂x, ∂Z/∂y (only if return_gradients)
     """
-    x = np.linspace(x_range[0], x_range[1], Nx)
-    y = np.linspace(y_range[0], y_range[1], Ny)
-    X, Y = np.meshgrid(x, y, indexing='xy')
-    
-    r2 = X**2 + Y**2
-    inside = r2 <= radius**2
-    
-    Z = np.zeros_like(X)
-    Z[inside] = np.sqrt(radius**2 - r2[inside])
-    
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    return X, Y, Z, dx, dy
+    surface = SphereSurface(Nx, Ny, x_range, y_range, radius)
+    return surface.generate(dense_grid, return_gradients)
@@ -0,0 +1,40 @@
+# tests/test_cache.py
+"""Cache keys must change when the code behind a cached stage changes."""
+
+import functools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import photometric.lighting
+from experiments.cache import ArtifactCache
+from photometric import photometric_stereo_near_field
+from surfaces import GaussianSurface, create_gaussian_surface
+
+
+def test_editing_surface_evaluate_changes_key(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path))
+    create_fn = functools.partial(create_gaussian_surface, Nx=32, Ny=32)
+    before = cache.key("surface", create_fn=create_fn)
+
+    original = GaussianSurface._evaluate
+
+    def edited(self, x, y, gradients):
+        return original(self, x, y, gradients)
+
+    monkeypatch.setattr(GaussianSurface, "_evaluate", edited)
+    assert cache.key("surface", create_fn=create_fn) != before
+
+    monkeypatch.undo()
+    assert cache.key("surface", create_fn=create_fn) == before
+
+
+def test_editing_indirect_helper_changes_key(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path))
+    before = cache.key("stereo", code=(photometric_stereo_near_field,))
+
+    original = photometric.lighting.point_light_vectors
+    monkeypatch.setattr(photometric.lighting, "point_light_vectors",
+                        lambda *args, **kwargs: original(*args, **kwargs))
+    assert cache.key("stereo", code=(photometric_stereo_near_field,)) != before
@@ -8,6 +8,26 @@ from .surfaces_3d import save_3d_surface
 from .profiles import save_profile_plot
 from .histograms import save_error_histogram
 from .normals import save_normal_rgb
+from .raster import (
+    colormap_lut,
+    apply_colormap,
+    write_png,
+    save_heatmap_fast,
+    save_error_map_fast,
+    save_normal_rgb_fast,
+)
+from .templates import (
+    FigureTemplate,
+    get_template,
+    clear_templates,
+    save_heatmap_reuse,
+    save_error_map_reuse,
+    save_normal_rgb_reuse,
+    save_3d_surface_reuse,
+    save_profile_plot_reuse,
+    save_error_histogram_reuse,
+)
+from .hillshade import light_direction, hillshade, relief_rgb, oblique_view, save_hillshade
 
 __all__ = [
     'save_heatmap',
@@ -16,4 +36,24 @@ __all__ = [
     'save_profile_plot',
     'save_error_histogram',
     'save_normal_rgb',
+    'colormap_lut',
+    'apply_colormap',
+    'write_png',
+    'save_heatmap_fast',
+    'save_error_map_fast',
+    'save_normal_rgb_fast',
+    'FigureTemplate',
+    'get_template',
+    'clear_templates',
+    'save_heatmap_reuse',
+    'save_error_map_reuse',
+    'save_normal_rgb_reuse',
+    'save_3d_surface_reuse',
+    'save_profile_plot_reuse',
+    'save_error_histogram_reuse',
+    'light_direction',
+    'hillshade',
+    'relief_rgb',
+    'oblique_view',
+    'save_hillshade',
 ]
@@ -6,8 +6,10 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import os
+from profiling import traced
 
 
+@traced
 def save_heatmap(
     Z: np.ndarray,
     filepath: str,
@@ -51,6 +53,7 @@ def save_heatmap(
     plt.close(fig)
 
 
+@traced
 def save_error_map(
     Z_true: np.ndarray,
     Z_est: np.ndarray,
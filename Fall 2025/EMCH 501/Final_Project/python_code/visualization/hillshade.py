@@ -0,0 +1,211 @@
+# visualization/hillshade.py
+"""
+Shaded-relief rendering of height maps, a fast stand-in for save_3d_surface.
+
+plot_surface draws one polygon per (subsampled) grid cell and is the
+slowest figure in a run. A shaded relief gives the same 3D impression from
+one Lambertian shading pass over the normals, using the same N · L dot
+product as render_photometric_images, at full resolution. An optional
+oblique view tilts the shaded map towards the viewer with a
+floating-horizon warp: rows are processed from near to far, and a pixel of
+a screen column shows the nearest row whose running maximum screen height
+reaches it, so hills hide what lies behind them.
+"""
+
+import numpy as np
+
+from photometric import normals_from_height, render_photometric_images
+from profiling import traced
+from .raster import colormap_lut, write_png
+
+
+def light_direction(azimuth_deg: float = 315.0, altitude_deg: float = 45.0) -> np.ndarray:
+    """
+    Unit vector towards a light at the given azimuth (from +x towards +y) and
+    altitude above the horizontal.
+
+    Returns
+    -------
+    L : ndarray, shape (3,)
+    """
+    az, alt = np.deg2rad(azimuth_deg), np.deg2rad(altitude_deg)
+    return np.array([np.cos(az) * np.cos(alt), np.sin(az) * np.cos(alt), np.sin(alt)])
+
+
+@traced
+def hillshade(
+    Z: np.ndarray = None,
+    dx: float = 1.0,
+    dy: float = 1.0,
+    N: np.ndarray = None,
+    azimuth_deg: float = 315.0,
+    altitude_deg: float = 45.0,
+    ambient: float = 0.2
+) -> np.ndarray:
+    """
+    Lambertian shading of a surface under one distant light.
+
+    shade = ambient + (1 - ambient) * max(0, N · L)
+
+    Parameters
+    ----------
+    Z : ndarray, shape (Ny, Nx), optional
+        Height map (used for the normals if N is not given)
+    dx, dy : float
+        Grid spacing of Z
+    N : ndarray, shape (Ny, Nx, 3), optional
+        Unit surface normals
+    azimuth_deg, altitude_deg : float
+        Light direction (see light_direction)
+    ambient : float
+        Brightness of surfaces facing away from the light
+
+    Returns
+    -------
+    shade : ndarray, shape (Ny, Nx)
+        Values in [ambient, 1]
+    """
+    if N is None:
+        N = normals_from_height(Z, dx, dy)
+    L = light_direction(azimuth_deg, altitude_deg)
+    lambert = render_photometric_images(N, L[np.newaxis])[0]
+    return ambient + (1 - ambient) * lambert
+
+
+def relief_rgb(Z: np.ndarray, shade: np.ndarray, cmap: str = "viridis") -> np.ndarray:
+    """
+    Colour by height through a colormap LUT, darkened by the shading.
+
+    cmap=None gives a gray relief.
+
+    Returns
+    -------
+    rgb : ndarray, shape (Ny, Nx, 3), uint8
+    """
+    if cmap is None:
+        return np.repeat((shade * 255 + 0.5).astype(np.uint8)[..., np.newaxis], 3, axis=2)
+
+    zmin, zmax = float(np.min(Z)), float(np.max(Z))
+    scale = 255.0 / (zmax - zmin) if zmax > zmin else 0.0
+    colors = colormap_lut(cmap)[((Z - zmin) * scale).astype(np.uint8)]
+    return (colors * shade[..., np.newaxis] + 0.5).astype(np.uint8)
+
+
+@traced
+def oblique_view(
+    Z: np.ndarray,
+    rgb: np.ndarray,
+    dx: float = 1.0,
+    dy: float = 1.0,
+    view_elevation_deg: float = 30.0,
+    z_scale: float = 1.0,
+    background: int = 255
+) -> np.ndarray:
+    """
+    Warp a top-down image of Z to an orthographic view from the -y side.
+
+    A sample at row i (y = i·dy) projects to screen height
+    v = y·sin(e) + z_scale·Z·cos(e). Along each column the running maximum
+    of v over the rows nearer to the viewer is the horizon; a screen pixel
+    at height t shows the first row whose horizon reaches t, and row 0 also
+    covers the band dy·sin(e) below it. As the horizon never decreases,
+    that row is found for all pixels at once by counting the rows whose
+    horizon stays below each pixel (a bincount and a cumsum per column)
+    instead of searching. Screen pixels are square with side dx.
+
+    Parameters
+    ----------
+    Z : ndarray, shape (Ny, Nx)
+        Height map, row 0 nearest to the viewer
+    rgb : ndarray, shape (Ny, Nx, 3)
+        Top-down colours of Z (same orientation)
+    dx, dy : float
+        Grid spacing of Z
+    view_elevation_deg : float
+        Viewing angle above the horizontal (90 = plan view)
+    z_scale : float
+        Vertical exaggeration
+    background : int
+        Gray level of pixels that show no surface
+
+    Returns
+    -------
+    view : ndarray, shape (H, Nx, 3), uint8
+        First row at the top of the screen
+    """
+    Ny, Nx = Z.shape
+    e = np.deg2rad(view_elevation_deg)
+    v = (np.arange(Ny) * dy * np.sin(e))[:, np.newaxis] + z_scale * np.cos(e) * Z
+    horizon = np.maximum.accumulate(v, axis=0)
+
+    # Each row covers a band dy·sin(e) deep below its v, so the nearest
+    # row gets pixels too (a flat plan view is Ny pixels tall)
+    band = dy * np.sin(e)
+    v_low, v_high = float(v[0].min()) - band, float(horizon[-1].max())
+    height = max(1, int(np.ceil((v_high - v_low) / dx - 1e-9)))
+    t = v_high - (np.arange(height) + 0.5) * dx  # top to bottom
+
+    # Row i covers the screen pixels from the top down to k_i, the first
+    # pixel with t <= horizon; the row shown at pixel k is the number of rows
+    # with k_i > k (a per-column histogram of k_i, cumulated from the top)
+    k = np.ceil((v_high - horizon) / dx - 0.5).astype(np.intp)
+    np.clip(k, 0, height, out=k)
+    bins = (k + (height + 1) * np.arange(Nx)).ravel()
+    counts = np.bincount(bins, minlength=(height + 1) * Nx).reshape(Nx, height + 1).T
+    rows = Ny - np.cumsum(counts, axis=0)[:height]
+
+    # Above the far horizon or below the near edge there is no surface
+    visible = (rows < Ny) & (t[:, np.newaxis] >= v[0] - band)
+    rows = np.minimum(rows, Ny - 1)
+
+    view = rgb[rows, np.arange(Nx)]
+    view[~visible] = background
+    return view
+
+
+@traced
+def save_hillshade(
+    Z: np.ndarray,
+    filepath: str,
+    title: str = "",
+    dx: float = 1.0,
+    dy: float = 1.0,
+    N: np.ndarray = None,
+    cmap: str = "viridis",
+    view_elevation_deg: float = 30.0,
+    z_scale: float = 1.0,
+    azimuth_deg: float = 315.0,
+    altitude_deg: float = 45.0
+) -> None:
+    """
+    Save a shaded relief of a height map as a PNG.
+
+    Parameters
+    ----------
+    Z : ndarray
+        Height map
+    filepath : str
+        Output file path
+    title : str
+        Accepted for signature compatibility with save_3d_surface; not drawn
+    dx, dy : float
+        Grid spacing of Z
+    N : ndarray, optional
+        Unit normals of Z (computed from Z if omitted)
+    cmap : str or None
+        Colormap for the height colouring (None: gray)
+    view_elevation_deg : float or None
+        Oblique viewing angle; None writes the plan view
+    z_scale : float
+        Vertical exaggeration of the oblique view
+    azimuth_deg, altitude_deg : float
+        Light direction
+    """
+    shade = hillshade(Z, dx, dy, N, azimuth_deg, altitude_deg)
+    rgb = relief_rgb(Z, shade, cmap)
+    if view_elevation_deg is None:
+        # origin='lower': the first row of Z is the bottom of the image
+        rgb = rgb[::-1]
+    else:
+        rgb = oblique_view(Z, rgb, dx, dy, view_elevation_deg, z_scale)
+    write_png(filepath, rgb)
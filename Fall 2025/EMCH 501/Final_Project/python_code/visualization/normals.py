@@ -6,8 +6,10 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import os
+from profiling import traced
 
 
+@traced
 def save_normal_rgb(
     N: np.ndarray,
     filepath: str,
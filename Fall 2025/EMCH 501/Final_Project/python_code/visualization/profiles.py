@@ -6,8 +6,10 @@ import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import os
+from profiling import traced
 
 
+@traced
 def save_profile_plot(
     Z_true: np.ndarray,
     Z_est: np.ndarray,
@@ -0,0 +1,190 @@
+# visualization/raster.py
+"""
+Matplotlib-free raster export of arrays as PNG.
+
+An image of an array does not need a figure, axes and tight_layout: the
+fast writers map values through a cached 256-entry colormap LUT with one
+NumPy fancy-index and write the PNG directly with zlib. Matplotlib is only
+used once per colormap, to build its LUT.
+"""
+
+import os
+import struct
+import zlib
+from functools import lru_cache
+
+import numpy as np
+import matplotlib
+
+from profiling import traced
+
+
+# Gap (px) between the image and the colorbar strip
+_STRIP_GAP = 4
+
+
+@lru_cache(maxsize=None)
+def colormap_lut(cmap: str) -> np.ndarray:
+    """
+    256-entry RGB lookup table of a matplotlib colormap.
+
+    Returns
+    -------
+    lut : ndarray, shape (256, 3), uint8
+        Read-only
+    """
+    lut = matplotlib.colormaps[cmap](np.linspace(0, 1, 256), bytes=True)[:, :3]
+    lut = np.ascontiguousarray(lut)
+    lut.flags.writeable = False
+    return lut
+
+
+def apply_colormap(Z: np.ndarray, cmap: str = "viridis", vmin: float = None, vmax: float = None) -> np.ndarray:
+    """
+    Map a 2-D array to RGB through a colormap LUT.
+
+    NaNs take the lowest colour; vmin/vmax default to the data range.
+    Binning matches matplotlib's: bin floor(256 * (z - vmin) / (vmax - vmin)),
+    with the top edge folded into bin 255.
+
+    Returns
+    -------
+    rgb : ndarray, shape (Ny, Nx, 3), uint8
+    """
+    Z = np.asarray(Z, dtype=np.float64)
+    if vmin is None:
+        vmin = float(np.nanmin(Z))
+    if vmax is None:
+        vmax = float(np.nanmax(Z))
+    scale = 256.0 / (vmax - vmin) if vmax > vmin else 0.0
+
+    idx = (Z - vmin) * scale
+    np.nan_to_num(idx, copy=False, nan=0.0)
+    np.clip(idx, 0, 255, out=idx)
+    return colormap_lut(cmap)[idx.astype(np.uint8)]
+
+
+@lru_cache(maxsize=32)
+def colorbar_strip(cmap: str, height: int, width: int = 12) -> np.ndarray:
+    """
+    Vertical colorbar (maximum at the top) with a white gap on its left.
+
+    Returns
+    -------
+    strip : ndarray, shape (height, _STRIP_GAP + width, 3), uint8
+        Read-only
+    """
+    ramp = colormap_lut(cmap)[np.linspace(255, 0, height).astype(np.uint8)]
+    strip = np.full((height, _STRIP_GAP + width, 3), 255, dtype=np.uint8)
+    strip[:, _STRIP_GAP:] = ramp[:, np.newaxis, :]
+    strip.flags.writeable = False
+    return strip
+
+
+def write_png(filepath: str, rgb: np.ndarray, compress_level: int = 3) -> None:
+    """
+    Write an 8-bit RGB (or grayscale) array as a PNG file.
+
+    Parameters
+    ----------
+    filepath : str
+        Output file path
+    rgb : ndarray, shape (H, W, 3) or (H, W), uint8
+        Image, first row at the top
+    compress_level : int
+        zlib level (1 fastest, 9 smallest)
+    """
+    rgb = np.asarray(rgb, dtype=np.uint8)
+    height, width = rgb.shape[:2]
+    channels = 1 if rgb.ndim == 2 else rgb.shape[2]
+    color_type = {1: 0, 3: 2, 4: 6}[channels]
+
+    # Each scanline is a filter-type byte (0 = none) followed by the pixels
+    raw = np.zeros((height, 1 + width * channels), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, width * channels)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    png = (b"\x89PNG\r\n\x1a\n"
+           + chunk(b"IHDR", header)
+           + chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level))
+           + chunk(b"IEND", b""))
+
+    os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+    with open(filepath, "wb") as fh:
+        fh.write(png)
+
+
+@traced
+def save_heatmap_fast(
+    Z: np.ndarray,
+    filepath: str,
+    title: str = "",
+    cmap: str = "viridis",
+    center_zero: bool = False,
+    colorbar: bool = True
+) -> None:
+    """
+    Raster counterpart of save_heatmap: one pixel per sample, y up.
+
+    The title is accepted for signature compatibility but not drawn; the
+    optional colorbar strip has no tick labels.
+
+    Parameters
+    ----------
+    Z : ndarray
+        2D data to visualize
+    filepath : str
+        Output file path
+    title : str
+        Ignored
+    cmap : str
+        Matplotlib colormap name
+    center_zero : bool
+        If True, center colormap at zero (useful for error maps)
+    colorbar : bool
+        Append a colorbar strip on the right
+    """
+    if center_zero:
+        vmax = float(np.nanmax(np.abs(Z)))
+        rgb = apply_colormap(Z, cmap, -vmax, vmax)
+    else:
+        rgb = apply_colormap(Z, cmap)
+
+    # origin='lower': the first row of Z is the bottom of the image
+    rgb = rgb[::-1]
+
+    if colorbar:
+        rgb = np.concatenate([rgb, colorbar_strip(cmap, rgb.shape[0])], axis=1)
+
+    write_png(filepath, rgb)
+
+
+@traced
+def save_error_map_fast(
+    Z_true: np.ndarray,
+    Z_est: np.ndarray,
+    filepath: str,
+    title: str = "Depth Error",
+    colorbar: bool = True
+) -> None:
+    """Raster counterpart of save_error_map (mean-centered Z_est - Z_true)."""
+    error = (Z_est - np.mean(Z_est)) - (Z_true - np.mean(Z_true))
+    save_heatmap_fast(error, filepath, title, cmap='RdBu_r', center_zero=True, colorbar=colorbar)
+
+
+@traced
+def save_normal_rgb_fast(
+    N: np.ndarray,
+    filepath: str,
+    title: str = "Surface Normals"
+) -> None:
+    """
+    Raster counterpart of save_normal_rgb: (nx, ny, nz) ∈ [-1, 1] → RGB, y up.
+
+    The title is accepted for signature compatibility but not drawn.
+    """
+    rgb = np.clip((N + 1) * 127.5 + 0.5, 0, 255).astype(np.uint8)
+    write_png(filepath, rgb[::-1])
@@ -7,8 +7,10 @@ matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import os
+from profiling import traced
 
 
+@traced
 def save_3d_surface(
     Z: np.ndarray,
     filepath: str,
@@ -0,0 +1,315 @@
+# visualization/templates.py
+"""
+Persistent figure templates for repeated plotting.
+
+The save_* functions build a figure, axes, colorbar and labels on every
+call and close them after saving; over hundreds of figures that
+construction dominates. A template builds its figure once per process and
+each later call only swaps the data into the existing artists (image data
+and colour limits, line data, bar heights, annotation text) before saving.
+
+Layout: tight_layout runs on a template's first save and afterwards only
+when a new title or tick labels no longer fit inside the figure (the axes'
+tight bounding boxes are checked against it). Later figures therefore keep
+the first one's margins; they can differ from the save_* output by a few
+pixels of padding but never clip.
+
+Templates are not thread-safe; the figure queue renders in processes, each
+with its own templates. The *_reuse functions take the same arguments as
+their save_* counterparts.
+"""
+
+import os
+from typing import Dict
+
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from mpl_toolkits.mplot3d import Axes3D
+
+from profiling import traced
+
+
+_DPI = 150
+_templates: Dict[str, "FigureTemplate"] = {}
+
+
+class FigureTemplate:
+    """
+    A figure built once and re-rendered with new data.
+
+    Subclasses build their artists in _build and implement update().
+    """
+
+    figsize = (6, 5)
+
+    def __init__(self):
+        self.fig = plt.figure(figsize=self.figsize)
+        self._build()
+        self.renders = 0
+        self.relayouts = 0
+
+    def _build(self) -> None:
+        raise NotImplementedError
+
+    def _fits(self) -> bool:
+        """Whether every axes' decorations still lie inside the figure."""
+        renderer = self.fig.canvas.get_renderer()
+        bounds = self.fig.bbox
+        for ax in self.fig.axes:
+            box = ax.get_tightbbox(renderer)
+            if (box.x0 < bounds.x0 or box.y0 < bounds.y0
+                    or box.x1 > bounds.x1 or box.y1 > bounds.y1):
+                return False
+        return True
+
+    def save(self, filepath: str) -> None:
+        """Write the current state to filepath, re-running the layout if needed."""
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        if self.renders == 0 or not self._fits():
+            self.fig.tight_layout()
+            self.relayouts += 1
+        self.fig.savefig(filepath, dpi=_DPI)
+        self.renders += 1
+
+    def close(self) -> None:
+        plt.close(self.fig)
+
+
+class HeatmapTemplate(FigureTemplate):
+    """imshow + colorbar + title (save_heatmap)."""
+
+    def _build(self) -> None:
+        self.ax = self.fig.add_subplot(111)
+        self.im = self.ax.imshow(np.zeros((2, 2)), cmap="viridis", origin='lower')
+        self.colorbar = self.fig.colorbar(self.im, ax=self.ax)
+        self.ax.set_xlabel('x')
+        self.ax.set_ylabel('y')
+
+    def update(self, Z: np.ndarray, title: str = "", cmap: str = "viridis", center_zero: bool = False) -> None:
+        Ny, Nx = Z.shape
+        self.im.set_data(Z)
+        self.im.set_extent((-0.5, Nx - 0.5, -0.5, Ny - 0.5))
+        self.im.set_cmap(cmap)
+        if center_zero:
+            vmax = np.max(np.abs(Z))
+            self.im.set_clim(-vmax, vmax)
+        else:
+            self.im.set_clim(np.min(Z), np.max(Z))
+        self.ax.set_title(title)
+
+
+class NormalTemplate(FigureTemplate):
+    """RGB image with a title and no axes (save_normal_rgb)."""
+
+    def _build(self) -> None:
+        self.ax = self.fig.add_subplot(111)
+        self.im = self.ax.imshow(np.zeros((2, 2, 3)), origin='lower')
+        self.ax.axis('off')
+
+    def update(self, N: np.ndarray, title: str = "Surface Normals") -> None:
+        Ny, Nx = N.shape[:2]
+        self.im.set_data(np.clip((N + 1) / 2, 0, 1))
+        self.im.set_extent((-0.5, Nx - 0.5, -0.5, Ny - 0.5))
+        self.ax.set_title(title)
+
+
+class ProfileTemplate(FigureTemplate):
+    """Ground truth and estimated center-line profiles (save_profile_plot)."""
+
+    figsize = (8, 4)
+
+    def _build(self) -> None:
+        self.ax = self.fig.add_subplot(111)
+        self.true_line, = self.ax.plot([], [], 'b-', label='Ground Truth', linewidth=2)
+        self.est_line, = self.ax.plot([], [], 'r--', label='Estimated', linewidth=1.5)
+        self.ax.set_ylabel('Height (centered)')
+        self.ax.legend()
+        self.ax.grid(True, alpha=0.3)
+
+    def update(self, x: np.ndarray, true_profile: np.ndarray, est_profile: np.ndarray,
+               xlabel: str, title: str) -> None:
+        self.true_line.set_data(x, true_profile)
+        self.est_line.set_data(x, est_profile)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_title(title)
+
+
+class HistogramTemplate(FigureTemplate):
+    """Error histogram with a zero line and an RMSE box (save_error_histogram)."""
+
+    figsize = (6, 4)
+    bins = 50
+
+    def _build(self) -> None:
+        self.ax = self.fig.add_subplot(111)
+        _, _, self.bars = self.ax.hist(np.linspace(-1, 1, self.bins), bins=self.bins,
+                                       edgecolor='black', alpha=0.7)
+        self.ax.axvline(0, color='r', linestyle='--', linewidth=1.5)
+        self.ax.set_xlabel('Depth Error')
+        self.ax.set_ylabel('Frequency')
+        self.text = self.ax.text(0.95, 0.95, '', transform=self.ax.transAxes, ha='right', va='top',
+                                 fontsize=10, bbox=dict(boxstyle='round', facecolor='wheat'))
+
+    def update(self, error: np.ndarray, title: str) -> None:
+        counts, edges = np.histogram(error, bins=self.bins)
+        for bar, count, left, right in zip(self.bars, counts, edges[:-1], edges[1:]):
+            bar.set_x(left)
+            bar.set_width(right - left)
+            bar.set_height(count)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.text.set_text(f'RMSE: {np.sqrt(np.mean(error**2)):.4f}')
+        self.ax.set_title(title)
+
+
+class Surface3DTemplate(FigureTemplate):
+    """
+    3D surface mesh (save_3d_surface).
+
+    A surface's polygons cannot be reshaped in place, so update() replaces
+    the Poly3DCollection; the figure and 3D axes are still reused.
+    """
+
+    figsize = (8, 6)
+
+    def _build(self) -> None:
+        self.ax = self.fig.add_subplot(111, projection='3d')
+        self.ax.set_xlabel('X')
+        self.ax.set_ylabel('Y')
+        self.ax.set_zlabel('Z')
+        self.surface = None
+
+    def update(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray, title: str = "",
+               elev: float = 30, azim: float = 45) -> None:
+        if self.surface is not None:
+            self.surface.remove()
+        self.surface = self.ax.plot_surface(X, Y, Z, cmap='viridis', edgecolor='none', alpha=0.9)
+        self.ax.auto_scale_xyz(X, Y, Z, had_data=False)
+        self.ax.view_init(elev=elev, azim=azim)
+        self.ax.set_title(title)
+
+
+_TEMPLATE_TYPES = {
+    "heatmap": HeatmapTemplate,
+    "normals": NormalTemplate,
+    "profile": ProfileTemplate,
+    "histogram": HistogramTemplate,
+    "surface_3d": Surface3DTemplate,
+}
+
+
+def get_template(kind: str) -> FigureTemplate:
+    """This process's template of the given kind, built on first use."""
+    template = _templates.get(kind)
+    if template is None:
+        template = _templates[kind] = _TEMPLATE_TYPES[kind]()
+    return template
+
+
+def clear_templates() -> None:
+    """Close every cached template figure."""
+    for template in _templates.values():
+        template.close()
+    _templates.clear()
+
+
+@traced
+def save_heatmap_reuse(
+    Z: np.ndarray,
+    filepath: str,
+    title: str = "",
+    cmap: str = "viridis",
+    center_zero: bool = False
+) -> None:
+    """Template-based save_heatmap."""
+    template = get_template("heatmap")
+    template.update(Z, title, cmap, center_zero)
+    template.save(filepath)
+
+
+@traced
+def save_error_map_reuse(
+    Z_true: np.ndarray,
+    Z_est: np.ndarray,
+    filepath: str,
+    title: str = "Depth Error"
+) -> None:
+    """Template-based save_error_map."""
+    error = (Z_est - np.mean(Z_est)) - (Z_true - np.mean(Z_true))
+    save_heatmap_reuse(error, filepath, title, cmap='RdBu_r', center_zero=True)
+
+
+@traced
+def save_normal_rgb_reuse(
+    N: np.ndarray,
+    filepath: str,
+    title: str = "Surface Normals"
+) -> None:
+    """Template-based save_normal_rgb."""
+    template = get_template("normals")
+    template.update(N, title)
+    template.save(filepath)
+
+
+@traced
+def save_profile_plot_reuse(
+    Z_true: np.ndarray,
+    Z_est: np.ndarray,
+    filepath: str,
+    title: str = "Center-line Profile",
+    axis: str = "x"
+) -> None:
+    """Template-based save_profile_plot."""
+    Z_true_c = Z_true - np.mean(Z_true)
+    Z_est_c = Z_est - np.mean(Z_est)
+    Ny, Nx = Z_true.shape
+
+    if axis == 'x':
+        x, xlabel = np.arange(Nx), 'x index'
+        true_profile, est_profile = Z_true_c[Ny // 2, :], Z_est_c[Ny // 2, :]
+    else:
+        x, xlabel = np.arange(Ny), 'y index'
+        true_profile, est_profile = Z_true_c[:, Nx // 2], Z_est_c[:, Nx // 2]
+
+    template = get_template("profile")
+    template.update(x, true_profile, est_profile, xlabel, title)
+    template.save(filepath)
+
+
+@traced
+def save_error_histogram_reuse(
+    Z_true: np.ndarray,
+    Z_est: np.ndarray,
+    filepath: str,
+    title: str = "Depth Error Histogram"
+) -> None:
+    """Template-based save_error_histogram."""
+    error = ((Z_est - np.mean(Z_est)) - (Z_true - np.mean(Z_true))).ravel()
+    template = get_template("histogram")
+    template.update(error, title)
+    template.save(filepath)
+
+
+@traced
+def save_3d_surface_reuse(
+    Z: np.ndarray,
+    filepath: str,
+    title: str = "",
+    elev: float = 30,
+    azim: float = 45,
+    X: np.ndarray = None,
+    Y: np.ndarray = None
+) -> None:
+    """Template-based save_3d_surface (same 64-row subsampling)."""
+    if X is None or Y is None:
+        Ny, Nx = Z.shape
+        X, Y = np.meshgrid(np.arange(Nx), np.arange(Ny))
+
+    step = max(1, Z.shape[0] // 64)
+    template = get_template("surface_3d")
+    template.update(X[::step, ::step], Y[::step, ::step], Z[::step, ::step], title, elev, azim)
+    template.save(filepath)